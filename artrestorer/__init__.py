@@ -0,0 +1,59 @@
+"""ArtRestorer AI analysis engine, usable without the Streamlit UI.
+
+The report engine, timeline model and heritage knowledge base import without
+Streamlit or OpenAI; ``artrestorer.batch`` and the CLI (``python -m artrestorer``)
+pull in the OpenAI SDK only when they are used.
+
+The names below are loaded from their submodules on first access, so
+``import artrestorer`` itself costs next to nothing; NumPy, SQLite and the HTTP
+servers are only imported by the parts that use them.
+"""
+import importlib
+from typing import Any, Dict, List, Tuple
+
+# Public name -> (submodule, attribute)
+_EXPORTS: Dict[str, Tuple[str, str]] = {}
+
+
+def _export(module: str, *names: str, **aliases: str):
+    _EXPORTS.update({name: (module, name) for name in names})
+    _EXPORTS.update({alias: (module, name) for alias, name in aliases.items()})
+
+
+_export("cache", "AnalysisCache", "make_cache_key", "open_default_cache")
+_export("calendars", "HOLIDAY_PRESETS", "WORKWEEKS", "WorkCalendar", "build_calendar", "dated_phases",
+        "parse_holidays", "week_spans")
+_export("engine", "ANALYSIS_SECTIONS", "FEATURE_KEYS", "FEATURE_OPTIONS", "analysis_cache_key",
+        "build_analysis_messages", "build_report_footer", "build_report_header", "creativity_label",
+        "feature_descriptions", "stream_analysis")
+_export("exports", "EXPORT_FORMATS", "PDF_AVAILABLE", "ExportCache", "available_formats", "get_export_cache",
+        "portfolio_export", "report_export", "timeline_export")
+_export("feedback", "FeedbackStore", "open_default_feedback_store")
+_export("history", "AnalysisHistory", "HistoryPage", "open_default_history")
+_export("knowledge", "KnowledgeBase", "get_knowledge", "load_knowledge")
+_export("metrics", "REGISTRY", "Registry", start_metrics_server="start_server")
+_export("mockserver", "MockConfig", "MockOpenAIServer")
+_export("network", "NetworkSchedule", "PhaseNetwork")
+_export("profiler", "ProfileResult", "RunProfiler", "flamegraph_svg")
+_export("report", "Report", "ReportSection", "build_report", "export_text", "parse_sections", "render_html",
+        "render_text", "report_from_dict", "report_json", "report_to_dict")
+_export("timeline", "ARTWORK_TYPES", "DAMAGE_SEVERITIES", "GOAL_PHASES", "GOALS", "PHASE_NETWORK",
+        "PHASE_TEMPLATES", "SIZES", "TEAM_SIZES", "URGENCIES", "calc_weeks", "damage_map", "match_option",
+        "phase_closure", "phase_durations", "plan_timeline", "scope_phases", "size_map", "team_map",
+        "timeline_export_text", "urgency_map")
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module}", __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,188 @@
+"""Batch restoration analysis over CSV / JSONL catalogue exports.
+
+Records carry the same fields as the Restoration Assistant form. They are fanned
+out over an AsyncOpenAI client behind a semaphore, and each finished report is
+written into a zip archive as soon as it completes.
+"""
+import asyncio
+import csv
+import io
+import json
+import re
+import time
+import zipfile
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, Union
+
+from openai import AsyncOpenAI, OpenAIError
+
+from .cache import AnalysisCache
+from .engine import (
+    FEATURE_KEYS, FEATURE_OPTIONS, analysis_cache_key, analysis_model,
+    build_analysis_messages, record_usage
+)
+from .history import AnalysisHistory
+from .metrics import ERRORS, GENERATION_SECONDS
+from .report import build_report, render_text
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TEMPERATURE = 0.6
+
+# Accepted column names for each form field
+FIELD_ALIASES = {
+    'artwork_description': ['description', 'artwork_description'],
+    'art_style': ['style', 'art_style', 'period'],
+    'damage_type': ['damage_type', 'damage'],
+    'cultural_context': ['cultural_context', 'context'],
+    'analysis_type': ['analysis_type', 'feature_key', 'feature'],
+    'creativity': ['creativity', 'temperature'],
+}
+
+
+def _field(row: Dict[str, Any], name: str) -> str:
+    for alias in FIELD_ALIASES[name]:
+        value = row.get(alias)
+        if value not in (None, ""):
+            return str(value).strip()
+    return ""
+
+
+def resolve_feature_key(value: str) -> str:
+    """Accept a feature key ('period'), a number ('1'–'10') or a full Analysis Type label."""
+    if not value:
+        return FEATURE_KEYS[0]
+    lowered = value.strip().lower()
+    if lowered in FEATURE_KEYS:
+        return lowered
+    number = lowered.split('.')[0].strip()
+    if number.isdigit() and 1 <= int(number) <= len(FEATURE_KEYS):
+        return FEATURE_KEYS[int(number) - 1]
+    for option, key in zip(FEATURE_OPTIONS, FEATURE_KEYS):
+        if lowered in option.lower():
+            return key
+    raise ValueError(f"unknown analysis type '{value}'")
+
+
+def _to_request(row: Dict[str, Any]) -> Dict[str, Any]:
+    description = _field(row, 'artwork_description')
+    if not description:
+        raise ValueError("missing description")
+    feature_key = resolve_feature_key(_field(row, 'analysis_type'))
+    creativity = _field(row, 'creativity')
+    temperature = float(creativity) if creativity else DEFAULT_TEMPERATURE
+    if not 0.0 <= temperature <= 1.0:
+        raise ValueError(f"creativity {temperature} outside 0.0–1.0")
+    return {
+        'artwork_description': description,
+        'art_style': _field(row, 'art_style'),
+        'damage_type': _field(row, 'damage_type'),
+        'cultural_context': _field(row, 'cultural_context'),
+        'feature_key': feature_key,
+        'feature_label': FEATURE_OPTIONS[FEATURE_KEYS.index(feature_key)],
+        'temperature': temperature,
+    }
+
+
+def parse_batch_file(filename: str, data: bytes) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Parse a CSV or JSONL upload into analysis requests plus per-line error messages."""
+    text = data.decode('utf-8-sig')
+    if filename.lower().endswith(('.jsonl', '.ndjson')):
+        rows = []
+        for line_no, line in enumerate(text.splitlines(), 1):
+            if line.strip():
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    rows.append((line_no, e))
+                    continue
+                rows.append((line_no, row if isinstance(row, dict) else ValueError("not a JSON object")))
+    else:
+        reader = csv.DictReader(io.StringIO(text))
+        rows = [(line_no, {(k or '').strip().lower(): v for k, v in row.items()})
+                for line_no, row in enumerate(reader, 2)]
+
+    records, errors = [], []
+    for line_no, row in rows:
+        try:
+            if isinstance(row, Exception):
+                raise ValueError(str(row))
+            record = _to_request(row)
+        except ValueError as e:
+            errors.append(f"Line {line_no}: {e}")
+            continue
+        record['index'] = len(records) + 1
+        record['source_line'] = line_no
+        records.append(record)
+    return records, errors
+
+
+def _report_name(record: Dict[str, Any]) -> str:
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', record['artwork_description'][:40]).strip('_') or 'artwork'
+    return f"reports/{record['index']:04d}_{slug}.txt"
+
+
+async def _analyse(client: AsyncOpenAI, semaphore: asyncio.Semaphore, record: Dict[str, Any],
+                   user: Dict[str, Any], cache: Optional[AnalysisCache]):
+    key = analysis_cache_key(record)
+    if cache is not None:
+        body = cache.get(key)
+        if body is not None:
+            return record, body, None, True
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            response = await client.chat.completions.create(
+                model=analysis_model(),
+                messages=build_analysis_messages(record, user),
+                temperature=record['temperature'],
+                max_tokens=2500
+            )
+        except OpenAIError as e:
+            GENERATION_SECONDS.observe(time.perf_counter() - started, mode="batch", outcome="error")
+            ERRORS.inc(where="batch", error=type(e).__name__)
+            return record, None, str(e), False
+        GENERATION_SECONDS.observe(time.perf_counter() - started, mode="batch", outcome="ok")
+    if response.usage:
+        record_usage(response.usage)
+    body = response.choices[0].message.content or ""
+    if cache is not None and body:
+        cache.put(key, body)
+    return record, body, None, False
+
+
+async def run_batch(records: List[Dict[str, Any]], client: AsyncOpenAI, archive: Union[str, IO[bytes]],
+                    user: Dict[str, Any], concurrency: int = DEFAULT_CONCURRENCY,
+                    cache: Optional[AnalysisCache] = None, history: Optional[AnalysisHistory] = None,
+                    on_progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """Analyse every record with at most `concurrency` requests in flight.
+
+    Reports are appended to the zip `archive` (a path or a binary file object) in
+    completion order, followed by a manifest.jsonl describing every record; with
+    `history`, each report is also stored under `user`. Returns the manifest entries.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [asyncio.create_task(_analyse(client, semaphore, r, user, cache)) for r in records]
+    manifest = []
+    with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for done, task in enumerate(asyncio.as_completed(tasks), 1):
+            record, body, error, cached = await task
+            entry = {
+                'index': record['index'],
+                'source_line': record['source_line'],
+                'description': record['artwork_description'][:80],
+                'status': 'error' if error else 'ok',
+                'cached': cached,
+            }
+            if error:
+                entry['error'] = error
+            else:
+                entry['file'] = _report_name(record)
+                report = build_report(record, body, user=user)
+                zf.writestr(entry['file'], render_text(report))
+                if history is not None:
+                    history.save(report, user, record.get('feature_key', ''))
+            manifest.append(entry)
+            if on_progress is not None:
+                on_progress(done, len(records), entry)
+        manifest.sort(key=lambda m: m['index'])
+        zf.writestr('manifest.jsonl', "\n".join(json.dumps(m, ensure_ascii=False) for m in manifest) + "\n")
+    return manifest
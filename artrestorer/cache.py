@@ -0,0 +1,144 @@
+"""Two-tier cache for generated restoration analyses.
+
+Tier 1 is a bounded in-process LRU shared by every session of the server
+process; tier 2 is a SQLite file that survives Streamlit restarts. Both tiers
+honour the same TTL, and hit/miss counters are kept for monitoring.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
+
+def temperature_bucket(temperature: float) -> int:
+    # Same five bands as the creativity labels shown in the UI
+    return min(int(temperature / 0.2), 4)
+
+
+def make_cache_key(artwork_description: str, art_style: str, damage_type: str,
+                   cultural_context: str, feature_key: str, temperature: float, model: str = "",
+                   endpoint: str = "") -> str:
+    """Stable key over the normalized input tuple of the tab1 generator.
+
+    The model is part of the key, so switching OPENAI_MODEL never serves another model's reports. A
+    non-default API endpoint (a mock or proxy) is too, so its reports never answer requests meant
+    for the real API.
+    """
+    parts = (
+        _normalize(artwork_description),
+        _normalize(art_style),
+        _normalize(damage_type),
+        _normalize(cultural_context),
+        feature_key,
+        temperature_bucket(temperature),
+        model,
+    )
+    if endpoint:
+        parts += (endpoint.rstrip("/"),)
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, path: str, max_entries: int = 256, ttl_seconds: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lru: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "expired": 0, "writes": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " key TEXT PRIMARY KEY,"
+            " body TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at)")
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, body: str):
+        self._lru[key] = (created_at, body)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                if not self._expired(entry[0], now):
+                    self._lru.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return entry[1]
+                del self._lru[key]
+
+            row = self._db.execute("SELECT body, created_at FROM analyses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            body, created_at = row
+            if self._expired(created_at, now):
+                self._db.execute("DELETE FROM analyses WHERE key = ?", (key,))
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._remember(key, created_at, body)
+            self._stats["disk_hits"] += 1
+            return body
+
+    def put(self, key: str, body: str):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, body)
+            self._db.execute(
+                "INSERT OR REPLACE INTO analyses (key, body, created_at) VALUES (?, ?, ?)",
+                (key, body, now)
+            )
+            self._stats["writes"] += 1
+
+    def purge_expired(self) -> int:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            for key in [k for k, (created_at, _) in self._lru.items() if created_at < cutoff]:
+                del self._lru[key]
+            return self._db.execute("DELETE FROM analyses WHERE created_at < ?", (cutoff,)).rowcount
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            self._db.execute("DELETE FROM analyses")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._lru)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        return stats
+
+
+def open_default_cache() -> AnalysisCache:
+    """Cache configured from ARTRESTORER_CACHE_PATH / _SIZE / _TTL_HOURS."""
+    return AnalysisCache(
+        os.getenv('ARTRESTORER_CACHE_PATH', os.path.join('.cache', 'analyses.sqlite3')),
+        max_entries=int(os.getenv('ARTRESTORER_CACHE_SIZE', '256')),
+        ttl_seconds=float(os.getenv('ARTRESTORER_CACHE_TTL_HOURS', '168')) * 3600
+    )
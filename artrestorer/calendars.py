@@ -0,0 +1,189 @@
+"""Working-day calendars: mapping planner weeks onto real dates.
+
+Planner weeks are working weeks. A WorkCalendar fixes which weekdays are worked
+and which dates the institution is closed. Week n of a plan spans the n-th
+block of `days_per_week` working days from the start date, so a holiday
+pushes every later date out by one working day rather than shortening a phase.
+
+Dates come from numpy's business-day routines on whole arrays: every phase of
+a plan, or every entry of a portfolio schedule, is mapped in one call.
+"""
+import math
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Name -> numpy weekmask (Monday first)
+WORKWEEKS = {
+    "Mon–Fri": "1111100",
+    "Mon–Sat": "1111110",
+    "Tue–Sat (museum hours)": "0111110",
+    "Sun–Thu": "1111001",
+}
+DEFAULT_WORKWEEK = "Mon–Fri"
+
+_RANGE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:\s*(?:\.\.|–|to)\s*(\d{4}-\d{2}-\d{2}))?\s*(?:[,;|]\s*(.*))?$")
+
+
+def easter_sunday(year: int) -> date:
+    """Western Easter (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _fixed(*days: Tuple[int, int, str]):
+    return lambda year: [(date(year, m, d), name) for m, d, name in days]
+
+
+def _common_closures(year: int) -> List[Tuple[date, str]]:
+    easter = easter_sunday(year)
+    return _fixed((1, 1, "New Year's Day"), (12, 25, "Christmas Day"), (12, 26, "Boxing Day"))(year) + [
+        (easter - timedelta(days=2), "Good Friday"),
+        (easter + timedelta(days=1), "Easter Monday"),
+    ]
+
+
+# Name -> function(year) giving that year's closures
+HOLIDAY_PRESETS = {
+    "None": lambda year: [],
+    "New Year & Christmas": _fixed((1, 1, "New Year's Day"), (12, 24, "Christmas Eve"), (12, 25, "Christmas Day"),
+                                   (12, 31, "New Year's Eve")),
+    "Common closures (New Year, Easter, Christmas)": _common_closures,
+    "Winter shutdown (24 Dec – 1 Jan)": lambda year: [(date(year, 12, 24) + timedelta(days=n), "Winter shutdown")
+                                                      for n in range(9)],
+}
+DEFAULT_HOLIDAY_PRESET = "None"
+
+
+def parse_holidays(text: str) -> Tuple[Tuple[date, ...], List[str]]:
+    """Closure dates from text: one ISO date or `start..end` range per line, optional `, name`; `#` comments.
+
+    Returns the sorted dates plus per-line error messages.
+    """
+    days, errors = set(), []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        match = _RANGE_RE.match(line)
+        try:
+            if not match:
+                raise ValueError(f"expected YYYY-MM-DD or YYYY-MM-DD..YYYY-MM-DD, got {line!r}")
+            first = date.fromisoformat(match.group(1))
+            last = date.fromisoformat(match.group(2)) if match.group(2) else first
+            if last < first:
+                raise ValueError(f"range ends before it starts ({line})")
+            days.update(first + timedelta(days=n) for n in range((last - first).days + 1))
+        except ValueError as e:
+            errors.append(f"Line {line_no}: {e}")
+    return tuple(sorted(days)), errors
+
+
+def _horizon_year(start: date, horizon_weeks: int) -> int:
+    # Holidays only push dates out, so cover the horizon with room to spare
+    return start.year + math.ceil(max(horizon_weeks, 1) * 7 / 365 * 1.25) + 1
+
+
+@lru_cache(maxsize=64)
+def _preset_days(preset: str, first_year: int, last_year: int) -> Tuple[date, ...]:
+    return tuple(d for year in range(first_year, last_year + 1) for d, _ in HOLIDAY_PRESETS[preset](year))
+
+
+class WorkCalendar(NamedTuple):
+    name: str = DEFAULT_WORKWEEK
+    weekmask: str = WORKWEEKS[DEFAULT_WORKWEEK]
+    holidays: Tuple[date, ...] = ()
+    preset: str = DEFAULT_HOLIDAY_PRESET
+    through_year: int = 0               # last year the preset's holidays are filled in for
+
+    @property
+    def days_per_week(self) -> int:
+        return self.weekmask.count("1")
+
+    def covering(self, start: date, horizon_weeks: int) -> "WorkCalendar":
+        """This calendar with the preset's holidays filled in far enough for `horizon_weeks` from `start`."""
+        last_year = _horizon_year(start, horizon_weeks)
+        if last_year <= self.through_year:
+            return self
+        first_year = max(self.through_year + 1, start.year)
+        days = set(self.holidays).union(_preset_days(self.preset, first_year, last_year))
+        return self._replace(holidays=tuple(sorted(days)), through_year=last_year)
+
+    def describe(self) -> str:
+        closures = f", {len(self.holidays)} closure days" if self.holidays else ""
+        return f"{self.name}{closures}"
+
+
+def build_calendar(workweek: str = DEFAULT_WORKWEEK, preset: str = DEFAULT_HOLIDAY_PRESET,
+                   extra_holidays: Iterable[date] = (), start: Optional[date] = None,
+                   horizon_weeks: int = 0) -> WorkCalendar:
+    """A calendar for `workweek` closed on `preset` holidays plus `extra_holidays`.
+
+    The preset's holidays are filled in over `horizon_weeks` from `start`; dating
+    anything later extends them on demand (WorkCalendar.covering).
+    Raises KeyError for an unknown workweek or preset.
+    """
+    weekmask = WORKWEEKS[workweek]
+    start = start or date.today()
+    last_year = _horizon_year(start, horizon_weeks)
+    days = set(_preset_days(preset, start.year, last_year)).union(extra_holidays)
+    return WorkCalendar(workweek, weekmask, tuple(sorted(days)), preset, last_year)
+
+
+@lru_cache(maxsize=32)
+def _busdaycalendar(weekmask: str, holidays: Tuple[date, ...]) -> np.busdaycalendar:
+    return np.busdaycalendar(weekmask=weekmask, holidays=np.array(holidays, dtype="datetime64[D]"))
+
+
+def week_spans(calendar: WorkCalendar, start: date, start_weeks: Sequence[int],
+               end_weeks: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """First and last working day of each span of planner weeks (1-based, inclusive)."""
+    end_weeks = np.asarray(end_weeks, dtype=np.int64)
+    calendar = calendar.covering(start, int(end_weeks.max(initial=0)))
+    cal = _busdaycalendar(calendar.weekmask, calendar.holidays)
+    per_week = calendar.days_per_week
+    origin = np.datetime64(start, "D")
+    first = np.busday_offset(origin, (np.asarray(start_weeks, dtype=np.int64) - 1) * per_week,
+                             roll="forward", busdaycal=cal)
+    last = np.busday_offset(origin, end_weeks * per_week - 1,
+                            roll="forward", busdaycal=cal)
+    return first, last
+
+
+def weeks_until(calendar: WorkCalendar, start: date, day: date) -> int:
+    """Whole planner weeks of working days from `start` up to and including `day`."""
+    calendar = calendar.covering(start, math.ceil((day - start).days / 7))
+    cal = _busdaycalendar(calendar.weekmask, calendar.holidays)
+    days = int(np.busday_count(np.datetime64(start, "D"), np.datetime64(day, "D") + 1, busdaycal=cal))
+    return max(1, days // calendar.days_per_week)
+
+
+def dated_phases(plan: Dict[str, Any], calendar: WorkCalendar, start: date) -> List[Dict[str, Any]]:
+    """The plan's phases with the calendar dates they occupy."""
+    phases = plan["phases"]
+    first, last = week_spans(calendar, start, [p["start_week"] for p in phases], [p["end_week"] for p in phases])
+    return [
+        {
+            "phase": p["phase"], "title": p["title"], "weeks": p["weeks"],
+            "start_week": p["start_week"], "end_week": p["end_week"],
+            "start_date": s.item(), "end_date": e.item(),
+            "critical": p["critical"], "slack_weeks": p["slack_weeks"],
+            "milestone": p["milestone"], "deliverable": p["deliverable"],
+        }
+        for p, s, e in zip(phases, first, last)
+    ]
+
+
+def dated_entries(entries: List[Dict[str, Any]], calendar: WorkCalendar, start: date) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end dates of every portfolio schedule entry, in entry order."""
+    return week_spans(calendar, start, [e["start_week"] for e in entries], [e["end_week"] for e in entries])
@@ -0,0 +1,432 @@
+"""Headless command line for the ArtRestorer engine.
+
+    python -m artrestorer analyse "Oil on canvas, 17th c., flaking varnish" --style Baroque
+    python -m artrestorer batch catalogue.csv --output reports.zip --concurrency 16
+    python -m artrestorer timeline --damage severe --size large --urgency priority --team 4 --samples 100000
+    python -m artrestorer timeline --damage severe --start 2027-01-04 --holidays closures.txt --format ics > plan.ics
+    python -m artrestorer solve --deadline 2027-06-30 --damage severe --size large --goal "public"
+    python -m artrestorer portfolio projects.csv --conservators 40 --start 2027-01-04 --format ics > portfolio.ics
+    python -m artrestorer feedback
+    python -m artrestorer history --name "A. Conservator" --search "lapis" --limit 10
+    python -m artrestorer insight "Indian Mughal Art"
+    python -m artrestorer search "gold leaf" --kind tradition
+    python -m artrestorer fetch-fonts
+    python -m artrestorer mock-openai --port 8400 --ttft 0.4 --tps 60 --rate-limit 0.05 --errors 0.02
+
+With the mock running, point the app or the CLI at it (any key is accepted):
+
+    OPENAI_BASE_URL=http://127.0.0.1:8400/v1 OPENAI_API_KEY=mock streamlit run artrestorer_redesigned.py
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import date, datetime
+from typing import List, Optional
+
+from .cache import open_default_cache
+from .calendars import (
+    DEFAULT_HOLIDAY_PRESET, DEFAULT_WORKWEEK, HOLIDAY_PRESETS, WORKWEEKS, build_calendar, parse_holidays
+)
+from .engine import (
+    FEATURE_KEYS, FEATURE_OPTIONS, analysis_cache_key, build_report_footer, build_report_header, stream_analysis
+)
+from .history import open_default_history
+from .knowledge import get_knowledge, to_plain
+from .montecarlo import simulate_plan
+from .report import build_report, render_text
+from .timeline import (
+    ARTWORK_TYPES, DAMAGE_SEVERITIES, DEFAULT_GOALS, GOALS, SIZES, TEAM_SIZES, URGENCIES, match_option, plan_timeline
+)
+
+
+def _load_env() -> str:
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise SystemExit("OPENAI_API_KEY is not set (environment or .env file)")
+    return api_key
+
+
+def _choose(options: List[str]):
+    """argparse type accepting an exact option or a unique case-insensitive prefix of one."""
+    def parse(value: str) -> str:
+        try:
+            return match_option(options, value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+    return parse
+
+
+def _creativity(value: str) -> float:
+    """argparse type for the creativity level, 0.0–1.0 like the app's slider and the batch parser."""
+    try:
+        level = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+    if not 0.0 <= level <= 1.0:
+        raise argparse.ArgumentTypeError(f"creativity {level:g} outside 0.0–1.0")
+    return level
+
+
+def _calendar(args, horizon_weeks: int = 520):
+    """The working calendar and start date from the --start / --workweek / --holiday-preset / --holidays flags."""
+    start = date.fromisoformat(args.start) if args.start else date.today()
+    extra = ()
+    if args.holidays:
+        with open(args.holidays, encoding='utf-8') as f:
+            extra, errors = parse_holidays(f.read())
+        for err in errors:
+            print(f"skipped holiday: {err}", file=sys.stderr)
+    return build_calendar(args.workweek, args.holiday_preset, extra, start, horizon_weeks), start
+
+
+def _write(data: bytes):
+    sys.stdout.buffer.write(data)
+    sys.stdout.flush()
+
+
+def _user(args) -> dict:
+    return {'name': args.name, 'role': args.role, 'goal': args.goal, 'artwork_type': args.artwork_type}
+
+
+def cmd_analyse(args) -> int:
+    from openai import OpenAIError
+
+    from .client import get_shared_client
+
+    api_key = _load_env()
+    req = {
+        'artwork_description': args.description,
+        'art_style': args.style,
+        'damage_type': args.damage,
+        'cultural_context': args.context,
+        'feature_key': args.analysis_type,
+        'feature_label': FEATURE_OPTIONS[FEATURE_KEYS.index(args.analysis_type)],
+        'temperature': args.creativity,
+    }
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    cache = None if args.no_cache else open_default_cache()
+    key = analysis_cache_key(req)
+    try:
+        out.write(build_report_header(req))
+        body = cache.get(key) if cache else None
+        if body is not None:
+            out.write(body)
+        else:
+            body = ""
+            try:
+                for delta in stream_analysis(get_shared_client(api_key), req, _user(args)):
+                    body += delta
+                    out.write(delta)
+                    out.flush()
+            except OpenAIError as e:
+                print(f"\nerror: analysis generation failed: {e}", file=sys.stderr)
+                return 1
+            if cache:
+                cache.put(key, body)
+        out.write(build_report_footer())
+        if not args.no_history:
+            open_default_history().save(build_report(req, body, user=_user(args)), _user(args), args.analysis_type)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_batch(args) -> int:
+    from .batch import parse_batch_file, run_batch
+    from .client import create_async_openai_client
+
+    with open(args.file, 'rb') as f:
+        records, errors = parse_batch_file(args.file, f.read())
+    for err in errors:
+        print(f"skipped: {err}", file=sys.stderr)
+    if not records:
+        print("error: no valid records", file=sys.stderr)
+        return 1
+
+    def progress(done, total, entry):
+        detail = entry.get('error') or entry.get('file')
+        print(f"[{done}/{total}] #{entry['index']} {entry['status']} {detail}", file=sys.stderr)
+
+    async def job():
+        async with create_async_openai_client(_load_env(), args.concurrency) as client:
+            return await run_batch(records, client, args.output, _user(args), concurrency=args.concurrency,
+                                   cache=None if args.no_cache else open_default_cache(),
+                                   history=None if args.no_history else open_default_history(),
+                                   on_progress=progress)
+
+    manifest = asyncio.run(job())
+    failed = sum(1 for m in manifest if m['status'] != 'ok')
+    print(f"{len(manifest) - failed} of {len(manifest)} analysed -> {args.output}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def cmd_timeline(args) -> int:
+    from .exports import timeline_export
+
+    plan = plan_timeline(args.artwork_type, args.damage, args.size, args.urgency, args.team,
+                         args.goals if args.goals is not None else DEFAULT_GOALS)
+    simulation = simulate_plan(plan, args.samples, args.seed) if args.samples else None
+    calendar, start = _calendar(args, plan['total_weeks'])
+    _write(timeline_export(plan, "json" if args.json else args.format, args.project, simulation, calendar, start))
+    return 0
+
+
+def cmd_solve(args) -> int:
+    from .portfolio import parse_deadline
+    from .solver import solve_deadline
+
+    calendar, start = _calendar(args)
+    try:
+        deadline = parse_deadline(args.deadline, start, calendar)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    result = solve_deadline(args.damage, args.size, deadline, args.goals or [], args.limit)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    elif not result['solutions']:
+        print(f"No configuration finishes within {deadline} weeks; the fastest takes {result['fastest_weeks']}.")
+    else:
+        print(f"Within {deadline} weeks, scope {', '.join(result['scope'])}:")
+        for s in result['solutions']:
+            extras = f"  (+ {', '.join(s['optional_phases_fit'])} fits)" if s['optional_phases_fit'] else ""
+            print(f"  {s['cost']:>7} conservator-weeks  {s['total_weeks']:>3}w  {s['team_size']} · {s['urgency']}{extras}")
+    return 0 if result['solutions'] else 1
+
+
+def cmd_portfolio(args) -> int:
+    from .exports import portfolio_export
+    from .portfolio import parse_portfolio_file, schedule_portfolio
+
+    calendar, start = _calendar(args)
+    with open(args.file, 'rb') as f:
+        projects, errors = parse_portfolio_file(args.file, f.read(), start, calendar)
+    for err in errors:
+        print(f"skipped: {err}", file=sys.stderr)
+    if not projects:
+        print("error: no valid projects", file=sys.stderr)
+        return 1
+    schedule = schedule_portfolio(projects, args.conservators)
+    _write(portfolio_export(schedule, "json" if args.json else args.format, calendar, start))
+    print(f"{len(projects)} projects on {args.conservators} conservators: {schedule['makespan_weeks']} weeks, "
+          f"{schedule['late_projects']} late, {schedule['utilisation']:.0%} utilised", file=sys.stderr)
+    return 0
+
+
+def cmd_feedback(args) -> int:
+    from .feedback import open_default_feedback_store
+
+    store = open_default_feedback_store()
+    summary = dict(store.summary(), by_category=store.ratings_by_category())
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return 0
+    if not summary['responses']:
+        print("No feedback yet.")
+        return 0
+    print(f"{summary['responses']} responses, average {summary['average_rating']:.2f}/5, "
+          f"{summary['would_recommend']:.0%} would recommend")
+    for row in summary['by_category']:
+        stars = " ".join(f"{n}★ {row[f'{n}★']}" for n in range(1, 6))
+        print(f"  {row['category']:<22} {row['responses']:>5}  avg {row['average_rating']:.2f}  {stars}")
+    return 0
+
+
+def cmd_history(args) -> int:
+    history = open_default_history()
+    user = {'name': args.name}
+    if args.show is not None:
+        report = history.get(args.show, user)
+        if report is None:
+            print(f"error: no report #{args.show} for this user", file=sys.stderr)
+            return 1
+        print(render_text(report))
+        return 0
+    try:
+        page = history.page(user, args.cursor, limit=args.limit, feature_key=args.analysis_type,
+                            since=datetime.fromisoformat(args.since) if args.since else None,
+                            until=datetime.fromisoformat(args.until) if args.until else None,
+                            search=args.search)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        entries = [dict(e, created_at=e['created_at'].isoformat(timespec='seconds')) for e in page.entries]
+        print(json.dumps({'entries': entries, 'next_cursor': page.next_cursor}, ensure_ascii=False, indent=2))
+        return 0
+    for e in page.entries:
+        print(f"#{e['id']:<7} {e['created_at']:%Y-%m-%d %H:%M}  {e['feature_label']}  {e['description']}")
+        print(f"         {e['excerpt']}")
+    if page.next_cursor:
+        print(f"more: --cursor {page.next_cursor}", file=sys.stderr)
+    return 0
+
+
+def cmd_insight(args) -> int:
+    if not args.tradition:
+        print("\n".join(get_knowledge().cultural_traditions))
+        return 0
+    insight = to_plain(get_knowledge().cultural_insights[args.tradition])
+    print(json.dumps({args.tradition: insight}, ensure_ascii=False, indent=2))
+    return 0
+
+
+def cmd_search(args) -> int:
+    from .search import SearchIndex, hits_as_dicts
+
+    hits = SearchIndex.from_knowledge(get_knowledge()).search(args.query, limit=args.limit, kinds=args.kind)
+    print(json.dumps(hits_as_dicts(hits), ensure_ascii=False, indent=2))
+    return 0
+
+
+def cmd_fetch_fonts(args) -> int:
+    from .theme import fetch_fonts
+
+    for path in fetch_fonts():
+        print(path)
+    return 0
+
+
+def cmd_mock_openai(args) -> int:
+    from .mockserver import MockConfig, MockOpenAIServer
+
+    config = MockConfig(ttft=args.ttft, tokens_per_second=args.tps, jitter=args.jitter,
+                        rate_limit_rate=args.rate_limit, error_rate=args.errors, retry_after=args.retry_after,
+                        seed=args.seed)
+    server = MockOpenAIServer(config, host=args.host, port=args.port)
+    print(f"mock OpenAI API at {server.base_url} (TTFT {config.ttft:g}s, {config.tokens_per_second:g} tokens/s, "
+          f"{config.rate_limit_rate:.0%} 429s, {config.error_rate:.0%} 5xx); Ctrl+C to stop", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(server.stats()), file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="artrestorer", description="ArtRestorer AI headless engine")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_profile(p):
+        p.add_argument("--name", default="")
+        p.add_argument("--role", default="Professional Conservator/Restorer")
+        p.add_argument("--goal", default="Physical restoration guidance")
+        p.add_argument("--artwork-type", dest="artwork_type", default="")
+        p.add_argument("--no-cache", action="store_true", help="bypass the shared analysis cache")
+        p.add_argument("--no-history", action="store_true", help="do not store the reports in the analysis history")
+
+    def add_calendar(p):
+        p.add_argument("--start", help="first working day, YYYY-MM-DD (default today)")
+        p.add_argument("--workweek", type=_choose(list(WORKWEEKS)), default=DEFAULT_WORKWEEK, help="working days")
+        p.add_argument("--holiday-preset", dest="holiday_preset", type=_choose(list(HOLIDAY_PRESETS)),
+                       default=DEFAULT_HOLIDAY_PRESET, help="built-in closure calendar")
+        p.add_argument("--holidays", help="file of institution closures, one date or YYYY-MM-DD..YYYY-MM-DD per line")
+
+    p = sub.add_parser("analyse", aliases=["analyze"], help="generate one restoration analysis")
+    p.add_argument("description")
+    p.add_argument("--style", default="")
+    p.add_argument("--damage", default="")
+    p.add_argument("--context", default="")
+    p.add_argument("--analysis-type", dest="analysis_type", choices=FEATURE_KEYS, default=FEATURE_KEYS[0])
+    p.add_argument("--creativity", type=_creativity, default=0.6, help="0.0 (conservative) to 1.0 (creative)")
+    p.add_argument("--output", "-o", help="write the report to a file instead of stdout")
+    add_profile(p)
+    p.set_defaults(func=cmd_analyse)
+
+    p = sub.add_parser("batch", help="analyse a CSV / JSONL catalogue into a zip archive")
+    p.add_argument("file")
+    p.add_argument("--output", "-o", default="artrestorer_batch.zip")
+    p.add_argument("--concurrency", type=int, default=8)
+    add_profile(p)
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("timeline", help="compute a restoration timeline plan")
+    p.add_argument("--artwork-type", dest="artwork_type", type=_choose(ARTWORK_TYPES), default=ARTWORK_TYPES[0])
+    p.add_argument("--damage", type=_choose(DAMAGE_SEVERITIES), default=DAMAGE_SEVERITIES[1])
+    p.add_argument("--size", type=_choose(SIZES), default=SIZES[0])
+    p.add_argument("--urgency", type=_choose(URGENCIES), default=URGENCIES[0])
+    p.add_argument("--team", type=_choose(TEAM_SIZES), default=TEAM_SIZES[1])
+    p.add_argument("--goal", dest="goals", action="append", type=_choose(GOALS),
+                   help="restoration goal (repeatable; defaults to stabilisation + full visual restoration)")
+    p.add_argument("--project", default="N/A")
+    p.add_argument("--samples", type=int, default=0, help="add a Monte Carlo duration forecast with this many draws")
+    p.add_argument("--seed", type=int)
+    p.add_argument("--format", choices=["txt", "ics", "csv", "json", "pdf"], default="txt")
+    p.add_argument("--json", action="store_true", help="same as --format json")
+    add_calendar(p)
+    p.set_defaults(func=cmd_timeline)
+
+    p = sub.add_parser("solve", help="cheapest team and urgency that meet a deadline")
+    p.add_argument("--deadline", required=True, help="week number or YYYY-MM-DD")
+    p.add_argument("--damage", type=_choose(DAMAGE_SEVERITIES), default=DAMAGE_SEVERITIES[1])
+    p.add_argument("--size", type=_choose(SIZES), default=SIZES[0])
+    p.add_argument("--goal", dest="goals", action="append", type=_choose(GOALS),
+                   help="required goal (repeatable; defaults to the full treatment)")
+    p.add_argument("--limit", type=int, default=5)
+    p.add_argument("--json", action="store_true")
+    add_calendar(p)
+    p.set_defaults(func=cmd_solve)
+
+    p = sub.add_parser("portfolio", help="schedule a CSV / JSONL list of projects onto a conservator pool")
+    p.add_argument("file")
+    p.add_argument("--conservators", type=int, default=12)
+    p.add_argument("--format", choices=["csv", "ics", "json"], default="csv")
+    p.add_argument("--json", action="store_true", help="same as --format json")
+    add_calendar(p)
+    p.set_defaults(func=cmd_portfolio)
+
+    p = sub.add_parser("feedback", help="aggregate stored user feedback by category")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_feedback)
+
+    p = sub.add_parser("history", help="page through or search a user's stored analyses")
+    p.add_argument("--name", default="", help="profile name the reports were generated under")
+    p.add_argument("--search", default="", help="full-text search over descriptions and report bodies")
+    p.add_argument("--analysis-type", dest="analysis_type", choices=FEATURE_KEYS)
+    p.add_argument("--since", help="YYYY-MM-DD[THH:MM]")
+    p.add_argument("--until", help="YYYY-MM-DD[THH:MM], exclusive")
+    p.add_argument("--cursor", help="next_cursor printed by the previous page")
+    p.add_argument("--limit", type=int, default=20)
+    p.add_argument("--show", type=int, metavar="ID", help="print one stored report")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_history)
+
+    p = sub.add_parser("insight", help="list cultural traditions or show one")
+    p.add_argument("tradition", nargs="?", type=_choose(list(get_knowledge().cultural_traditions)))
+    p.set_defaults(func=cmd_insight)
+
+    p = sub.add_parser("search", help="full-text search over the heritage knowledge base")
+    p.add_argument("query")
+    p.add_argument("--limit", type=int, default=10)
+    p.add_argument("--kind", action="append", choices=["tradition", "feature", "case"])
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("fetch-fonts", help="download the theme fonts into static/fonts for self-hosting")
+    p.set_defaults(func=cmd_fetch_fonts)
+
+    p = sub.add_parser("mock-openai", help="serve a local OpenAI-compatible mock for load tests and benchmarks")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8400)
+    p.add_argument("--ttft", type=float, default=0.4, help="seconds before the first streamed token")
+    p.add_argument("--tps", type=float, default=60.0, help="tokens per second (0 = unthrottled)")
+    p.add_argument("--jitter", type=float, default=0.0, help="+/- fraction of random variation in the delays")
+    p.add_argument("--rate-limit", dest="rate_limit", type=float, default=0.0, help="share of requests answered 429")
+    p.add_argument("--errors", type=float, default=0.0, help="share of requests answered 500/502/503")
+    p.add_argument("--retry-after", dest="retry_after", type=float, default=1.0)
+    p.add_argument("--seed", type=int, default=0, help="changes the generated reports and the failure sequence")
+    p.set_defaults(func=cmd_mock_openai)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,135 @@
+"""Pooled OpenAI clients with tuned HTTP connection limits.
+
+One client is meant to live for the whole server process so TLS sessions and
+keep-alive connections are reused across Streamlit sessions and reruns. HTTP/2
+is negotiated when the optional ``h2`` package is installed. OPENAI_BASE_URL
+points every client at another OpenAI-compatible endpoint, such as the local
+mock in ``artrestorer.mockserver``.
+"""
+import importlib.util
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+import httpx
+
+from .engine import api_base_url
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def pool_limits(max_connections: Optional[int] = None) -> httpx.Limits:
+    max_connections = max_connections or _env_int('OPENAI_POOL_MAX_CONNECTIONS', 64)
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(max_connections, _env_int('OPENAI_POOL_MAX_KEEPALIVE', 32)),
+        keepalive_expiry=float(os.getenv('OPENAI_POOL_KEEPALIVE_SECONDS', '90'))
+    )
+
+
+def request_timeout() -> httpx.Timeout:
+    # Short connect timeout so a dead pool slot fails fast; long read for streamed reports
+    return httpx.Timeout(float(os.getenv('OPENAI_READ_TIMEOUT', '120')), connect=5.0, pool=10.0)
+
+
+class PoolMetrics:
+    """Request counters fed by httpx event hooks, plus a live view of the pool."""
+
+    def __init__(self, limits: httpx.Limits):
+        self.limits = limits
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "responses": 0, "errors": 0}
+        self._http = None
+
+    def attach(self, http_client):
+        self._http = http_client
+
+    def on_request(self, request):
+        with self._lock:
+            self._counts["requests"] += 1
+
+    def on_response(self, response):
+        with self._lock:
+            self._counts["responses"] += 1
+            if response.status_code >= 400:
+                self._counts["errors"] += 1
+
+    async def on_request_async(self, request):
+        self.on_request(request)
+
+    async def on_response_async(self, response):
+        self.on_response(response)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._counts)
+        # httpcore keeps its connection list on the transport's pool; read it defensively
+        pool = getattr(getattr(self._http, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in connections if c.is_idle())
+        http2 = sum(1 for c in connections if getattr(c, "_connection", None) is not None
+                    and type(c._connection).__name__.startswith("HTTP2"))
+        stats.update({
+            "connections": len(connections),
+            "connections_idle": idle,
+            "connections_active": len(connections) - idle,
+            "connections_http2": http2,
+            "requests_queued": len(getattr(pool, "_requests", []) or []),
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+        })
+        stats["utilisation"] = round(stats["connections_active"] / max(1, self.limits.max_connections), 3)
+        return stats
+
+
+def create_openai_client(api_key: str, base_url: Optional[str] = None) -> "OpenAI":
+    """Synchronous client on a bounded keep-alive pool; metrics at ``client.pool_metrics``."""
+    from openai import OpenAI
+
+    limits = pool_limits()
+    metrics = PoolMetrics(limits)
+    http_client = httpx.Client(
+        limits=limits, timeout=request_timeout(), http2=HTTP2_AVAILABLE,
+        event_hooks={"request": [metrics.on_request], "response": [metrics.on_response]}
+    )
+    metrics.attach(http_client)
+    client = OpenAI(api_key=api_key, base_url=base_url or api_base_url(), http_client=http_client)
+    client.pool_metrics = metrics
+    return client
+
+
+def create_async_openai_client(api_key: str, max_connections: Optional[int] = None,
+                               base_url: Optional[str] = None) -> "AsyncOpenAI":
+    """Async client for one event loop (a batch run); size the pool to its concurrency."""
+    from openai import AsyncOpenAI
+
+    limits = pool_limits(max_connections)
+    metrics = PoolMetrics(limits)
+    http_client = httpx.AsyncClient(
+        limits=limits, timeout=request_timeout(), http2=HTTP2_AVAILABLE,
+        event_hooks={"request": [metrics.on_request_async], "response": [metrics.on_response_async]}
+    )
+    metrics.attach(http_client)
+    client = AsyncOpenAI(api_key=api_key, base_url=base_url or api_base_url(), http_client=http_client)
+    client.pool_metrics = metrics
+    return client
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_client(api_key: str) -> "OpenAI":
+    """Process-wide client for callers outside Streamlit (workers, the CLI)."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = create_openai_client(api_key)
+        return _shared_client
@@ -0,0 +1,174 @@
+"""Prompt construction and report assembly for restoration analyses.
+
+Free of Streamlit (and of any import-time OpenAI dependency) so workers, the
+batch runner and the CLI build exactly the same prompts and reports as the
+interactive Restoration Assistant.
+"""
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .cache import make_cache_key
+from .metrics import GENERATION_SECONDS, GENERATION_TOKENS, GENERATION_TTFT_SECONDS
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+feature_descriptions = {
+    'period': 'Expert restoration guidance for Baroque and Renaissance artworks using historically accurate techniques',
+    'cultural': 'Restore and enhance traditional patterns from Mughal, Islamic, Celtic, Asian, and indigenous arts',
+    'sculptural': 'Reconstruct eroded or damaged features in sculptures, statues, and three-dimensional artifacts',
+    'textile': 'Expert restoration for tapestries, embroidery, historical fabrics, and woven artifacts',
+    'abstract': 'Restore contemporary, abstract, expressionist, and modern artworks',
+    'manuscript': 'Restore illuminated manuscripts, scrolls, codices, and historical documents',
+    'mural': 'Restore wall paintings, cave art, frescoes, and architectural murals',
+    'ceramic': 'Restore pottery, porcelain, ceramic vessels, and glazed artifacts',
+    'symbol': 'Decode and restore symbolic elements, religious imagery, inscriptions, and cultural icons',
+    'educational': 'Create engaging museum descriptions, exhibition content, and educational materials'
+}
+
+FEATURE_OPTIONS = [
+    "1. 🎭 Period-Specific Restoration (Baroque/Renaissance)",
+    "2. 🕌 Cultural Pattern Enhancement (Traditional Arts)",
+    "3. 🗿 Sculptural Reconstruction",
+    "4. 🧵 Textile & Tapestry Repair",
+    "5. 🎨 Abstract & Modern Art Recovery",
+    "6. 📜 Ancient Manuscript Conservation",
+    "7. 🏛️ Mural & Fresco Revival",
+    "8. 🏺 Ceramic & Pottery Reconstruction",
+    "9. 🔯 Symbol & Iconography Interpretation",
+    "10. 🎓 Educational Content Generation"
+]
+FEATURE_KEYS = list(feature_descriptions)
+
+DEFAULT_MODEL = 'gpt-4o-mini'
+REPORT_RULE = "═" * 58
+
+ANALYSIS_SECTIONS = [
+    "HISTORICAL CONTEXT & SIGNIFICANCE",
+    "CONDITION ASSESSMENT",
+    "RESTORATION METHODOLOGY",
+    "MATERIALS & TECHNIQUES",
+    "CULTURAL & HISTORICAL CONSIDERATIONS",
+    "TECHNICAL SPECIFICATIONS",
+    "CONSERVATION CHALLENGES & SOLUTIONS",
+    "PREVENTIVE CONSERVATION",
+    "ETHICAL CONSIDERATIONS",
+    "DOCUMENTATION & REPORTING"
+]
+
+CREATIVITY_LEVELS = ["highly conservative", "conservative and methodical", "balanced and professional",
+                     "creative and exploratory", "highly creative and innovative"]
+
+REPORT_DISCLAIMER = """IMPORTANT DISCLAIMER:
+This analysis is advisory only. All physical restoration work must be performed by certified professional conservators following appropriate institutional guidelines."""
+
+
+def analysis_cache_key(req: Dict[str, Any]) -> str:
+    return make_cache_key(req['artwork_description'], req['art_style'], req['damage_type'],
+                          req['cultural_context'], req['feature_key'], req['temperature'], analysis_model(),
+                          api_base_url() or "")
+
+
+def analysis_model() -> str:
+    # Read lazily so a .env loaded after import still takes effect
+    return os.getenv('OPENAI_MODEL', DEFAULT_MODEL)
+
+
+def api_base_url() -> Optional[str]:
+    """OPENAI_BASE_URL when the API is served from somewhere else, e.g. the local mock."""
+    return os.getenv('OPENAI_BASE_URL') or None
+
+
+def creativity_label(temperature: float) -> str:
+    return CREATIVITY_LEVELS[min(int(temperature / 0.2), 4)]
+
+
+def build_report_header(req: Dict[str, Any]) -> str:
+    """Fixed preamble of the report; rendered immediately, before the model responds."""
+    return f"""COMPREHENSIVE RESTORATION ANALYSIS
+{REPORT_RULE}
+
+ARTWORK DETAILS:
+{req['artwork_description']}
+
+STYLE/PERIOD: {req['art_style'] or 'Not specified'}
+DAMAGE TYPE: {req['damage_type'] or 'general wear'}
+CULTURAL CONTEXT: {req['cultural_context'] or 'Not specified'}
+ANALYSIS TYPE: {req['feature_label']}
+AI CREATIVITY LEVEL: {req['temperature']} ({creativity_label(req['temperature'])})
+
+{REPORT_RULE}
+
+EXPERT RESTORATION GUIDANCE:
+
+"""
+
+
+def build_report_footer() -> str:
+    return f"\n\n{REPORT_RULE}\n\n{REPORT_DISCLAIMER}\n\n{REPORT_RULE}\n"
+
+
+def build_analysis_messages(req: Dict[str, Any], user: Dict[str, Any]) -> List[Dict[str, str]]:
+    section_list = "\n".join(f"{i}. {title}" for i, title in enumerate(ANALYSIS_SECTIONS, 1))
+    system = (
+        "You are ArtRestorer AI, an expert art conservator and cultural heritage specialist. "
+        "You follow ICOM-CC and AIC conservation ethics: minimal intervention, reversibility and full documentation. "
+        f"Focus of this analysis: {feature_descriptions[req['feature_key']]}.\n\n"
+        "Write plain text only (no markdown). Use exactly these ten numbered, upper-case section headings, in order:\n"
+        f"{section_list}\n\n"
+        f"After section 10 write a line containing only {REPORT_RULE}, then a blank line, then 'CONCLUSION:' "
+        "followed by a short concluding paragraph. Do not add a disclaimer. "
+        "Use '•' for bullet points and indent section bodies by three spaces."
+    )
+    prompt = f"""Artwork description:
+{req['artwork_description']}
+
+Art style / period: {req['art_style'] or 'Not specified'}
+Damage type: {req['damage_type'] or 'general wear'}
+Cultural context: {req['cultural_context'] or 'Not specified'}
+Analysis type: {req['feature_label']}
+Creativity: {creativity_label(req['temperature'])}
+
+Prepared for: {user.get('role', 'Not specified')} working with {user.get('artwork_type', 'an artwork')}; primary goal: {user.get('goal', 'Not specified')}."""
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def stream_analysis(client: "OpenAI", req: Dict[str, Any], user: Dict[str, Any]):
+    """Yield report text deltas from the chat completions API as they arrive.
+
+    Time to first token, total latency and the usage reported on the final chunk are recorded in metrics.
+    """
+    started = time.perf_counter()
+    outcome, first = "error", True
+    try:
+        stream = client.chat.completions.create(
+            model=analysis_model(),
+            messages=build_analysis_messages(req, user),
+            temperature=req['temperature'],
+            max_tokens=2500,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                if first:
+                    GENERATION_TTFT_SECONDS.observe(time.perf_counter() - started)
+                    first = False
+                yield chunk.choices[0].delta.content
+            if getattr(chunk, "usage", None):
+                record_usage(chunk.usage)
+        outcome = "ok"
+    except GeneratorExit:
+        outcome = "cancelled"
+        raise
+    finally:
+        GENERATION_SECONDS.observe(time.perf_counter() - started, mode="stream", outcome=outcome)
+
+
+def record_usage(usage) -> None:
+    GENERATION_TOKENS.inc(usage.prompt_tokens or 0, kind="prompt")
+    GENERATION_TOKENS.inc(usage.completion_tokens or 0, kind="completion")
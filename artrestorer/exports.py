@@ -0,0 +1,462 @@
+"""On-demand exports of reports, timeline plans and portfolio schedules.
+
+Reports export as TXT, standalone HTML, JSON and PDF. Timeline plans and
+portfolio schedules are dated on a working calendar (see calendars.py) and
+export as ICS, CSV and JSON, with TXT and PDF for single plans. Every writer
+makes one pass over precomputed dates and joins its output once.
+
+Nothing is rendered until a download is requested. A render runs on the
+thread that asks for it; in the app that is the worker thread Streamlit runs a
+deferred download on, never the script thread. The bytes are cached by (kind,
+content digest, format), so a second request for the same export, from any
+session, is a cache hit. A render already in flight is shared rather than
+started twice.
+
+PDF output needs the optional ``fpdf2`` package; PDF_AVAILABLE says whether it
+is installed. The built-in PDF fonts are Latin-1, so characters outside it are
+transliterated or dropped.
+"""
+import csv
+import hashlib
+import html
+import importlib.util
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .calendars import WorkCalendar, dated_entries, dated_phases
+from .engine import REPORT_DISCLAIMER, creativity_label
+from .montecarlo import simulation_export_text
+from .report import Report, export_text, report_digest, report_json
+from .timeline import PHASE_TEMPLATES, timeline_export_text
+
+PDF_AVAILABLE = importlib.util.find_spec("fpdf") is not None
+
+# format -> (MIME type, file extension)
+EXPORT_FORMATS = {
+    "txt": ("text/plain", "txt"),
+    "html": ("text/html", "html"),
+    "json": ("application/json", "json"),
+    "pdf": ("application/pdf", "pdf"),
+    "ics": ("text/calendar", "ics"),
+    "csv": ("text/csv", "csv"),
+}
+FORMAT_LABELS = {"txt": "Plain text", "html": "Web page (HTML)", "json": "Structured data (JSON)", "pdf": "PDF document",
+                 "ics": "Calendar (ICS)", "csv": "Spreadsheet (CSV)"}
+REPORT_FORMATS = ("txt", "html", "json", "pdf")
+TIMELINE_FORMATS = ("txt", "ics", "csv", "json", "pdf")
+PORTFOLIO_FORMATS = ("csv", "ics", "json")
+
+
+def available_formats(formats: Iterable[str] = REPORT_FORMATS) -> List[str]:
+    return [f for f in formats if f != "pdf" or PDF_AVAILABLE]
+
+
+class _Render:
+    """One render in flight; requests for the same export wait on it."""
+
+    def __init__(self):
+        self.finished = threading.Event()
+        self.result: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+class ExportCache:
+    """Bounded LRU of rendered exports plus the renders still in flight."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._done: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str, str], _Render] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "renders": 0, "shared": 0, "failures": 0}
+
+    def get(self, key: Tuple[str, str, str], render: Callable[[], bytes]) -> bytes:
+        """The cached bytes, else render on the calling thread; a render already in flight is waited on.
+
+        A failed render is not cached; its exception is raised to every caller waiting on it.
+        """
+        with self._lock:
+            if key in self._done:
+                self._done.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._done[key]
+            flight = self._pending.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._pending[key] = _Render()
+                self._stats["renders"] += 1
+            else:
+                self._stats["shared"] += 1
+        if not owner:
+            flight.finished.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = render()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+                if flight.error is None:
+                    self._done[key] = flight.result
+                    while len(self._done) > self.max_entries:
+                        self._done.popitem(last=False)
+                else:
+                    self._stats["failures"] += 1
+            flight.finished.set()
+        return flight.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._done)
+            stats["in_flight"] = len(self._pending)
+        return stats
+
+
+_shared_cache: Optional[ExportCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_export_cache() -> ExportCache:
+    """Process-wide export cache; sized by ARTRESTORER_EXPORT_CACHE_SIZE."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ExportCache(int(os.getenv('ARTRESTORER_EXPORT_CACHE_SIZE', '128')))
+        return _shared_cache
+
+
+def export_file_name(stem: str, fmt: str) -> str:
+    return f"{stem}.{EXPORT_FORMATS[fmt][1]}"
+
+
+# ---------- PDF ----------
+
+_LATIN1 = str.maketrans({
+    "•": "-", "—": "-", "–": "-", "═": "=", "━": "-", "→": "->", "←": "<-", "↓": "v",
+    "‘": "'", "’": "'", "“": '"', "”": '"', "…": "...", "★": "*", "σ": "sd", "✓": "v",
+})
+
+
+def _pdf_text(text: str) -> str:
+    text = text.translate(_LATIN1).encode("latin-1", "ignore").decode("latin-1")
+    return "\n".join(" ".join(line.split()) if line.strip() else "" for line in text.splitlines())
+
+
+def _pdf(title: str, blocks: List[Tuple[str, str]], footer: str) -> bytes:
+    """Lay out (style, text) blocks on A4; style is "title", "heading", "meta" or "body"."""
+    from fpdf import FPDF
+
+    class Document(FPDF):
+        def footer(self):
+            self.set_y(-14)
+            self.set_font("Helvetica", "I", 8)
+            self.set_text_color(120)
+            self.cell(0, 8, _pdf_text(f"{footer}  ·  page {self.page_no()}"), align="C")
+
+    pdf = Document(format="A4")
+    pdf.set_title(_pdf_text(title))
+    pdf.set_author("ArtRestorer AI")
+    pdf.set_auto_page_break(True, margin=18)
+    pdf.set_margins(18, 18, 18)
+    pdf.add_page()
+    styles = {"title": ("B", 16, 8), "heading": ("B", 12, 6.5), "meta": ("", 9, 5), "body": ("", 10, 5.2)}
+    for style, text in blocks:
+        weight, size, line_height = styles[style]
+        pdf.set_font("Helvetica", weight, size)
+        pdf.set_text_color(20 if style != "meta" else 90)
+        if style == "heading":
+            pdf.ln(2)
+        pdf.multi_cell(0, line_height, _pdf_text(text))
+        pdf.ln(1.5 if style != "title" else 3)
+    return bytes(pdf.output())
+
+
+# ---------- restoration reports ----------
+
+def report_pdf(report: Report) -> bytes:
+    req = report.details
+    user = dict(report.prepared_for)
+    generated = datetime.fromisoformat(report.generated_at)
+    blocks = [
+        ("title", "Comprehensive Restoration Analysis"),
+        ("meta", f"Prepared for {user.get('name') or '-'} ({user.get('role') or '-'}) · {generated.strftime('%B %d, %Y')}"),
+        ("heading", "Artwork Details"),
+        ("body", req['artwork_description']),
+        ("meta", f"Style/Period: {req['art_style'] or 'Not specified'}\n"
+                 f"Damage Type: {req['damage_type'] or 'general wear'}\n"
+                 f"Cultural Context: {req['cultural_context'] or 'Not specified'}\n"
+                 f"Analysis Type: {req['feature_label']}\n"
+                 f"AI Creativity Level: {req['temperature']} ({creativity_label(req['temperature'])})"),
+    ]
+    for s in report.sections:
+        if s.key == "preamble":
+            blocks.append(("body", s.body))
+        elif s.key == "conclusion":
+            blocks.extend([("heading", "Conclusion"), ("body", s.body)])
+        else:
+            blocks.extend([("heading", f"{int(s.key[-2:])}. {s.title.title()}"), ("body", s.body)])
+    if not report.complete:
+        blocks.append(("meta", "Generation was interrupted - this report is incomplete."))
+    blocks.extend([("heading", "Important Disclaimer"), ("meta", REPORT_DISCLAIMER.split("\n", 1)[1])])
+    return _pdf("ArtRestorer AI Restoration Analysis", blocks, "ArtRestorer AI · Cultural Heritage Preservation")
+
+
+HTML_DOCUMENT_STYLE = """
+body { font-family: 'Inter', system-ui, sans-serif; color: #1f2430; max-width: 46rem; margin: 2.5rem auto; padding: 0 1.5rem; line-height: 1.65; }
+h1, h2 { font-family: 'Space Grotesk', system-ui, sans-serif; }
+h1 { font-size: 1.8rem; margin-bottom: 0.2rem; }
+h2 { font-size: 1.15rem; color: #5b3fc4; margin-top: 2rem; border-bottom: 1px solid #e4e0f5; padding-bottom: 0.3rem; }
+.meta { color: #667085; font-size: 0.88rem; }
+dl { display: grid; grid-template-columns: max-content 1fr; gap: 0.2rem 1rem; font-size: 0.9rem; }
+dt { font-weight: 600; }
+.disclaimer { margin-top: 2.5rem; padding: 1rem 1.2rem; background: #fdf2f8; border-left: 3px solid #ec4899; font-size: 0.85rem; }
+@media print { body { margin: 0; } h2 { break-after: avoid; } }
+"""
+
+
+def _html_paragraphs(text: str) -> str:
+    blocks = [b for b in text.strip("\n").split("\n\n") if b.strip()]
+    return "".join("<p>" + "<br>".join(html.escape(line.strip()) for line in b.splitlines()) + "</p>" for b in blocks)
+
+
+def report_html_document(report: Report) -> bytes:
+    req = report.details
+    user = dict(report.prepared_for)
+    generated = datetime.fromisoformat(report.generated_at)
+    details = [
+        ("Style/Period", req['art_style'] or 'Not specified'),
+        ("Damage Type", req['damage_type'] or 'general wear'),
+        ("Cultural Context", req['cultural_context'] or 'Not specified'),
+        ("Analysis Type", req['feature_label']),
+        ("AI Creativity Level", f"{req['temperature']} ({creativity_label(req['temperature'])})"),
+    ]
+    parts = [
+        "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>",
+        "<title>ArtRestorer AI — Restoration Analysis</title>",
+        f"<style>{HTML_DOCUMENT_STYLE}</style></head><body>",
+        "<h1>Comprehensive Restoration Analysis</h1>",
+        f"<p class='meta'>Prepared for {html.escape(user.get('name') or '—')} · {html.escape(user.get('role') or '—')}"
+        f" · {generated.strftime('%B %d, %Y')}</p>",
+        "<h2>Artwork Details</h2>", _html_paragraphs(req['artwork_description']),
+        "<dl>", "".join(f"<dt>{k}</dt><dd>{html.escape(str(v))}</dd>" for k, v in details), "</dl>",
+    ]
+    for s in report.sections:
+        if s.key == "preamble":
+            parts.append(_html_paragraphs(s.body))
+        else:
+            heading = "Conclusion" if s.key == "conclusion" else f"{int(s.key[-2:])}. {s.title.title()}"
+            parts.append(f"<h2 id='{s.key}'>{html.escape(heading)}</h2>{_html_paragraphs(s.body)}")
+    if not report.complete:
+        parts.append("<p class='meta'><em>Generation was interrupted — this report is incomplete.</em></p>")
+    parts.append(f"<div class='disclaimer'><strong>Important disclaimer.</strong> "
+                 f"{html.escape(REPORT_DISCLAIMER.split(chr(10), 1)[1])}</div></body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+REPORT_RENDERERS: Dict[str, Callable[[Report], bytes]] = {
+    "txt": lambda r: export_text(r).encode("utf-8"),
+    "html": report_html_document,
+    "json": lambda r: report_json(r).encode("utf-8"),
+    "pdf": report_pdf,
+}
+
+
+def report_export(report: Report, fmt: str, cache: Optional[ExportCache] = None) -> bytes:
+    cache = cache or get_export_cache()
+    return cache.get(("report", report_digest(report), fmt), lambda: REPORT_RENDERERS[fmt](report))
+
+
+# ---------- calendars (ICS / CSV) ----------
+
+def _ics_text(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _slug(value: str) -> str:
+    return "-".join(value.lower().split())
+
+
+def _ics_fold(line: str) -> str:
+    """Fold a content line at 75 octets without splitting a UTF-8 sequence (RFC 5545 §3.1)."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line
+    parts, limit = [], 75
+    while len(data) > limit:
+        cut = limit
+        while cut and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data, limit = data[cut:], 74
+    parts.append(data.decode("utf-8"))
+    return "\r\n ".join(parts)
+
+
+class _Calendar:
+    """Accumulates VEVENT lines for one VCALENDAR document, written out with a single join."""
+
+    def __init__(self, name: str, stamp: datetime):
+        self.stamp = stamp.strftime("%Y%m%dT%H%M%SZ")
+        self.lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//ArtRestorer AI//Timeline Planner//EN",
+                      "CALSCALE:GREGORIAN", "METHOD:PUBLISH", f"X-WR-CALNAME:{_ics_text(name)}"]
+
+    def event(self, uid: str, first: date, last: date, summary: str, description: str = "", category: str = ""):
+        self.lines.extend((
+            "BEGIN:VEVENT", f"UID:{uid}", f"DTSTAMP:{self.stamp}",
+            f"DTSTART;VALUE=DATE:{first:%Y%m%d}", f"DTEND;VALUE=DATE:{last + timedelta(days=1):%Y%m%d}",
+            f"SUMMARY:{_ics_text(summary)}", "TRANSP:TRANSPARENT",
+        ))
+        if description:
+            self.lines.append(f"DESCRIPTION:{_ics_text(description)}")
+        if category:
+            self.lines.append(f"CATEGORIES:{_ics_text(category)}")
+        self.lines.append("END:VEVENT")
+
+    def to_bytes(self) -> bytes:
+        return ("\r\n".join(map(_ics_fold, self.lines + ["END:VCALENDAR"])) + "\r\n").encode("utf-8")
+
+
+def _csv_bytes(header: List[str], rows: Iterable[Iterable[Any]]) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return out.getvalue().encode("utf-8")
+
+
+# ---------- timeline plans ----------
+
+def timeline_digest(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+def timeline_pdf(text: str) -> bytes:
+    lines = text.splitlines()
+    title = lines[0] if lines else "Restoration Timeline Plan"
+    blocks = [("title", title)]
+    body: List[str] = []
+    for line in lines[1:]:
+        if line.strip().startswith("═"):
+            continue
+        if line.isupper() and line.strip() and not line.startswith(" "):
+            if body:
+                blocks.append(("body", "\n".join(body)))
+                body = []
+            blocks.append(("heading", line.title()))
+        else:
+            body.append(line)
+    if body:
+        blocks.append(("body", "\n".join(body)))
+    return _pdf(title, blocks, "ArtRestorer AI · Restoration Timeline Plan")
+
+
+def timeline_ics(plan: Dict[str, Any], dates: List[Dict[str, Any]], project_name: str, digest: str) -> bytes:
+    """One all-day event per phase plus one on each phase's last day for its milestone."""
+    title = f"{project_name} · {plan['params']['artwork_type']}"
+    ics = _Calendar(f"Restoration — {title}", datetime.now(timezone.utc))
+    for p in dates:
+        timing = "On the critical path" if p["critical"] else f"{p['slack_weeks']} weeks of float"
+        uid = f"{digest[:16]}-{_slug(p['phase'])}"
+        ics.event(f"{uid}@artrestorer", p["start_date"], p["end_date"],
+                  f"{p['phase']}: {p['title']} — {title}",
+                  f"Weeks {p['start_week']}–{p['end_week']} ({p['weeks']}w). {timing}.\n"
+                  f"Deliverable: {p['deliverable']}", "Restoration phase")
+        ics.event(f"{uid}-milestone@artrestorer", p["end_date"], p["end_date"],
+                  f"Milestone: {p['milestone']}", f"{p['phase']}: {p['title']} — {title}", "Milestone")
+    return ics.to_bytes()
+
+
+TIMELINE_CSV_HEADER = ['phase', 'title', 'weeks', 'start_week', 'end_week', 'start_date', 'end_date',
+                       'critical', 'slack_weeks', 'milestone', 'deliverable']
+
+
+def timeline_export(plan: Dict[str, Any], fmt: str, project_name: str = "N/A",
+                    simulation: Optional[Dict[str, Any]] = None, calendar: Optional[WorkCalendar] = None,
+                    start: Optional[date] = None, cache: Optional[ExportCache] = None) -> bytes:
+    """Export a plan dated on `calendar` from `start` (today by default); formats are TIMELINE_FORMATS."""
+    calendar = calendar or WorkCalendar()
+    start = start or date.today()
+    if simulation is not None:
+        simulation = {k: v for k, v in simulation.items() if k != "elapsed_ms"}
+    payload = {"project": project_name, "plan": plan, "simulation": simulation,
+               "calendar": calendar._asdict(), "start": start}
+    digest = timeline_digest(payload)
+
+    def render() -> bytes:
+        # Dates are computed once per render and shared by whichever writer runs
+        dates = dated_phases(plan, calendar, start)
+        if fmt == "ics":
+            return timeline_ics(plan, dates, project_name, digest)
+        if fmt == "csv":
+            return _csv_bytes(TIMELINE_CSV_HEADER, ([p[k] for k in TIMELINE_CSV_HEADER] for p in dates))
+        if fmt == "json":
+            data = dict(plan, project=project_name, start_date=start, calendar=calendar._asdict(), schedule=dates)
+            if simulation is not None:
+                data["simulation"] = simulation
+            return json.dumps(data, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+        text = timeline_export_text(plan, project_name, dates=dates, calendar_name=calendar.describe())
+        if simulation is not None:
+            text += simulation_export_text(simulation)
+        return text.encode("utf-8") if fmt == "txt" else timeline_pdf(text)
+
+    cache = cache or get_export_cache()
+    return cache.get(("timeline", digest, fmt), render)
+
+
+# ---------- portfolio schedules ----------
+
+PORTFOLIO_CSV_HEADER = ['index', 'name', 'phase', 'crew', 'start_week', 'end_week', 'weeks', 'start_date', 'end_date']
+_MILESTONES = {t["phase"]: t["milestone"] for t in PHASE_TEMPLATES}
+
+
+def portfolio_ics(schedule: Dict[str, Any], first: np.ndarray, last: np.ndarray, digest: str) -> bytes:
+    ics = _Calendar(f"Restoration portfolio — {len(schedule['projects'])} projects", datetime.now(timezone.utc))
+    deadlines = {p['index']: p['deadline_week'] for p in schedule['projects']}
+    for e, s, f in zip(schedule['entries'], first.tolist(), last.tolist()):
+        phase_id = e['phase'].split(":", 1)[0]
+        uid = f"{digest[:16]}-{e['index']}-{_slug(phase_id)}"
+        ics.event(f"{uid}@artrestorer", s, f, f"{e['name']} — {e['phase']}",
+                  f"Weeks {e['start_week']}–{e['end_week']} ({e['weeks']}w), crew of {e['crew']}."
+                  + (f" Deadline week {deadlines[e['index']]}." if deadlines.get(e['index']) else ""),
+                  "Restoration phase")
+        ics.event(f"{uid}-milestone@artrestorer", f, f, f"{e['name']} — Milestone: {_MILESTONES.get(phase_id, e['phase'])}",
+                  e['phase'], "Milestone")
+    return ics.to_bytes()
+
+
+def portfolio_export(schedule: Dict[str, Any], fmt: str, calendar: Optional[WorkCalendar] = None,
+                     start: Optional[date] = None, cache: Optional[ExportCache] = None) -> bytes:
+    """Export a portfolio schedule dated on `calendar`; formats are PORTFOLIO_FORMATS."""
+    calendar = calendar or WorkCalendar()
+    start = start or date.today()
+    digest = timeline_digest({"schedule": schedule, "calendar": calendar._asdict(), "start": start})
+
+    def render() -> bytes:
+        first, last = dated_entries(schedule['entries'], calendar, start)
+        if fmt == "ics":
+            return portfolio_ics(schedule, first, last, digest)
+        if fmt == "csv":
+            order = sorted(range(len(schedule['entries'])),
+                           key=lambda k: (schedule['entries'][k]['start_week'], schedule['entries'][k]['index']))
+            starts, ends = first.astype(str), last.astype(str)
+            return _csv_bytes(PORTFOLIO_CSV_HEADER, (
+                [schedule['entries'][k][c] for c in PORTFOLIO_CSV_HEADER[:-2]] + [starts[k], ends[k]] for k in order
+            ))
+        entries = [dict(e, start_date=s, end_date=f) for e, s, f in zip(schedule['entries'], first.tolist(), last.tolist())]
+        data = dict(schedule, entries=entries, start_date=start, calendar=calendar._asdict())
+        return json.dumps(data, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+
+    cache = cache or get_export_cache()
+    return cache.get(("portfolio", digest, fmt), render)
@@ -0,0 +1,184 @@
+"""Append-only feedback store.
+
+Submissions are queued in memory and written to SQLite (WAL) by one background
+thread. The thread takes what has queued up, up to BATCH_SIZE rows or whatever
+arrives within FLUSH_INTERVAL of the first, and inserts it in one transaction.
+submit() never touches disk, so the session that submitted returns at once.
+Rows are never updated or deleted. The aggregation view is a few GROUP BY
+queries over the same file.
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+RATINGS = ("⭐ Poor", "⭐⭐ Fair", "⭐⭐⭐ Good", "⭐⭐⭐⭐ Very Good", "⭐⭐⭐⭐⭐ Excellent")
+CATEGORIES = ("General Feedback", "Feature Request", "Bug Report", "Accuracy of Analysis", "User Experience", "Other")
+RECOMMEND = ("👍 Yes", "🤔 Maybe", "👎 No")
+
+BATCH_SIZE = 100
+FLUSH_INTERVAL = 0.5
+WRITE_RETRIES = 3
+
+_STOP = object()
+
+
+class FeedbackStore:
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._stats = {"submitted": 0, "written": 0, "batches": 0, "dropped": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS feedback ("
+            " id INTEGER PRIMARY KEY,"
+            " created_at REAL NOT NULL,"
+            " name TEXT NOT NULL,"
+            " email TEXT NOT NULL,"
+            " rating INTEGER NOT NULL,"
+            " category TEXT NOT NULL,"
+            " recommend TEXT NOT NULL,"
+            " comments TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_feedback_category ON feedback (category)")
+
+    # ---------- writing ----------
+
+    def submit(self, name: str, comments: str, rating: str = RATINGS[2], category: str = CATEGORIES[0],
+               recommend: str = RECOMMEND[0], email: str = "") -> None:
+        """Queue one submission; `rating` is one of RATINGS. Raises ValueError for a missing name or comment."""
+        name, comments = name.strip(), comments.strip()
+        if not name or not comments:
+            raise ValueError("a name and comments are required")
+        row = (time.time(), name, email.strip(), RATINGS.index(rating) + 1, category, recommend, comments)
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="artrestorer-feedback", daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+            self._stats["submitted"] += 1
+        self._queue.put(row)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[tuple]):
+        for attempt in range(WRITE_RETRIES):
+            try:
+                with self._lock:
+                    self._db.execute("BEGIN")
+                    self._db.executemany(
+                        "INSERT INTO feedback (created_at, name, email, rating, category, recommend, comments)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)", batch
+                    )
+                    self._db.execute("COMMIT")
+                    self._stats["written"] += len(batch)
+                    self._stats["batches"] += 1
+                return
+            except sqlite3.Error:
+                with self._lock:
+                    if self._db.in_transaction:
+                        self._db.execute("ROLLBACK")
+                time.sleep(0.2 * (attempt + 1))
+        with self._lock:
+            self._stats["dropped"] += len(batch)
+
+    def flush(self):
+        """Block until every queued submission has been written."""
+        self._queue.join()
+
+    def close(self):
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join()
+
+    # ---------- reading ----------
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def summary(self) -> Dict[str, Any]:
+        count, average, yes = self._query(
+            "SELECT COUNT(*), AVG(rating), SUM(recommend = ?) FROM feedback", (RECOMMEND[0],)
+        )[0]
+        return {
+            "responses": count,
+            "average_rating": round(average, 2) if count else None,
+            "would_recommend": round(yes / count, 3) if count else None,
+        }
+
+    def ratings_by_category(self) -> List[Dict[str, Any]]:
+        """Response count, mean rating, 1–5 star histogram and recommend share per category."""
+        rows = self._query(
+            "SELECT category, COUNT(*), AVG(rating),"
+            " SUM(rating = 1), SUM(rating = 2), SUM(rating = 3), SUM(rating = 4), SUM(rating = 5),"
+            " SUM(recommend = ?)"
+            " FROM feedback GROUP BY category ORDER BY COUNT(*) DESC, category", (RECOMMEND[0],)
+        )
+        return [
+            {
+                "category": category, "responses": count, "average_rating": round(average, 2),
+                **{f"{stars}★": n for stars, n in enumerate(histogram, 1)},
+                "would_recommend": round(yes / count, 3),
+            }
+            for category, count, average, *histogram, yes in rows
+        ]
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT created_at, name, rating, category, recommend, comments FROM feedback ORDER BY id DESC LIMIT ?",
+            (limit,)
+        )
+        return [
+            {"created_at": created_at, "name": name, "rating": rating, "category": category,
+             "recommend": recommend, "comments": comments}
+            for created_at, name, rating, category, recommend, comments in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+
+def open_default_feedback_store() -> FeedbackStore:
+    """Store at ARTRESTORER_FEEDBACK_PATH (default .cache/feedback.sqlite3)."""
+    return FeedbackStore(os.getenv('ARTRESTORER_FEEDBACK_PATH', os.path.join('.cache', 'feedback.sqlite3')))
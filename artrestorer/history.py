@@ -0,0 +1,207 @@
+"""Per-user history of generated analyses.
+
+Every report is stored in SQLite (WAL) with its inputs and the profile of the
+user who requested it. Listings are keyset-paginated on (created_at, id), so
+page 500 costs the same as page 1. They are served from composite indexes on
+user, analysis type and date. Report bodies and artwork descriptions are
+indexed with FTS5 for full-text search, together with a per-user token so a
+search only walks that user's postings, newest rowid first, and stops at the
+page limit. The whole report is kept as JSON, so a
+stored analysis reopens exactly as generated.
+
+Users are identified by their normalised display name only; there is no login
+behind it. Anyone who enters the same name shares, and can read, the same
+history, so do not store confidential reports on a shared deployment.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .report import Report, body_text, report_digest, report_from_dict, report_json
+
+DEFAULT_PAGE_SIZE = 20
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def user_key(user: Dict[str, Any]) -> str:
+    """Users are identified by their normalized display name, not an authenticated account."""
+    return " ".join(str(user.get('name') or '').split()).casefold() or "anonymous"
+
+
+def user_token(key: str) -> str:
+    """A single FTS token standing for one user."""
+    return "u" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix."""
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        return ""
+    quoted = [f'"{t}"' for t in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def encode_cursor(created_at: float, row_id: int) -> str:
+    return f"{created_at!r}:{row_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Raises ValueError for anything encode_cursor did not produce."""
+    try:
+        created_at, row_id = cursor.rsplit(":", 1)
+        return float(created_at), int(row_id)
+    except ValueError:
+        raise ValueError(f"invalid history cursor {cursor!r}") from None
+
+
+class HistoryPage(NamedTuple):
+    entries: List[Dict[str, Any]]
+    next_cursor: Optional[str]   # None on the last page
+
+
+class AnalysisHistory:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS reports ("
+            " id INTEGER PRIMARY KEY,"
+            " user_key TEXT NOT NULL,"
+            " user_token TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " feature_key TEXT NOT NULL,"
+            " feature_label TEXT NOT NULL,"
+            " art_style TEXT NOT NULL,"
+            " damage_type TEXT NOT NULL,"
+            " cultural_context TEXT NOT NULL,"
+            " temperature REAL NOT NULL,"
+            " artwork_description TEXT NOT NULL,"
+            " body TEXT NOT NULL,"
+            " complete INTEGER NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " user_json TEXT NOT NULL,"
+            " report_json TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_reports_user_date ON reports (user_key, created_at DESC, id DESC);"
+            "CREATE INDEX IF NOT EXISTS idx_reports_user_feature_date"
+            " ON reports (user_key, feature_key, created_at DESC, id DESC);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5("
+            " user_token, artwork_description, body, content='reports', content_rowid='id', tokenize='porter unicode61');"
+        )
+
+    def save(self, report: Report, user: Dict[str, Any], feature_key: str = "") -> int:
+        """Store one report for `user`; returns its id."""
+        req = report.details
+        created_at = datetime.fromisoformat(report.generated_at).timestamp()
+        body = body_text(report)
+        key = user_key(user)
+        row = (
+            key, user_token(key), created_at, feature_key, req['feature_label'], req['art_style'] or "",
+            req['damage_type'] or "", req['cultural_context'] or "", float(req['temperature'] or 0),
+            req['artwork_description'], body, int(report.complete), report_digest(report),
+            json.dumps({k: user.get(k, '') for k in ('name', 'role', 'goal', 'artwork_type')}, ensure_ascii=False),
+            report_json(report),
+        )
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                row_id = self._db.execute(
+                    "INSERT INTO reports (user_key, user_token, created_at, feature_key, feature_label, art_style, damage_type,"
+                    " cultural_context, temperature, artwork_description, body, complete, digest, user_json,"
+                    " report_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+                ).lastrowid
+                self._db.execute("INSERT INTO reports_fts (rowid, user_token, artwork_description, body)"
+                                 " VALUES (?, ?, ?, ?)", (row_id, row[1], req['artwork_description'], body))
+                self._db.execute("COMMIT")
+            except sqlite3.Error:
+                self._db.execute("ROLLBACK")
+                raise
+        return row_id
+
+    def page(self, user: Dict[str, Any], cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+             feature_key: Optional[str] = None, since: Optional[datetime] = None, until: Optional[datetime] = None,
+             search: str = "") -> HistoryPage:
+        """One page of `user`'s reports, newest first; pass the previous page's next_cursor to continue.
+
+        Search results come in storage order (newest saved first) so FTS5 can stop after one page.
+        Raises ValueError for a malformed cursor.
+        """
+        key = user_key(user)
+        query = fts_query(search)
+        where, params = [] if query else ["r.user_key = ?"], [] if query else [key]
+        if feature_key:
+            where.append("r.feature_key = ?")
+            params.append(feature_key)
+        if since is not None:
+            where.append("r.created_at >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            where.append("r.created_at < ?")
+            params.append(until.timestamp())
+        if query:
+            if cursor:
+                where.append("reports_fts.rowid < ?")
+                params.append(decode_cursor(cursor)[1])
+            source = "reports_fts JOIN reports r ON r.id = reports_fts.rowid"
+            where.append("reports_fts MATCH ?")
+            params.append(f'user_token:{user_token(key)} AND {{artwork_description body}}: ({query})')
+            snippet, order = "snippet(reports_fts, 2, '[', ']', '…', 16)", "reports_fts.rowid DESC"
+        else:
+            if cursor:
+                where.append("(r.created_at, r.id) < (?, ?)")
+                params.extend(decode_cursor(cursor))
+            source, snippet = "reports r", "substr(r.body, 1, 160)"
+            order = "r.created_at DESC, r.id DESC"
+        sql = (f"SELECT r.id, r.created_at, r.feature_key, r.feature_label, r.art_style, r.damage_type,"
+               f" r.cultural_context, r.temperature, substr(r.artwork_description, 1, 120), r.complete, {snippet}"
+               f" FROM {source} WHERE {' AND '.join(where)} ORDER BY {order} LIMIT ?")
+        params.append(limit + 1)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        entries = [
+            {
+                "id": row_id, "created_at": datetime.fromtimestamp(created_at), "feature_key": feature,
+                "feature_label": label, "art_style": style, "damage_type": damage, "cultural_context": context,
+                "temperature": temperature, "description": description, "complete": bool(complete),
+                "excerpt": " ".join(excerpt.split()),
+            }
+            for row_id, created_at, feature, label, style, damage, context, temperature, description, complete, excerpt
+            in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last[1], last[0])
+        return HistoryPage(entries, next_cursor)
+
+    def get(self, report_id: int, user: Optional[Dict[str, Any]] = None) -> Optional[Report]:
+        """A stored report; with `user`, only if it belongs to them."""
+        sql, params = "SELECT report_json FROM reports WHERE id = ?", [report_id]
+        if user is not None:
+            sql += " AND user_key = ?"
+            params.append(user_key(user))
+        with self._lock:
+            row = self._db.execute(sql, params).fetchone()
+        return report_from_dict(json.loads(row[0])) if row else None
+
+    def count(self, user: Dict[str, Any]) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM reports WHERE user_key = ?", (user_key(user),)).fetchone()[0]
+
+
+def open_default_history() -> AnalysisHistory:
+    """History at ARTRESTORER_HISTORY_PATH (default .cache/history.sqlite3); use one file per institution."""
+    return AnalysisHistory(os.getenv('ARTRESTORER_HISTORY_PATH', os.path.join('.cache', 'history.sqlite3')))
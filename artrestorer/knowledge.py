@@ -0,0 +1,105 @@
+"""Heritage reference data: cultural traditions, the feature gallery, the landing
+showcase and the option lists offered by the forms.
+
+The data lives in data/knowledge.json (override with ARTRESTORER_KNOWLEDGE_PATH).
+It is loaded once per process into a deeply frozen KnowledgeBase that every
+session shares. get_knowledge() checks the file's mtime at most every
+RELOAD_CHECK_INTERVAL seconds and swaps in a fresh snapshot when it changed.
+"""
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple, Optional, Tuple
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'knowledge.json')
+RELOAD_CHECK_INTERVAL = 2.0
+
+
+class KnowledgeBase(NamedTuple):
+    art_styles: Tuple[str, ...]
+    damage_types: Tuple[str, ...]
+    cultural_contexts: Tuple[str, ...]
+    artwork_types: Tuple[str, ...]
+    user_roles: Tuple[str, ...]
+    user_goals: Tuple[str, ...]
+    showcase_features: Tuple[Mapping[str, str], ...]
+    gallery_features: Tuple[Mapping[str, Any], ...]
+    gallery_cases: Tuple[Mapping[str, str], ...]
+    cultural_insights: Mapping[str, Mapping[str, Any]]
+    cultural_traditions: Tuple[str, ...]
+    mtime: float
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def to_plain(value: Any) -> Any:
+    """Inverse of freeze(), for JSON serialisation."""
+    if isinstance(value, Mapping):
+        return {k: to_plain(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [to_plain(v) for v in value]
+    return value
+
+
+def knowledge_path() -> str:
+    return os.getenv('ARTRESTORER_KNOWLEDGE_PATH', DEFAULT_PATH)
+
+
+def load_knowledge(path: Optional[str] = None) -> KnowledgeBase:
+    path = path or knowledge_path()
+    mtime = os.stat(path).st_mtime
+    with open(path, encoding='utf-8') as f:
+        raw = json.load(f)
+    gallery = freeze(raw['gallery_features'])
+    insights = freeze(raw['cultural_insights'])
+    return KnowledgeBase(
+        art_styles=freeze(raw['art_styles']),
+        damage_types=freeze(raw['damage_types']),
+        cultural_contexts=freeze(raw['cultural_contexts']),
+        artwork_types=freeze(raw['artwork_types']),
+        user_roles=freeze(raw['user_roles']),
+        user_goals=freeze(raw['user_goals']),
+        showcase_features=freeze(raw['showcase_features']),
+        gallery_features=gallery,
+        gallery_cases=tuple(MappingProxyType({"case": case, "feature": f['title']})
+                            for f in gallery for case in f['cases']),
+        cultural_insights=insights,
+        cultural_traditions=tuple(insights),
+        mtime=mtime,
+    )
+
+
+_current: Optional[KnowledgeBase] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_knowledge() -> KnowledgeBase:
+    """Shared snapshot, reloaded when the data file changes on disk.
+
+    A file that fails to parse keeps the previous snapshot in service.
+    """
+    global _current, _checked_at
+    now = time.monotonic()
+    if _current is not None and now - _checked_at < RELOAD_CHECK_INTERVAL:
+        return _current
+    with _lock:
+        if _current is not None and now - _checked_at < RELOAD_CHECK_INTERVAL:
+            return _current
+        _checked_at = now
+        try:
+            changed = _current is None or os.stat(knowledge_path()).st_mtime != _current.mtime
+            if changed:
+                _current = load_knowledge()
+        except (OSError, ValueError, KeyError):
+            if _current is None:
+                raise
+        return _current
@@ -0,0 +1,224 @@
+"""Process-wide instrumentation with Prometheus text exposition.
+
+Hot paths only touch in-memory counters and fixed-bucket histograms: one lock
+and one bisect per observation, with no I/O and no formatting. Components that
+already keep their own counters (the analysis cache, the OpenAI pool, the
+feedback writer, the export pool) are registered as collectors whose stats()
+are read only when /metrics is scraped, so an unscraped server pays nothing for
+them.
+
+The exposition server is opt-in. start_server() binds a daemon thread to
+ARTRESTORER_METRICS_PORT (on ARTRESTORER_METRICS_HOST, default 127.0.0.1) and
+does nothing when the port is unset.
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a fast fragment rerun up to a long streamed report
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(tuple(str(labels[n]) for n in self.labelnames), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}_total{_labels(self.labelnames, k)} {_number(v)}" for k, v in values]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (non-cumulative, last is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(tuple(str(labels[n]) for n in self.labelnames))
+            return series[2] if series else 0
+
+    @contextmanager
+    def time(self, **labels: str):
+        """Observe the duration of the block, including when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = sorted((k, (list(b), s, c)) for k, (b, s, c) in self._series.items())
+        lines = []
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_number(bound) if bound != float("inf") else "+Inf"}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def _add(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, prefix: str, stats: Callable[[], Dict[str, float]]):
+        """Expose every numeric value of `stats()` as `<prefix>_<key>` at scrape time; re-registering replaces."""
+        with self._lock:
+            self._collectors[prefix] = stats
+
+    def exposition(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+            collectors = sorted(self._collectors.items())
+        lines = []
+        for name, metric in metrics:
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.samples())
+        for prefix, stats in collectors:
+            try:
+                values = stats()
+            except Exception:   # a collector must never break the scrape
+                continue
+            for key, value in sorted(values.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f"# TYPE {prefix}_{key} gauge")
+                    lines.append(f"{prefix}_{key} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+RERUN_SECONDS = REGISTRY.histogram(
+    "artrestorer_rerun_seconds", "Duration of completed full script runs by page.", ["page"])
+TAB_SECONDS = REGISTRY.histogram(
+    "artrestorer_tab_render_seconds", "Time spent rendering the open main tab's body.", ["tab"])
+FRAGMENT_SECONDS = REGISTRY.histogram(
+    "artrestorer_fragment_seconds", "Duration of fragment bodies, including fragment-only reruns.", ["fragment"])
+GENERATION_TTFT_SECONDS = REGISTRY.histogram(
+    "artrestorer_generation_ttft_seconds", "Time from request to the first streamed report token.")
+GENERATION_SECONDS = REGISTRY.histogram(
+    "artrestorer_generation_seconds", "Total latency of an analysis request by mode and outcome.", ["mode", "outcome"])
+GENERATION_TOKENS = REGISTRY.counter(
+    "artrestorer_generation_tokens", "Tokens reported by the API for analyses.", ["kind"])
+ANALYSIS_REQUESTS = REGISTRY.counter(
+    "artrestorer_analysis_requests", "Analyses requested from the results page by source.", ["source"])
+ERRORS = REGISTRY.counter(
+    "artrestorer_errors", "Errors surfaced to users by where they happened and their type.", ["where", "error"])
+
+
+def timed_fragment(name: str):
+    """Decorator timing a fragment body into FRAGMENT_SECONDS; apply beneath @st.fragment."""
+    def wrap(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            with FRAGMENT_SECONDS.time(fragment=name):
+                return func(*args, **kwargs)
+        return run
+    return wrap
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.exposition().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port: Optional[int] = None, host: Optional[str] = None,
+                 registry: Registry = REGISTRY) -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics from a daemon thread; None when no port is configured."""
+    if port is None:
+        port = int(os.getenv('ARTRESTORER_METRICS_PORT', '0') or 0)
+        if not port:
+            return None
+    host = host or os.getenv('ARTRESTORER_METRICS_HOST', '127.0.0.1')
+    handler = type("MetricsHandler", (_Handler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="artrestorer-metrics", daemon=True).start()
+    return server
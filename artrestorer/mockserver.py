@@ -0,0 +1,320 @@
+"""Local stand-in for the OpenAI chat completions API.
+
+Speaks enough of the protocol for the app, the batch runner and the load and
+benchmark harnesses: ``POST /v1/chat/completions``, both plain JSON and SSE
+streaming with an optional usage chunk, plus ``GET /v1/models``. Latency is
+shaped by a time to first token and a token rate. 429s and 5xx errors can be
+injected at a set probability, or forced per request with an ``X-Mock-Fail``
+header naming the status (429, 500, 502 or 503; any other value gets a 400).
+Replies are deterministic: the same messages and seed always produce the same
+report, in the ten-section layout the report parser expects.
+
+Point a client at it with ``OPENAI_BASE_URL=http://127.0.0.1:<port>/v1``; any
+API key is accepted. Use a scratch ARTRESTORER_CACHE_PATH too, so mock reports
+never land in the real analysis cache.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .engine import ANALYSIS_SECTIONS, REPORT_RULE
+
+MOCK_MODEL = "mock-gpt"
+ERROR_STATUSES = (500, 502, 503)
+FAILURE_HEADER_VALUES = tuple(str(status) for status in (429,) + ERROR_STATUSES)
+
+_TOKEN_RE = re.compile(r"\s*\S+")
+
+_OPENINGS = (
+    "Begin with", "Prioritise", "Document", "Test", "Avoid", "Consider", "Record", "Schedule", "Confirm",
+    "Use",
+)
+_ACTIONS = (
+    "raking-light and UV fluorescence photography of the whole surface",
+    "consolidation of lifting paint with a reversible, low-viscosity adhesive",
+    "solvent tests in discreet areas before any varnish removal",
+    "humidity-controlled storage between 45 and 55 percent relative humidity",
+    "a condition map marking every loss, crack and previous retouching",
+    "inpainting only within losses, using reversible conservation paints",
+    "cross-section sampling where the stratigraphy is unclear",
+    "facing tissue over fragile areas before the work is moved",
+    "comparison with documented works from the same workshop and period",
+    "a written treatment proposal agreed with the owner before work starts",
+    "mechanical cleaning under magnification for the most sensitive passages",
+    "an acid-free, padded support for transport and storage",
+)
+_REASONS = (
+    "so that every step remains reversible.", "to protect the original material.",
+    "because later treatments must be able to tell original from restoration.",
+    "as the surface is likely to react unpredictably.", "to keep the work stable while it is treated.",
+    "in line with current professional codes of ethics.",
+)
+
+
+class MockConfig(NamedTuple):
+    ttft: float = 0.4                   # seconds before the first token
+    tokens_per_second: float = 60.0     # 0 streams as fast as the socket allows
+    jitter: float = 0.0                 # +/- fraction applied to TTFT and each token gap
+    rate_limit_rate: float = 0.0        # probability of a 429
+    error_rate: float = 0.0             # probability of a 500/502/503
+    retry_after: float = 1.0            # Retry-After sent with 429s
+    seed: int = 0
+
+
+def mock_report(messages: List[Dict[str, Any]], seed: int = 0) -> str:
+    """The deterministic report for a conversation."""
+    digest = hashlib.sha256(json.dumps([messages, seed], sort_keys=True, default=str).encode("utf-8")).digest()
+    rng = random.Random(digest)
+    sections = []
+    for n, title in enumerate(ANALYSIS_SECTIONS, 1):
+        points = [f"   • {rng.choice(_OPENINGS)} {rng.choice(_ACTIONS)} {rng.choice(_REASONS)}"
+                  for _ in range(rng.randint(3, 5))]
+        sections.append(f"{n}. {title}\n" + "\n".join(points))
+    conclusion = f"{rng.choice(_OPENINGS)} {rng.choice(_ACTIONS)} {rng.choice(_REASONS)}"
+    return "\n\n".join(sections) + f"\n\n{REPORT_RULE}\n\nCONCLUSION:\n{conclusion}"
+
+
+def tokenize(text: str) -> List[str]:
+    """Word-level stand-in for model tokens; joining them gives back the text."""
+    return _TOKEN_RE.findall(text)
+
+
+def _prompt_tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(len(str(m.get("content", ""))) for m in messages) // 4
+
+
+class MockStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "streams": 0, "rate_limited": 0, "errors": 0, "completion_tokens": 0,
+                        "disconnects": 0, "active_streams": 0}
+
+    def add(self, **amounts: int):
+        with self._lock:
+            for key, n in amounts.items():
+                self._counts[key] += n
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.endswith("/models"):
+            self._json(200, {"object": "list", "data": [{"id": MOCK_MODEL, "object": "model", "owned_by": "mock"}]})
+        elif path in ("", "/health"):
+            self._json(200, {"status": "ok"})
+        elif path == "/stats":
+            self._json(200, self.server.stats.snapshot())
+        else:
+            self._json(404, {"error": {"message": f"no route {self.path}", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._json(400, {"error": {"message": "body is not JSON", "type": "invalid_request_error"}})
+            return
+        if not self.path.split("?", 1)[0].rstrip("/").endswith("/chat/completions"):
+            self._json(404, {"error": {"message": f"no route {self.path}", "type": "invalid_request_error"}})
+            return
+        forced = (self.headers.get("X-Mock-Fail") or "").strip()
+        if forced and forced not in FAILURE_HEADER_VALUES:
+            self._json(400, {"error": {"message": f"X-Mock-Fail must be one of {', '.join(FAILURE_HEADER_VALUES)}",
+                                       "type": "invalid_request_error"}})
+            return
+        self.server.stats.add(requests=1)
+        failure = self.server.pick_failure(forced)
+        if failure == 429:
+            self.server.stats.add(rate_limited=1)
+            self._json(429, {"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_exceeded",
+                                       "code": "rate_limit_exceeded"}},
+                       {"Retry-After": f"{self.server.config.retry_after:g}"})
+            return
+        if failure:
+            self.server.stats.add(errors=1)
+            self._json(failure, {"error": {"message": f"Injected server error {failure} (mock)",
+                                           "type": "server_error"}})
+            return
+
+        messages = request.get("messages") or []
+        model = request.get("model") or MOCK_MODEL
+        tokens = tokenize(mock_report(messages, self.server.config.seed))
+        finish = "stop"
+        max_tokens = request.get("max_tokens") or request.get("max_completion_tokens")
+        if max_tokens and len(tokens) > max_tokens:
+            tokens, finish = tokens[:max_tokens], "length"
+        usage = {"prompt_tokens": _prompt_tokens(messages), "completion_tokens": len(tokens)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-mock{self.server.next_id()}"
+        created = int(time.time())
+
+        if not request.get("stream"):
+            self.server.sleep_for(self.server.config.ttft + len(tokens) * self.server.token_gap())
+            self.server.stats.add(completion_tokens=len(tokens))
+            self._json(200, {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "finish_reason": finish,
+                             "message": {"role": "assistant", "content": "".join(tokens)}}],
+                "usage": usage,
+            })
+            return
+        include_usage = bool((request.get("stream_options") or {}).get("include_usage"))
+        self._stream(completion_id, created, model, tokens, finish, usage if include_usage else None)
+
+    def _stream(self, completion_id: str, created: int, model: str, tokens: List[str], finish: str,
+                usage: Optional[Dict[str, int]]):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def chunk(choices: List[Dict[str, Any]], **extra) -> bytes:
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                       "choices": choices, **extra}
+            return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
+
+        def delta(content: Dict[str, Any], finish_reason: Optional[str] = None) -> bytes:
+            return chunk([{"index": 0, "delta": content, "finish_reason": finish_reason}])
+
+        server = self.server
+        server.stats.add(streams=1, active_streams=1)
+        sent = 0
+        try:
+            self.wfile.write(delta({"role": "assistant", "content": ""}))
+            due = time.monotonic() + server.jittered(server.config.ttft)
+            for token in tokens:
+                server.sleep_until(due)
+                self.wfile.write(delta({"content": token}))
+                sent += 1
+                due += server.jittered(server.token_gap())
+            self.wfile.write(delta({}, finish))
+            if usage is not None:
+                self.wfile.write(chunk([], usage=usage))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            server.stats.add(disconnects=1)
+        finally:
+            server.stats.add(active_streams=-1, completion_tokens=sent)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: Tuple[str, int], config: MockConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.stats = MockStats()
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._ids = 0
+
+    def next_id(self) -> int:
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def pick_failure(self, forced: Optional[str]) -> int:
+        """0 for success, else the status to fail with; draws come from one seeded stream."""
+        if forced:
+            return int(forced)  # validated against FAILURE_HEADER_VALUES by the handler
+        with self._lock:
+            draw, status = self._rng.random(), self._rng.choice(ERROR_STATUSES)
+        if draw < self.config.rate_limit_rate:
+            return 429
+        if draw < self.config.rate_limit_rate + self.config.error_rate:
+            return status
+        return 0
+
+    def token_gap(self) -> float:
+        return 1.0 / self.config.tokens_per_second if self.config.tokens_per_second > 0 else 0.0
+
+    def jittered(self, seconds: float) -> float:
+        if not self.config.jitter or not seconds:
+            return seconds
+        with self._lock:
+            return seconds * (1 + self._rng.uniform(-self.config.jitter, self.config.jitter))
+
+    def sleep_for(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def sleep_until(self, deadline: float):
+        self.sleep_for(deadline - time.monotonic())
+
+
+class MockOpenAIServer:
+    """The mock on a background thread; port 0 picks a free one.
+
+        with MockOpenAIServer(MockConfig(ttft=0.2, tokens_per_second=200)) as mock:
+            client = create_openai_client("mock", base_url=mock.base_url)
+    """
+
+    def __init__(self, config: MockConfig = MockConfig(), host: str = "127.0.0.1", port: int = 0):
+        self._server = _Server((host, port), config)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def config(self) -> MockConfig:
+        return self._server.config
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def stats(self) -> Dict[str, int]:
+        return self._server.stats.snapshot()
+
+    def start(self) -> "MockOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="artrestorer-mock-openai",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve on the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
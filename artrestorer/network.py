@@ -0,0 +1,80 @@
+"""Phase dependency network and critical-path computation.
+
+Phases form a DAG in template order. Each edge carries a lag expressed as a
+fraction of the predecessor's duration. The successor may start at the
+predecessor's finish plus that lag, so a negative lag is an overlap. The
+forward pass gives earliest starts and the project end. The backward pass gives
+each phase's float, and phases with zero float form the critical path.
+
+Scalar schedules are memoized per duration tuple. A parameter that does not
+change any phase duration (artwork type, goals) therefore costs nothing, and
+the sweep and the Monte Carlo simulation share one vectorized forward pass.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+
+class NetworkSchedule(NamedTuple):
+    start: Tuple[int, ...]        # weeks elapsed before each phase starts
+    finish: Tuple[int, ...]
+    slack: Tuple[int, ...]        # weeks a phase can slip without moving the project end
+    critical: Tuple[bool, ...]
+    total: int
+
+
+class PhaseNetwork:
+    def __init__(self, templates: Sequence[Dict[str, Any]]):
+        self.ids = [t["phase"] for t in templates]
+        position = {pid: i for i, pid in enumerate(self.ids)}
+        self.predecessors: List[Tuple[Tuple[int, float], ...]] = []
+        self.successors: List[List[Tuple[int, float]]] = [[] for _ in templates]
+        for j, template in enumerate(templates):
+            edges = []
+            for pred_id, lag in template.get("depends_on", ()):
+                i = position.get(pred_id)
+                if i is None or i >= j:
+                    raise ValueError(f"{template['phase']} must depend on an earlier phase, not {pred_id}")
+                if lag < -1:
+                    raise ValueError(f"{template['phase']} cannot start before {pred_id} starts")
+                edges.append((i, lag))
+                self.successors[i].append((j, lag))
+            self.predecessors.append(tuple(edges))
+        self.schedule = lru_cache(maxsize=1024)(self._schedule)
+
+    @staticmethod
+    def lag_weeks(lag: float, pred_weeks: int) -> int:
+        return round(lag * pred_weeks)
+
+    def _schedule(self, durations: Tuple[int, ...]) -> NetworkSchedule:
+        """CPM over whole weeks; a skipped phase has duration 0 and is never critical."""
+        start, finish = [], []
+        for j, d in enumerate(durations):
+            es = max((finish[i] + self.lag_weeks(lag, durations[i]) for i, lag in self.predecessors[j]), default=0)
+            es = max(es, 0)
+            start.append(es)
+            finish.append(es + d)
+        total = max(finish, default=0)
+
+        latest_finish = [total] * len(durations)
+        for i in range(len(durations) - 1, -1, -1):
+            for j, lag in self.successors[i]:
+                latest_start_j = latest_finish[j] - durations[j]
+                latest_finish[i] = min(latest_finish[i], latest_start_j - self.lag_weeks(lag, durations[i]))
+        slack = tuple(lf - f for lf, f in zip(latest_finish, finish))
+        critical = tuple(d > 0 and s == 0 for d, s in zip(durations, slack))
+        return NetworkSchedule(tuple(start), tuple(finish), slack, critical, total)
+
+    def project_weeks(self, durations: np.ndarray, round_lags: bool = True) -> np.ndarray:
+        """Vectorized forward pass: project length for durations shaped (phases, ...)."""
+        finish = []
+        for j in range(durations.shape[0]):
+            es = np.zeros(durations.shape[1:], dtype=durations.dtype)
+            for i, lag in self.predecessors[j]:
+                shift = lag * durations[i]
+                if round_lags:
+                    shift = np.round(shift)
+                es = np.maximum(es, finish[i] + shift)
+            finish.append(es + durations[j])
+        return np.max(finish, axis=0)
@@ -0,0 +1,258 @@
+"""Resource-constrained scheduling for a portfolio of restoration projects.
+
+Each artwork gets the Timeline Planner's phase plan. Its crew (the headcount of
+its team size) must be free from a shared pool of conservators for each phase.
+One crew works one phase at a time, so phases of an artwork run in order rather
+than overlapping as in the single-artwork plan, and may wait for crew between
+them.
+
+The scheduler is an event-driven list scheduler. Ready phases are ranked by
+latest start, meaning deadline minus remaining work (artworks without a
+deadline rank last), then by longest remaining work. When the top-ranked phase
+does not fit the free crew, its start is reserved at the earliest time enough
+crew frees up. Lower-ranked phases may only backfill if they leave that
+reservation intact (EASY backfilling), so large teams are not starved by small
+ones.
+"""
+import csv
+import heapq
+import io
+import json
+import math
+from datetime import date
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
+
+from .calendars import WorkCalendar, weeks_until
+from .timeline import (
+    ARTWORK_TYPES, DAMAGE_SEVERITIES, SIZES, TEAM_SIZES, URGENCIES, match_option, plan_timeline
+)
+
+DEFAULT_CONSERVATORS = 12
+
+# Conservators a project occupies while one of its phases is under way
+TEAM_HEADCOUNT = {
+    "Solo conservator": 1,
+    "2–3 specialists": 3,
+    "4–6 person team": 5,
+    "Large institutional team (7+)": 7,
+}
+
+# Accepted column names for each project field
+FIELD_ALIASES = {
+    'name': ['name', 'title', 'object', 'artwork'],
+    'artwork_type': ['artwork_type', 'type'],
+    'damage_severity': ['damage_severity', 'damage'],
+    'size': ['size', 'scale'],
+    'urgency': ['urgency'],
+    'team_size': ['team_size', 'team'],
+    'deadline': ['deadline', 'deadline_week', 'due'],
+}
+FIELD_OPTIONS = {
+    'artwork_type': ARTWORK_TYPES,
+    'damage_severity': DAMAGE_SEVERITIES,
+    'size': SIZES,
+    'urgency': URGENCIES,
+    'team_size': TEAM_SIZES,
+}
+FIELD_DEFAULTS = {
+    'artwork_type': ARTWORK_TYPES[0],
+    'damage_severity': DAMAGE_SEVERITIES[1],
+    'size': SIZES[1],
+    'urgency': URGENCIES[1],
+    'team_size': TEAM_SIZES[1],
+}
+
+
+def _field(row: Dict[str, Any], name: str) -> str:
+    for alias in FIELD_ALIASES[name]:
+        value = row.get(alias)
+        if value not in (None, ""):
+            return str(value).strip()
+    return ""
+
+
+def parse_deadline(value: str, start: date, calendar: Optional[WorkCalendar] = None) -> Optional[int]:
+    """A deadline as a week number counted from `start`: either an integer or an ISO date.
+
+    With a `calendar`, a date counts the working weeks before it; otherwise calendar weeks.
+    """
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    day = date.fromisoformat(value)
+    if day < start:
+        raise ValueError(f"deadline {value} is before the portfolio start {start.isoformat()}")
+    if calendar is not None:
+        return weeks_until(calendar, start, day)
+    return max(1, math.ceil((day - start).days / 7))
+
+
+def _to_project(row: Dict[str, Any], start: date, calendar: Optional[WorkCalendar]) -> Dict[str, Any]:
+    project = {'name': _field(row, 'name')}
+    for name, options in FIELD_OPTIONS.items():
+        value = _field(row, name)
+        project[name] = match_option(options, value) if value else FIELD_DEFAULTS[name]
+    project['deadline_week'] = parse_deadline(_field(row, 'deadline'), start, calendar)
+    return project
+
+
+def parse_portfolio_file(filename: str, data: bytes, start: Optional[date] = None,
+                         calendar: Optional[WorkCalendar] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Parse a CSV or JSONL project list into portfolio projects plus per-line error messages."""
+    start = start or date.today()
+    text = data.decode('utf-8-sig')
+    if filename.lower().endswith(('.jsonl', '.ndjson')):
+        rows = []
+        for line_no, line in enumerate(text.splitlines(), 1):
+            if line.strip():
+                try:
+                    rows.append((line_no, {k.strip().lower(): v for k, v in json.loads(line).items()}))
+                except (json.JSONDecodeError, AttributeError) as e:
+                    rows.append((line_no, ValueError(f"not a JSON object ({e})")))
+    else:
+        reader = csv.DictReader(io.StringIO(text))
+        rows = [(line_no, {(k or '').strip().lower(): v for k, v in row.items()})
+                for line_no, row in enumerate(reader, 2)]
+
+    projects, errors = [], []
+    for line_no, row in rows:
+        try:
+            if isinstance(row, Exception):
+                raise row
+            project = _to_project(row, start, calendar)
+        except ValueError as e:
+            errors.append(f"Line {line_no}: {e}")
+            continue
+        project['index'] = len(projects) + 1
+        project['source_line'] = line_no
+        project['name'] = project['name'] or f"Project {project['index']}"
+        projects.append(project)
+    return projects, errors
+
+
+def _shadow(running: List[Tuple[int, int, int]], free: int, need: int) -> Tuple[int, int]:
+    """Earliest time `need` conservators are free, and how many spare ones there are then."""
+    for end, _, crew in sorted(running):
+        free += crew
+        if free >= need:
+            return end, free - need
+    return math.inf, 0
+
+
+def schedule_portfolio(projects: List[Dict[str, Any]], conservators: int = DEFAULT_CONSERVATORS) -> Dict[str, Any]:
+    """Schedule every project's phases onto a pool of `conservators`.
+
+    Weeks are numbered from 1 like the single-artwork planner; a phase occupying
+    weeks 3–5 has start_week 3 and end_week 5.
+    """
+    if conservators < 1:
+        raise ValueError("the conservator pool needs at least one person")
+    plans, titles, crews, remaining, due = [], [], [], [], []
+    for p in projects:
+        plan = plan_timeline(p['artwork_type'], p['damage_severity'], p['size'], p['urgency'], p['team_size'])
+        plans.append([ph['weeks'] for ph in plan['phases']])
+        titles.append([f"{ph['phase']}: {ph['title']}" for ph in plan['phases']])
+        crews.append(min(TEAM_HEADCOUNT[p['team_size']], conservators))
+        remaining.append(sum(plans[-1]))
+        due.append(p['deadline_week'] if p.get('deadline_week') is not None else math.inf)
+
+    next_phase = [0] * len(projects)
+    finish = [0] * len(projects)
+    ready_since = [0] * len(projects)
+    started = [None] * len(projects)
+    waited = [0] * len(projects)
+    entries = []
+
+    def rank(i: int) -> Tuple[float, int, int]:
+        return (due[i] - remaining[i], -remaining[i], i)
+
+    ready = [rank(i) for i in range(len(projects)) if plans[i]]
+    heapq.heapify(ready)
+    running: List[Tuple[int, int, int]] = []
+    free, now = conservators, 0
+    # Busy conservators per week as a difference array
+    load = [0]
+
+    while ready or running:
+        deferred = []
+        shadow_time, spare = math.inf, 0
+        while ready and free > 0:
+            key = heapq.heappop(ready)
+            i = key[2]
+            weeks = plans[i][next_phase[i]]
+            crew = crews[i]
+            fits = crew <= free
+            if fits and shadow_time != math.inf:
+                # Backfill only without delaying the reserved top-ranked phase
+                fits = now + weeks <= shadow_time or crew <= spare
+                if fits and now + weeks > shadow_time:
+                    spare -= crew
+            if not fits:
+                if shadow_time == math.inf and not deferred:
+                    shadow_time, spare = _shadow(running, free, crew)
+                deferred.append(key)
+                continue
+            entries.append({
+                'index': projects[i]['index'], 'name': projects[i]['name'], 'phase': titles[i][next_phase[i]],
+                'weeks': weeks, 'crew': crew, 'start_week': now + 1, 'end_week': now + weeks,
+            })
+            finish[i] = now + weeks
+            if started[i] is None:
+                started[i] = now
+            waited[i] += now - ready_since[i]
+            free -= crew
+            end = now + weeks
+            heapq.heappush(running, (end, i, crew))
+            if len(load) <= end:
+                load.extend([0] * (end + 1 - len(load)))
+            load[now] += crew
+            load[end] -= crew
+        for key in deferred:
+            heapq.heappush(ready, key)
+        if not running:
+            break
+        now = running[0][0]
+        while running and running[0][0] == now:
+            _, i, crew = heapq.heappop(running)
+            free += crew
+            remaining[i] -= plans[i][next_phase[i]]
+            next_phase[i] += 1
+            if next_phase[i] < len(plans[i]):
+                ready_since[i] = now
+                heapq.heappush(ready, rank(i))
+
+    makespan = max(finish, default=0)
+    busy = list(accumulate(load[:makespan]))
+    summaries = []
+    for i, p in enumerate(projects):
+        deadline = p.get('deadline_week')
+        late = max(0, finish[i] - deadline) if deadline is not None else 0
+        summaries.append({
+            'index': p['index'], 'name': p['name'], 'team_size': p['team_size'], 'crew': crews[i],
+            'work_weeks': sum(plans[i]), 'start_week': (started[i] or 0) + 1, 'finish_week': finish[i],
+            'wait_weeks': waited[i], 'deadline_week': deadline, 'late_weeks': late,
+        })
+    capacity_weeks = conservators * makespan
+    return {
+        'conservators': conservators,
+        'projects': summaries,
+        'entries': entries,
+        'makespan_weeks': makespan,
+        'late_projects': sum(1 for s in summaries if s['late_weeks'] > 0),
+        'total_late_weeks': sum(s['late_weeks'] for s in summaries),
+        'utilisation': round(sum(busy) / capacity_weeks, 3) if capacity_weeks else 0.0,
+        'saturated_weeks': sum(1 for b in busy if b >= conservators),
+        'busy_by_week': busy,
+    }
+
+
+def schedule_csv(schedule: Dict[str, Any]) -> str:
+    """One row per scheduled phase, ordered by start week."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['index', 'name', 'phase', 'crew', 'start_week', 'end_week', 'weeks'])
+    for e in sorted(schedule['entries'], key=lambda e: (e['start_week'], e['index'])):
+        writer.writerow([e['index'], e['name'], e['phase'], e['crew'], e['start_week'], e['end_week'], e['weeks']])
+    return out.getvalue()
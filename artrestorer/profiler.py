@@ -0,0 +1,216 @@
+"""Opt-in profiling of individual script runs.
+
+Two modes, both stdlib-only:
+
+* ``sampling``: a daemon thread snapshots the profiled thread's stack every
+  few milliseconds. Stacks are folded into the collapsed format
+  (``root;caller;callee count``) that flamegraph.pl, speedscope and inferno
+  read, and rendered here as a standalone SVG flame graph. Module-level frames
+  keep their line number, so time spent in the Streamlit script's own
+  top-level code splits by line rather than collapsing into one ``<module>``.
+* ``cprofile``: deterministic cProfile of the thread, returned as a
+  cumulative-time table and a ``.prof`` file for snakeviz or pstats.
+
+Nothing here runs unless a RunProfiler is started, so a disabled profiler
+costs nothing.
+"""
+import cProfile
+import html
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+MODES = ("sampling", "cprofile")
+DEFAULT_INTERVAL = 0.002
+
+_Stack = Tuple[str, ...]
+
+
+class ProfileResult(NamedTuple):
+    label: str
+    mode: str
+    started_at: datetime
+    seconds: float
+    samples: int
+    collapsed: str              # folded stacks; empty for cprofile
+    svg: bytes                  # flame graph; empty for cprofile
+    stats_text: str             # top functions by cumulative time
+    prof: bytes                 # marshalled pstats; empty for sampling
+    complete: bool              # False when the run was cut short (st.rerun, an exception)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = os.path.basename(code.co_filename)
+    line = frame.f_lineno if code.co_name == "<module>" else code.co_firstlineno
+    return f"{code.co_name} ({name}:{line})"
+
+
+def _stack(frame) -> _Stack:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, thread_id: int, interval: float, skip: int = 0):
+        super().__init__(name="artrestorer-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.skip = skip            # outer frames shared by every sample (thread bootstrap, script runner)
+        self.counts: "Counter[_Stack]" = Counter()
+        self._halt = threading.Event()
+
+    def run(self):
+        while not self._halt.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:   # the profiled thread has exited
+                return
+            self.counts[_stack(frame)[self.skip:]] += 1
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+
+
+def collapse(counts: Dict[_Stack, int]) -> str:
+    return "".join(f"{';'.join(stack)} {n}\n" for stack, n in sorted(counts.items()))
+
+
+def _sampled_stats(counts: Dict[_Stack, int], seconds: float, limit: int = 40) -> str:
+    """Inclusive and self share of samples per frame, a rough equivalent of the cProfile table.
+
+    Times are shares of the measured run time: a thread holding the GIL delays samples, so
+    the sample count times the interval undercounts.
+    """
+    inclusive: "Counter[str]" = Counter()
+    own: "Counter[str]" = Counter()
+    for stack, n in counts.items():
+        for label in set(stack):
+            inclusive[label] += n
+        own[stack[-1]] += n
+    total = sum(counts.values()) or 1
+    lines = [f"{'total %':>8} {'self %':>8} {'~ms':>9}  frame"]
+    for label, n in inclusive.most_common(limit):
+        lines.append(f"{n / total:8.1%} {own[label] / total:8.1%} {n / total * seconds * 1000:9.1f}  {label}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------- flame graph ----------
+
+_ROW = 17
+_WIDTH = 1200
+_PAD = 10
+
+
+def _colour(label: str) -> str:
+    h = zlib.crc32(label.encode("utf-8"))
+    return f"rgb({205 + h % 50},{(h >> 8) % 180 + 40},{(h >> 16) % 55})"
+
+
+def flamegraph_svg(counts: Dict[_Stack, int], title: str = "Flame graph") -> bytes:
+    """A standalone SVG flame graph (root at the bottom) of folded stack counts."""
+    tree: Dict = {}
+    for stack, n in counts.items():
+        node = tree
+        for label in stack:
+            entry = node.setdefault(label, [0, {}])
+            entry[0] += n
+            node = entry[1]
+    total = sum(counts.values())
+    depth = max((len(s) for s in counts), default=0)
+    height = (depth + 3) * _ROW + 2 * _PAD
+    scale = (_WIDTH - 2 * _PAD) / max(total, 1)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_WIDTH}" height="{height}" '
+        f'viewBox="0 0 {_WIDTH} {height}" font-family="Verdana, sans-serif" font-size="11">',
+        '<rect width="100%" height="100%" fill="#f8f4ec"/>',
+        f'<text x="{_WIDTH / 2}" y="{_PAD + 12}" text-anchor="middle" font-size="14">{html.escape(title)}</text>',
+        f'<text x="{_PAD}" y="{height - _PAD / 2}" fill="#666">{total} samples · widths are share of run time'
+        ' · hover a frame for details</text>',
+    ]
+
+    def draw(node: Dict, x: float, level: int):
+        for label, (n, children) in sorted(node.items()):
+            width = n * scale
+            if width >= 0.5:
+                y = height - _PAD - _ROW * (level + 2)
+                text = html.escape(label)
+                parts.append(f'<g><title>{text} — {n} samples ({n / total:.1%})</title>'
+                             f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{_ROW - 1}" '
+                             f'fill="{_colour(label)}" rx="2"/>')
+                chars = int(width / 7)
+                if chars >= 3:
+                    shown = label if len(label) <= chars else label[:chars - 2] + ".."
+                    parts.append(f'<text x="{x + 3:.1f}" y="{y + 12}">{html.escape(shown)}</text>')
+                parts.append('</g>')
+                draw(children, x, level + 1)
+            x += width
+
+    draw(tree, _PAD, 0)
+    parts.append('</svg>')
+    return "\n".join(parts).encode("utf-8")
+
+
+# ---------- run profiler ----------
+
+class RunProfiler:
+    """Profiles the calling thread from start() until stop()."""
+
+    def __init__(self, label: str, mode: str = "sampling", interval: float = DEFAULT_INTERVAL):
+        if mode not in MODES:
+            raise ValueError(f"unknown profiler mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.label, self.mode, self.interval = label, mode, interval
+        self._sampler: Optional[_Sampler] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._started = 0.0
+        self._started_at = datetime.now()
+
+    def start(self) -> "RunProfiler":
+        self._started_at = datetime.now()
+        self._started = time.perf_counter()
+        if self.mode == "sampling":
+            # Stacks start at the frame that called start(), e.g. the Streamlit script's <module>
+            caller = sys._getframe(1)
+            self._sampler = _Sampler(threading.get_ident(), self.interval, len(_stack(caller)) - 1)
+            self._sampler.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def stop(self, complete: bool = True) -> ProfileResult:
+        seconds = time.perf_counter() - self._started
+        if self._sampler is not None:
+            self._sampler.stop()
+            counts = dict(self._sampler.counts)
+            title = f"{self.label} · {seconds * 1000:.0f} ms · {self._started_at:%H:%M:%S}"
+            return ProfileResult(self.label, self.mode, self._started_at, seconds, sum(counts.values()),
+                                 collapse(counts), flamegraph_svg(counts, title),
+                                 _sampled_stats(counts, seconds), b"", complete)
+        self._profile.disable()
+        out = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=out)
+        stats.sort_stats("cumulative").print_stats(40)
+        fd, path = tempfile.mkstemp(suffix=".prof")
+        try:
+            os.close(fd)
+            stats.dump_stats(path)
+            with open(path, "rb") as f:
+                prof = f.read()
+        finally:
+            os.remove(path)
+        calls = sum(s[1] for s in stats.stats.values())
+        return ProfileResult(self.label, self.mode, self._started_at, seconds, calls, "", b"",
+                             out.getvalue(), prof, complete)
@@ -0,0 +1,233 @@
+"""Structured restoration reports.
+
+The model's plain-text answer is parsed once into a Report. The Report holds
+the request details, the ten numbered sections, the conclusion and the
+disclaimer, each keyed and typed. Text, HTML and JSON are all derived from
+that one model.
+
+Reports and sections are immutable tuples, so their hash is their content.
+The HTML renderers are memoized on it. A rerun of the results page renders
+nothing new, and while a report streams in only the section still growing is
+rendered again.
+"""
+import hashlib
+import html
+import json
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+from .engine import (
+    ANALYSIS_SECTIONS, REPORT_DISCLAIMER, REPORT_RULE, build_report_footer, build_report_header,
+    creativity_label
+)
+
+REQUEST_FIELDS = ('artwork_description', 'art_style', 'damage_type', 'cultural_context', 'feature_label', 'temperature')
+INCOMPLETE_NOTE = "[Generation interrupted — the report above is incomplete.]"
+
+_HEADING_RE = re.compile(r"^[\s*#]*(\d{1,2})\s*[.)]\s*(.+?)[\s*#:]*$")
+_CONCLUSION_RE = re.compile(r"^[\s*#]*CONCLUSION[\s*#]*:\s*(.*)$", re.IGNORECASE)
+_SECTION_NUMBERS = {title.casefold(): n for n, title in enumerate(ANALYSIS_SECTIONS, 1)}
+
+
+class ReportSection(NamedTuple):
+    key: str      # "preamble" | "section-01" … "section-10" | "conclusion"
+    title: str
+    body: str
+
+
+class Report(NamedTuple):
+    request: Tuple[Tuple[str, Any], ...]
+    sections: Tuple[ReportSection, ...]
+    generated_at: str
+    complete: bool = True
+    prepared_for: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def details(self) -> Dict[str, Any]:
+        return dict(self.request)
+
+    def section(self, key: str) -> Optional[ReportSection]:
+        return next((s for s in self.sections if s.key == key), None)
+
+
+def parse_sections(body: str) -> Tuple[ReportSection, ...]:
+    """Split a generated body into its numbered sections and conclusion."""
+    sections = []
+    key, title, lines = "preamble", "", []
+
+    def close():
+        text = "\n".join(lines).strip("\n")
+        if text.strip() or key != "preamble":
+            sections.append(ReportSection(key, title, text))
+
+    for line in body.splitlines():
+        if line.strip() == REPORT_RULE:
+            continue
+        conclusion = _CONCLUSION_RE.match(line)
+        heading = _HEADING_RE.match(line) if not conclusion else None
+        number = heading and _SECTION_NUMBERS.get(heading.group(2).strip().casefold())
+        if number and int(heading.group(1)) == number:
+            close()
+            key, title, lines = f"section-{number:02d}", ANALYSIS_SECTIONS[number - 1], []
+        elif conclusion:
+            close()
+            key, title, lines = "conclusion", "CONCLUSION", [conclusion.group(1)] if conclusion.group(1) else []
+        else:
+            lines.append(line)
+    close()
+    return tuple(sections)
+
+
+def build_report(req: Mapping[str, Any], body: str, complete: bool = True,
+                 user: Optional[Mapping[str, Any]] = None, generated_at: Optional[datetime] = None) -> Report:
+    user = user or {}
+    return Report(
+        request=tuple((name, req.get(name, '')) for name in REQUEST_FIELDS),
+        sections=parse_sections(body),
+        generated_at=(generated_at or datetime.now()).isoformat(timespec='seconds'),
+        complete=complete,
+        prepared_for=tuple((name, str(user.get(name, ''))) for name in ('name', 'role', 'artwork_type')),
+    )
+
+
+def report_digest(report: Report) -> str:
+    return hashlib.sha256(report_json(report).encode('utf-8')).hexdigest()
+
+
+# ---------- text ----------
+
+def body_text(report: Report) -> str:
+    parts = []
+    for s in report.sections:
+        if s.key == "conclusion":
+            parts.append(f"{REPORT_RULE}\n\nCONCLUSION:\n{s.body}")
+        elif s.key == "preamble":
+            parts.append(s.body)
+        else:
+            parts.append(f"{int(s.key[-2:])}. {s.title}\n{s.body}")
+    if not report.complete:
+        parts.append(INCOMPLETE_NOTE)
+    return "\n\n".join(parts)
+
+
+@lru_cache(maxsize=64)
+def render_text(report: Report) -> str:
+    """The report as the app has always shown it: header, guidance, disclaimer."""
+    return build_report_header(report.details) + body_text(report) + build_report_footer()
+
+
+@lru_cache(maxsize=64)
+def export_text(report: Report) -> str:
+    """Downloadable text copy, stamped with the time the report was generated."""
+    user = dict(report.prepared_for)
+    generated = datetime.fromisoformat(report.generated_at)
+    return f"""ARTRESTORER AI — RESTORATION ANALYSIS REPORT
+══════════════════════════════════════════════════════
+PREPARED FOR: {user.get('name', '')}
+ROLE: {user.get('role', '')} | TYPE: {user.get('artwork_type', '')}
+DATE: {generated.strftime('%B %d, %Y')}
+
+{render_text(report)}
+
+══════════════════════════════════════════════════════
+Generated by ArtRestorer AI · Cultural Heritage Preservation
+This analysis is advisory only. Always consult certified conservators.
+"""
+
+
+# ---------- JSON ----------
+
+def report_to_dict(report: Report) -> Dict[str, Any]:
+    return {
+        "request": dict(report.request),
+        "prepared_for": dict(report.prepared_for),
+        "generated_at": report.generated_at,
+        "complete": report.complete,
+        "sections": [s._asdict() for s in report.sections],
+        "disclaimer": REPORT_DISCLAIMER.split("\n", 1)[1],
+    }
+
+
+def report_from_dict(data: Mapping[str, Any]) -> Report:
+    return Report(
+        request=tuple((name, data["request"].get(name, '')) for name in REQUEST_FIELDS),
+        sections=tuple(ReportSection(**s) for s in data["sections"]),
+        generated_at=data["generated_at"],
+        complete=data.get("complete", True),
+        prepared_for=tuple(data.get("prepared_for", {}).items()),
+    )
+
+
+@lru_cache(maxsize=64)
+def report_json(report: Report) -> str:
+    return json.dumps(report_to_dict(report), ensure_ascii=False, indent=2)
+
+
+# ---------- HTML ----------
+
+RULE_HTML = "<hr style='border: none; height: 2px; background: linear-gradient(90deg, transparent, var(--border-accent), transparent); margin: 1.5rem 0;'>"
+
+
+def _paragraphs(text: str) -> str:
+    blocks = [b for b in re.split(r"\n\s*\n", text.strip("\n")) if b.strip()]
+    return "".join(
+        "<p style='margin: 0 0 0.9rem;'>" + "<br>".join(html.escape(line.strip()) for line in b.splitlines()) + "</p>"
+        for b in blocks
+    )
+
+
+@lru_cache(maxsize=256)
+def header_html(request: Tuple[Tuple[str, Any], ...]) -> str:
+    req = dict(request)
+    rows = [
+        ("Style/Period", req['art_style'] or 'Not specified'),
+        ("Damage Type", req['damage_type'] or 'general wear'),
+        ("Cultural Context", req['cultural_context'] or 'Not specified'),
+        ("Analysis Type", req['feature_label']),
+        ("AI Creativity Level", f"{req['temperature']} ({creativity_label(req['temperature'])})"),
+    ]
+    details = "".join(f"<div><strong>{label}:</strong> {html.escape(str(value))}</div>" for label, value in rows)
+    return (
+        "<div style='font-family: var(--font-display); font-size: 1.6rem; background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple)); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; font-weight: 700; letter-spacing: -0.5px;'>Comprehensive Restoration Analysis</div>"
+        + RULE_HTML
+        + f"<div><strong>Artwork Details:</strong></div>{_paragraphs(req['artwork_description'])}{details}"
+        + RULE_HTML
+        + "<div style='font-family: var(--font-display); font-size: 1.4rem; color: var(--accent-purple); margin: 2rem 0 0.8rem; font-weight: 700; letter-spacing: -0.3px;'>Expert Restoration Guidance</div>"
+    )
+
+
+@lru_cache(maxsize=2048)
+def section_html(section: ReportSection) -> str:
+    if section.key == "conclusion":
+        return (RULE_HTML
+                + "<div style='font-family: var(--font-display); font-size: 1.3rem; color: var(--accent-cyan); margin: 2rem 0 0.5rem; font-weight: 700;'>Conclusion</div>"
+                + _paragraphs(section.body))
+    if section.key == "preamble":
+        return _paragraphs(section.body)
+    return f"<h3>{int(section.key[-2:])}. {html.escape(section.title.title())}</h3>{_paragraphs(section.body)}"
+
+
+@lru_cache(maxsize=1)
+def footer_html() -> str:
+    return (RULE_HTML
+            + "<div style='font-family: var(--font-mono); font-size: 0.7rem; color: var(--accent-pink); letter-spacing: 2px; text-transform: uppercase; margin: 1.5rem 0 0.5rem; font-weight: 600;'>Important Disclaimer</div>"
+            + _paragraphs(REPORT_DISCLAIMER.split("\n", 1)[1])
+            + RULE_HTML)
+
+
+@lru_cache(maxsize=64)
+def render_html(report: Report, streaming: bool = False) -> str:
+    """The whole report for the results page; the disclaimer follows once streaming has ended."""
+    parts = [header_html(report.request)]
+    parts.extend(section_html(s) for s in report.sections)
+    if streaming:
+        if not report.sections:
+            parts.append("<em>Generating expert restoration guidance…</em>")
+    else:
+        if not report.complete:
+            parts.append(f"<p><em>{html.escape(INCOMPLETE_NOTE)}</em></p>")
+        parts.append(footer_html())
+    return ('<div class="result-box"><div class="result-text" style="font-size: 0.93rem; line-height: 1.9;">'
+            + "".join(parts) + "</div></div>")
@@ -0,0 +1,220 @@
+"""Full-text search over the heritage knowledge base.
+
+An in-memory inverted index with BM25 ranking covers the cultural insights, the
+analysis feature descriptions and the gallery use cases. Each query term also
+matches vocabulary terms it is a prefix of, and terms within one edit. Typo
+lookups go through a deletion-neighbourhood index, so their cost does not grow
+with the vocabulary. Results come with an HTML snippet in which the matched
+words are wrapped in <mark>.
+"""
+import bisect
+import heapq
+import html
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .engine import FEATURE_KEYS, FEATURE_OPTIONS, feature_descriptions
+from .knowledge import KnowledgeBase
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the their these this to was were with".split()
+)
+
+K1 = 1.2
+B = 0.75
+TITLE_BOOST = 3
+PREFIX_WEIGHT = 0.8
+FUZZY_WEIGHT = 0.6
+MIN_PREFIX_LEN = 2
+MIN_FUZZY_LEN = 4
+SNIPPET_CHARS = 180
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(_fold(text)) if t not in STOPWORDS]
+
+
+def _deletes(term: str) -> Iterable[str]:
+    yield term
+    for i in range(len(term)):
+        yield term[:i] + term[i + 1:]
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True for one substitution, insertion, deletion or adjacent transposition."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diffs = [i for i in range(la) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return len(diffs) == 2 and diffs[1] == diffs[0] + 1 and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]]
+    if la > lb:
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+class Document(NamedTuple):
+    kind: str         # "tradition" | "feature" | "case"
+    title: str
+    ref: str          # tradition name or feature key the document belongs to
+    fields: Tuple[Tuple[str, str], ...]
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    title: str
+    ref: str
+    field: str
+    snippet: str
+    score: float
+
+
+def build_documents(kb: KnowledgeBase) -> List[Document]:
+    docs = []
+    for name, insight in kb.cultural_insights.items():
+        docs.append(Document("tradition", name, name, (
+            ("Historical Background", insight['background']),
+            ("Cultural Importance", insight['importance']),
+            ("Restoration Considerations", insight['restoration']),
+            ("Key Artistic Techniques", " · ".join(insight['techniques'])),
+            ("Famous Masterpieces", " · ".join(insight['famous_works'])),
+            ("Period", insight['period']),
+        )))
+    titles = {}
+    for key, option, gallery in zip(FEATURE_KEYS, FEATURE_OPTIONS, kb.gallery_features):
+        titles[gallery['title']] = key
+        docs.append(Document("feature", gallery['title'], key, (
+            ("Description", feature_descriptions[key]),
+            ("Gallery", gallery['desc']),
+            ("Analysis Type", option),
+        )))
+    for case in kb.gallery_cases:
+        docs.append(Document("case", case['case'], titles.get(case['feature'], ""), (
+            ("Use Case", case['case']),
+            ("Feature", case['feature']),
+        )))
+    return docs
+
+
+class SearchIndex:
+    def __init__(self, documents: List[Document]):
+        self.documents = documents
+        postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.doc_lengths = []
+        for doc_id, doc in enumerate(documents):
+            terms = tokenize(doc.title) * TITLE_BOOST
+            for _, text in doc.fields:
+                terms.extend(tokenize(text))
+            self.doc_lengths.append(len(terms))
+            for term in terms:
+                postings[term][doc_id] = postings[term].get(doc_id, 0) + 1
+        self.postings = {t: tuple(p.items()) for t, p in postings.items()}
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if documents else 0.0
+        self.doc_norms = [K1 * (1 - B + B * length / self.avg_length) for length in self.doc_lengths]
+        n = len(documents)
+        self.idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self.postings.items()}
+        self.vocabulary = sorted(self.postings)
+        self.delete_index: Dict[str, List[str]] = defaultdict(list)
+        for term in self.vocabulary:
+            if len(term) >= MIN_FUZZY_LEN - 1:
+                for variant in set(_deletes(term)):
+                    self.delete_index[variant].append(term)
+
+    @classmethod
+    def from_knowledge(cls, kb: KnowledgeBase) -> "SearchIndex":
+        return cls(build_documents(kb))
+
+    def expand(self, term: str) -> Dict[str, float]:
+        """Vocabulary terms matched by one query term, with their match weight."""
+        matches = {}
+        if len(term) >= MIN_PREFIX_LEN:
+            start = bisect.bisect_left(self.vocabulary, term)
+            for candidate in self.vocabulary[start:]:
+                if not candidate.startswith(term):
+                    break
+                matches[candidate] = 1.0 if candidate == term else PREFIX_WEIGHT
+        elif term in self.postings:
+            matches[term] = 1.0
+        if len(term) >= MIN_FUZZY_LEN:
+            for variant in set(_deletes(term)):
+                for candidate in self.delete_index.get(variant, ()):
+                    if candidate not in matches and _within_one_edit(term, candidate):
+                        matches[candidate] = FUZZY_WEIGHT
+        return matches
+
+    def search(self, query: str, limit: int = 10, kinds: Optional[Iterable[str]] = None) -> List[SearchHit]:
+        kinds = set(kinds) if kinds else None
+        scores: Dict[int, float] = defaultdict(float)
+        matched_terms = set()
+        for qterm in dict.fromkeys(tokenize(query)):
+            best: Dict[int, float] = {}
+            for term, weight in self.expand(qterm).items():
+                matched_terms.add(term)
+                scale = weight * self.idf[term] * (K1 + 1)
+                norms = self.doc_norms
+                for doc_id, tf in self.postings[term]:
+                    score = scale * tf / (tf + norms[doc_id])
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] += score
+
+        candidates = scores.items()
+        if kinds:
+            candidates = [(d, s) for d, s in candidates if self.documents[d].kind in kinds]
+        hits = []
+        for doc_id, score in heapq.nlargest(limit, candidates, key=lambda item: item[1]):
+            doc = self.documents[doc_id]
+            field, snippet = self._snippet(doc, matched_terms)
+            hits.append(SearchHit(doc.kind, doc.title, doc.ref, field, snippet, round(score, 4)))
+        return hits
+
+    def _snippet(self, doc: Document, terms: set) -> Tuple[str, str]:
+        best_field, best_text, best_spans = doc.fields[0][0], doc.fields[0][1], []
+        for field, text in doc.fields:
+            spans = [m.span() for m in TOKEN_RE.finditer(text) if _fold(m.group()) in terms]
+            if len(spans) > len(best_spans):
+                best_field, best_text, best_spans = field, text, spans
+        return best_field, highlight(best_text, best_spans)
+
+
+def highlight(text: str, spans: List[Tuple[int, int]]) -> str:
+    """Escape `text`, trim it to a window around the first match, and <mark> the spans."""
+    start = 0
+    if spans and len(text) > SNIPPET_CHARS:
+        start = max(0, spans[0][0] - SNIPPET_CHARS // 3)
+        space = text.rfind(" ", 0, start)
+        start = space + 1 if space != -1 and start > 0 else start
+    end = min(len(text), start + SNIPPET_CHARS)
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space > start else end
+    parts, cursor = [], start
+    for s, e in spans:
+        if s < start or e > end:
+            continue
+        parts.append(html.escape(text[cursor:s]))
+        parts.append(f"<mark>{html.escape(text[s:e])}</mark>")
+        cursor = e
+    parts.append(html.escape(text[cursor:end]))
+    return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
+
+
+def hits_as_dicts(hits: List[SearchHit]) -> List[Dict[str, Any]]:
+    return [hit._asdict() for hit in hits]
@@ -0,0 +1,122 @@
+"""Inverse timeline planning: what it takes to finish by a deadline.
+
+Given an artwork's damage and scale, the goals that must be met and a deadline,
+the solver searches team size × urgency and returns the cheapest configurations
+that fit. The goals fix the phase scope through timeline.scope_phases, the same
+scope plan_timeline schedules. Phases outside it whose dependencies are in
+scope are reported as optional extras that still fit.
+
+Cost is conservator-weeks of phase work times an urgency premium for overtime
+and rescheduling. Duration is monotone: a larger team or a tighter urgency never
+lengthens the plan. For each urgency, the solver binary-searches the smallest
+team that fits and carries that bound over to tighter urgencies, so the
+critical-path network runs for only a few cells. Costs come straight from the
+memoized phase durations.
+"""
+from typing import Any, Dict, Sequence, Tuple
+
+from .portfolio import TEAM_HEADCOUNT
+from .timeline import (
+    PHASE_NETWORK, PHASE_TEMPLATES, TEAM_SIZES, URGENCIES, damage_map, phase_closure, phase_durations,
+    scope_phases, scoped_durations, size_map, team_map, urgency_map
+)
+
+# Cost multiplier per conservator-week; rush work costs more than the time it saves
+URGENCY_PREMIUM = {
+    "Flexible (timeline open)": 1.0,
+    "Standard (6–12 months)": 1.2,
+    "Priority (3–6 months)": 1.6,
+    "Urgent (< 3 months)": 2.4,
+}
+DEFAULT_LIMIT = 5
+
+
+def solve_deadline(damage_severity: str, size: str, deadline_weeks: int, goals: Sequence[str] = (),
+                   limit: int = DEFAULT_LIMIT) -> Dict[str, Any]:
+    """Cheapest team / urgency configurations that finish within `deadline_weeks`.
+
+    Raises KeyError for a damage, size or goal that is not one of the planner options.
+    """
+    dmg_level, _ = damage_map[damage_severity]
+    size_f = size_map[size]
+    scope = scope_phases(goals, dmg_level)
+    evaluated = 0
+    totals: Dict[Tuple[str, str], int] = {}
+
+    def durations(urgency: str, team: str, phases: Sequence[str] = scope) -> Tuple[int, ...]:
+        return scoped_durations(phase_durations(dmg_level, size_f, urgency_map[urgency], team_map[team]), phases)
+
+    def total(urgency: str, team: str) -> int:
+        nonlocal evaluated
+        if (urgency, team) not in totals:
+            evaluated += 1
+            totals[urgency, team] = PHASE_NETWORK.schedule(durations(urgency, team)).total
+        return totals[urgency, team]
+
+    # Smallest fitting team per urgency. Duration never grows with team size or
+    # urgency, so every larger team fits too and a tighter urgency's search can
+    # stop at this urgency's answer.
+    first_fit: Dict[str, int] = {}
+    upper = len(TEAM_SIZES)
+    for urgency in URGENCIES:
+        lo, hi = 0, upper
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if total(urgency, TEAM_SIZES[mid]) <= deadline_weeks:
+                hi = mid
+            else:
+                lo = mid + 1
+        if lo < len(TEAM_SIZES):
+            first_fit[urgency] = upper = lo
+
+    # Feasible cells are priced from phase durations alone; week rounding keeps
+    # cost only roughly monotone, so every feasible cell is ranked
+    priced = sorted(
+        (round(TEAM_HEADCOUNT[team] * sum(durations(urgency, team)) * URGENCY_PREMIUM[urgency], 1),
+         URGENCIES.index(urgency), t)
+        for urgency, first in first_fit.items()
+        for t, team in enumerate(TEAM_SIZES[first:], first)
+    )
+    solutions = []
+    for cost, u, t in priced[:limit]:
+        urgency, team = URGENCIES[u], TEAM_SIZES[t]
+        weeks = total(urgency, team)
+        solutions.append({
+            "team_size": team,
+            "urgency": urgency,
+            "crew": TEAM_HEADCOUNT[team],
+            "total_weeks": weeks,
+            "spare_weeks": deadline_weeks - weeks,
+            "cost": cost,
+        })
+
+    for solution in solutions:
+        # Optional phases that still fit, added greedily in template order (which is
+        # dependency order), each only once everything it depends on is in scope
+        phases = list(scope)
+        extras = []
+        for template in PHASE_TEMPLATES:
+            pid = template["phase"]
+            if pid in phases or dmg_level < template.get("min_damage", 0):
+                continue
+            if not set(phase_closure([pid], dmg_level)) <= set(phases) | {pid}:
+                continue
+            trial = [p for p in (t["phase"] for t in PHASE_TEMPLATES) if p in phases or p == pid]
+            weeks = durations(solution["urgency"], solution["team_size"], trial)
+            if PHASE_NETWORK.schedule(weeks).total <= deadline_weeks:
+                phases = trial
+                extras.append(pid)
+        solution["optional_phases_fit"] = extras
+
+    result = {
+        "deadline_weeks": deadline_weeks,
+        "goals": list(goals),
+        "scope": list(scope),
+        "solutions": solutions,
+        "fastest_weeks": None,
+        "evaluated": evaluated,
+        "search_space": len(TEAM_SIZES) * len(URGENCIES),
+    }
+    if not solutions:
+        result["fastest_weeks"] = total(URGENCIES[-1], TEAM_SIZES[-1])
+    return result
@@ -0,0 +1,142 @@
+"""Vectorized scenario sweep and sensitivity analysis for the timeline model.
+
+The whole damage × size × urgency × team grid (5 × 5 × 4 × 4 = 400 scenarios) is
+evaluated in one NumPy pass with the same arithmetic as timeline.calc_weeks and
+the same critical-path forward pass as the planner. np.round rounds half to
+even, like Python's round(). Goals are not an axis: each grid is cut to the
+phase scope the planner uses for the given goals (timeline.scope_phases), and
+artwork type has no effect on weeks. A grid is computed once per process and
+goal set; baseline-specific views are slices of it.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .timeline import PHASE_NETWORK, PHASE_TEMPLATES, damage_map, scope_phases, size_map, team_map, urgency_map
+
+FACTORS = ("damage", "size", "urgency", "team")
+FACTOR_LABELS = {"damage": "Damage Severity", "size": "Artwork Scale", "urgency": "Project Urgency", "team": "Team Size"}
+FACTOR_LEVELS = {
+    "damage": tuple(damage_map),
+    "size": tuple(size_map),
+    "urgency": tuple(urgency_map),
+    "team": tuple(team_map),
+}
+
+
+def _goal_key(goals: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    return tuple(sorted(set(goals or ())))
+
+
+def phase_weeks_grid(goals: Optional[Sequence[str]] = None) -> np.ndarray:
+    """Weeks per phase for every scenario; shape (phases, damage, size, urgency, team)."""
+    return _phase_weeks_grid(_goal_key(goals))
+
+
+@lru_cache(maxsize=32)
+def _phase_weeks_grid(goals: Tuple[str, ...]) -> np.ndarray:
+    dmg = np.array([level for level, _ in damage_map.values()], dtype=float)
+    size = np.array(list(size_map.values()))
+    urg = np.array(list(urgency_map.values()))
+    team = np.array(list(team_map.values()))
+    factor = (dmg / 2)[:, None, None, None] * size[None, :, None, None] * urg[None, None, :, None] * team[None, None, None, :]
+    base = np.array([p["base_weeks"] for p in PHASE_TEMPLATES], dtype=float)
+    weeks = np.maximum(1, np.round(base[:, None, None, None, None] * factor[None]))
+    # Phases outside the goals' scope at each damage level (skipped ones included) take no time
+    in_scope = np.array([[p["phase"] in scope_phases(goals, level) for level, _ in damage_map.values()]
+                         for p in PHASE_TEMPLATES])
+    weeks = (weeks * in_scope[:, :, None, None, None]).astype(np.int64)
+    weeks.setflags(write=False)
+    return weeks
+
+
+def total_weeks_grid(goals: Optional[Sequence[str]] = None) -> np.ndarray:
+    """Total weeks for every scenario; shape (damage, size, urgency, team)."""
+    return _total_weeks_grid(_goal_key(goals))
+
+
+@lru_cache(maxsize=32)
+def _total_weeks_grid(goals: Tuple[str, ...]) -> np.ndarray:
+    totals = PHASE_NETWORK.project_weeks(_phase_weeks_grid(goals)).astype(np.int64)
+    totals.setflags(write=False)
+    return totals
+
+
+def baseline_index(damage_severity: str, size: str, urgency: str, team_size: str) -> Dict[str, int]:
+    return {
+        "damage": FACTOR_LEVELS["damage"].index(damage_severity),
+        "size": FACTOR_LEVELS["size"].index(size),
+        "urgency": FACTOR_LEVELS["urgency"].index(urgency),
+        "team": FACTOR_LEVELS["team"].index(team_size),
+    }
+
+
+def factor_profile(factor: str, base: Dict[str, int], goals: Optional[Sequence[str]] = None) -> np.ndarray:
+    """Total weeks across one factor's levels with the others held at the baseline."""
+    index = tuple(slice(None) if f == factor else base[f] for f in FACTORS)
+    return total_weeks_grid(goals)[index]
+
+
+def tornado(damage_severity: str, size: str, urgency: str, team_size: str,
+            goals: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """One-at-a-time sensitivity around the baseline, widest swing first."""
+    base = baseline_index(damage_severity, size, urgency, team_size)
+    baseline_total = int(total_weeks_grid(goals)[tuple(base[f] for f in FACTORS)])
+    rows = []
+    for factor in FACTORS:
+        profile = factor_profile(factor, base, goals)
+        lo, hi = int(profile.argmin()), int(profile.argmax())
+        rows.append({
+            "factor": factor,
+            "label": FACTOR_LABELS[factor],
+            "baseline": baseline_total,
+            "low_weeks": int(profile[lo]),
+            "low_level": FACTOR_LEVELS[factor][lo],
+            "high_weeks": int(profile[hi]),
+            "high_level": FACTOR_LEVELS[factor][hi],
+            "swing": int(profile[hi] - profile[lo]),
+            "profile": [int(v) for v in profile],
+        })
+    rows.sort(key=lambda r: r["swing"], reverse=True)
+    return rows
+
+
+def variance_shares(goals: Optional[Sequence[str]] = None) -> Dict[str, float]:
+    """First-order (main-effect) share of total-weeks variance over the full grid.
+
+    With every level equally likely this is the discrete first-order Sobol index.
+    """
+    return dict(_variance_shares(_goal_key(goals)))
+
+
+@lru_cache(maxsize=32)
+def _variance_shares(goals: Tuple[str, ...]) -> Tuple[Tuple[str, float], ...]:
+    totals = _total_weeks_grid(goals).astype(float)
+    variance = totals.var()
+    shares = {}
+    for axis, factor in enumerate(FACTORS):
+        other_axes = tuple(a for a in range(len(FACTORS)) if a != axis)
+        shares[factor] = float(totals.mean(axis=other_axes).var() / variance) if variance else 0.0
+    return tuple(shares.items())
+
+
+def grid_summary(goals: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    totals = total_weeks_grid(goals)
+    return {
+        "scenarios": int(totals.size),
+        "min_weeks": int(totals.min()),
+        "median_weeks": float(np.median(totals)),
+        "max_weeks": int(totals.max()),
+    }
+
+
+def damage_team_table(size: str, urgency: str, goals: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """Total weeks for every damage × team combination at a fixed size and urgency."""
+    s = FACTOR_LEVELS["size"].index(size)
+    u = FACTOR_LEVELS["urgency"].index(urgency)
+    block = total_weeks_grid(goals)[:, s, u, :]
+    return [
+        dict({"Damage": damage.split(" (")[0]}, **{team: int(block[d, t]) for t, team in enumerate(FACTOR_LEVELS["team"])})
+        for d, damage in enumerate(FACTOR_LEVELS["damage"])
+    ]
@@ -0,0 +1,114 @@
+"""Delivery of the global stylesheet (static/theme.css).
+
+The theme is published under a content-hashed name in Streamlit's static folder
+so browsers can cache it indefinitely. Streamlit serves .css from that folder as
+text/plain with nosniff, which a <link> tag would reject. A small loader instead
+fetches the file once and installs it as a <style> in the page head. The head
+sits outside Streamlit's element tree, so the styles survive reruns and each
+rerun only re-sends the loader.
+
+Fonts are self-hosted from static/fonts once ``python -m artrestorer
+fetch-fonts`` has downloaded them. Until then the stylesheet imports them from
+Google Fonts instead, so a fresh deploy never requests missing files.
+"""
+import glob
+import hashlib
+import os
+import re
+import urllib.request
+from typing import List
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+THEME_SOURCE = os.path.join(STATIC_DIR, 'theme.css')
+FONTS_DIR = os.path.join(STATIC_DIR, 'fonts')
+
+# Google Fonts family spec -> self-hosted file name used by the @font-face rules in theme.css
+FONT_FILES = {
+    "Space+Grotesk:wght@300..700": "space-grotesk.woff2",
+    "Inter:wght@300..700": "inter.woff2",
+    "JetBrains+Mono:wght@400..600": "jetbrains-mono.woff2",
+}
+# Used instead of the self-hosted @font-face rules until fetch-fonts has been run
+GOOGLE_FONTS_CSS = "https://fonts.googleapis.com/css2?" + "&".join(f"family={f}" for f in FONT_FILES) + "&display=swap"
+
+_SELF_HOSTED_FACES_RE = re.compile(r"(?:@font-face\s*\{[^}]*app/static/fonts/[^}]*\}\s*)+")
+
+
+def missing_fonts(dest: str = FONTS_DIR) -> List[str]:
+    return [name for name in FONT_FILES.values() if not os.path.isfile(os.path.join(dest, name))]
+
+
+def read_stylesheet() -> str:
+    """The theme, with the fonts loaded from Google Fonts when any self-hosted file is missing."""
+    with open(THEME_SOURCE, encoding='utf-8') as f:
+        css = f.read()
+    if missing_fonts():
+        css = _SELF_HOSTED_FACES_RE.sub(f"@import url('{GOOGLE_FONTS_CSS}');\n\n", css, count=1)
+    return css
+
+
+def publish_stylesheet() -> str:
+    """Write static/theme.<hash>.css if needed, drop stale copies, and return its file name."""
+    css = read_stylesheet()
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]
+    name = f"theme.{digest}.css"
+    path = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(css)
+        os.replace(tmp, path)
+    for stale in glob.glob(os.path.join(STATIC_DIR, 'theme.*.css')):
+        if os.path.basename(stale) != name:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return name
+
+
+def stylesheet_loader_html(name: str) -> str:
+    # "?v=" makes Tornado's static handler send a far-future Cache-Control header
+    style_id = "artrestorer-" + name.replace('.', '-')
+    return f"""<script>
+(function () {{
+    const doc = window.parent.document;
+    if (doc.getElementById("{style_id}")) return;
+    doc.querySelectorAll('style[id^="artrestorer-theme-"]').forEach(function (el) {{ el.remove(); }});
+    const style = doc.createElement("style");
+    style.id = "{style_id}";
+    doc.head.appendChild(style);
+    const base = window.parent.location.pathname.replace(/[^/]*$/, "");
+    fetch(base + "app/static/{name}?v={name}", {{cache: "force-cache"}})
+        .then(function (r) {{ return r.text(); }})
+        .then(function (css) {{ style.textContent = css; }});
+}})();
+</script>"""
+
+
+def inline_stylesheet_html() -> str:
+    return f"<style>\n{read_stylesheet()}</style>"
+
+
+def fetch_fonts(dest: str = FONTS_DIR) -> List[str]:
+    """Download the latin subset of each theme font from Google Fonts into static/fonts."""
+    os.makedirs(dest, exist_ok=True)
+    written = []
+    for family, filename in FONT_FILES.items():
+        # A modern user agent makes the css2 API answer with woff2 sources
+        req = urllib.request.Request(
+            f"https://fonts.googleapis.com/css2?family={family}&display=swap",
+            headers={"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36"}
+        )
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            css = resp.read().decode('utf-8')
+        match = re.search(r"/\* latin \*/\s*@font-face\s*\{[^}]*?src:\s*url\(([^)]+)\)", css)
+        if not match:
+            raise RuntimeError(f"no latin woff2 source found for {family}")
+        with urllib.request.urlopen(match.group(1), timeout=30) as resp:
+            data = resp.read()
+        path = os.path.join(dest, filename)
+        with open(path, 'wb') as f:
+            f.write(data)
+        written.append(path)
+    return written
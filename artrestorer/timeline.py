@@ -0,0 +1,326 @@
+"""Restoration timeline model behind the Timeline Planner.
+
+Each phase's base duration is scaled by damage severity, artwork scale, urgency
+and team size. Phases are scheduled over their dependency network (see
+network.py), so overlapping phases shorten the project and the longest chain
+sets its length.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .network import PhaseNetwork
+
+ARTWORK_TYPES = [
+    "Oil Painting", "Watercolor on Paper", "Stone Sculpture",
+    "Bronze Sculpture", "Textile / Tapestry", "Illuminated Manuscript",
+    "Mural / Fresco", "Ceramic / Pottery", "Mixed Media"
+]
+
+GOALS = [
+    "Stabilisation only", "Full visual restoration",
+    "Scientific documentation", "Public exhibition prep",
+    "Digital archiving", "Loan/transport preparation",
+    "Educational reproduction", "Insurance documentation"
+]
+DEFAULT_GOALS = ["Stabilisation only", "Full visual restoration"]
+
+# Phases each goal needs; Phase 04 still drops out below its min_damage
+GOAL_PHASES = {
+    "Stabilisation only": ("Phase 01", "Phase 02", "Phase 04"),
+    "Full visual restoration": ("Phase 01", "Phase 02", "Phase 03", "Phase 04", "Phase 05", "Phase 06"),
+    "Scientific documentation": ("Phase 01",),
+    "Public exhibition prep": ("Phase 01", "Phase 02", "Phase 03", "Phase 04", "Phase 06"),
+    "Digital archiving": ("Phase 01", "Phase 03"),
+    "Loan/transport preparation": ("Phase 01", "Phase 02", "Phase 04"),
+    "Educational reproduction": ("Phase 01",),
+    "Insurance documentation": ("Phase 01",),
+}
+
+damage_map = {
+    "Minimal (surface dust/light scratches)": (1, "LOW"),
+    "Moderate (fading, minor losses)": (2, "MEDIUM"),
+    "Significant (structural cracks, major losses)": (3, "HIGH"),
+    "Severe (major structural damage, 50%+ loss)": (4, "HIGH"),
+    "Critical (near-total deterioration)": (5, "HIGH")
+}
+size_map = {
+    "Small (< 30cm)": 0.7,
+    "Medium (30–100cm)": 1.0,
+    "Large (100–200cm)": 1.4,
+    "Very Large (> 200cm)": 1.8,
+    "Monumental (architectural scale)": 2.5
+}
+urgency_map = {
+    "Flexible (timeline open)": 1.0,
+    "Standard (6–12 months)": 0.85,
+    "Priority (3–6 months)": 0.65,
+    "Urgent (< 3 months)": 0.45
+}
+team_map = {
+    "Solo conservator": 1.3,
+    "2–3 specialists": 1.0,
+    "4–6 person team": 0.75,
+    "Large institutional team (7+)": 0.55
+}
+
+DAMAGE_SEVERITIES = list(damage_map)
+SIZES = list(size_map)
+URGENCIES = list(urgency_map)
+TEAM_SIZES = list(team_map)
+
+# Phase templates; "min_damage" skips a phase below that damage level. "depends_on" lists
+# (predecessor, lag) pairs: a phase starts once each predecessor has finished, shifted by
+# lag × the predecessor's duration, so a negative lag lets the two overlap.
+PHASE_TEMPLATES = [
+    {
+        "phase": "Phase 01", "icon": "🔬",
+        "title": "Assessment & Documentation",
+        "base_weeks": 3,
+        "tasks": [
+            ("Comprehensive visual inspection and condition mapping", "HIGH"),
+            ("UV fluorescence, X-radiography, infrared reflectography", "HIGH"),
+            ("Material sampling and scientific analysis (pigment, substrate, binding media)", "MEDIUM"),
+            ("Historical research, provenance investigation and archival study", "MEDIUM"),
+            ("Photographic documentation (raking light, multispectral)", "LOW")
+        ],
+        "milestone": "Condition Report & Treatment Proposal approved by stakeholders",
+        "deliverable": "Detailed Condition Report"
+    },
+    {
+        "phase": "Phase 02", "icon": "🛡️",
+        "title": "Emergency Stabilisation",
+        "base_weeks": 2,
+        "depends_on": [("Phase 01", -0.5)],
+        "tasks": [
+            ("Consolidation of flaking or delaminating paint layers", "HIGH"),
+            ("Structural support for fragile or cracked substrate", "HIGH"),
+            ("Local facing of vulnerable areas prior to treatment", "MEDIUM"),
+            ("Climate and environmental stabilisation measures", "LOW")
+        ],
+        "milestone": "Artwork structurally stable and safe to proceed",
+        "deliverable": "Stabilisation Report"
+    },
+    {
+        "phase": "Phase 03", "icon": "🧹",
+        "title": "Surface Cleaning & Preparation",
+        "base_weeks": 4,
+        "depends_on": [("Phase 01", 0), ("Phase 02", 0)],
+        "tasks": [
+            ("Dry mechanical cleaning — removal of surface deposits", "LOW"),
+            ("Solvent-based cleaning of discoloured varnish layers", "HIGH"),
+            ("Aqueous cleaning where appropriate (pH controlled)", "MEDIUM"),
+            ("Removal of previous (incompatible) restorations or overpaints", "HIGH"),
+            ("Final surface preparation and assessment of original material revealed", "MEDIUM")
+        ],
+        "milestone": "Original surface fully accessible and documented",
+        "deliverable": "Cleaning Test Records & Solubility Maps"
+    },
+    {
+        "phase": "Phase 04", "icon": "🔧",
+        "title": "Structural Conservation",
+        "base_weeks": 3, "min_damage": 3,
+        "depends_on": [("Phase 02", 0), ("Phase 03", -0.5)],
+        "tasks": [
+            ("Structural consolidation of substrate (relining, cradling, backing)", "HIGH"),
+            ("Loss filling with appropriate conservation-grade fills", "MEDIUM"),
+            ("Surface texture inpainting to match surrounding original", "MEDIUM"),
+            ("Adhesive consolidation of all previously loose elements", "LOW")
+        ],
+        "milestone": "Structural integrity fully restored",
+        "deliverable": "Structural Treatment Report"
+    },
+    {
+        "phase": "Phase 05", "icon": "🎨",
+        "title": "Aesthetic Restoration & Inpainting",
+        "base_weeks": 5,
+        "depends_on": [("Phase 03", -0.25), ("Phase 04", 0)],
+        "tasks": [
+            ("Colour matching and reference sample creation", "HIGH"),
+            ("Inpainting of losses using reversible conservation media", "HIGH"),
+            ("Texture recreation to integrate losses with original surface", "HIGH"),
+            ("Intermediate varnish application for visual unification", "MEDIUM"),
+            ("Chromatic reintegration review with client / curator", "MEDIUM")
+        ],
+        "milestone": "Visual reintegration approved — aesthetic integrity restored",
+        "deliverable": "Inpainting Log & Photographic Record"
+    },
+    {
+        "phase": "Phase 06", "icon": "✅",
+        "title": "Final Varnishing, Review & Handover",
+        "base_weeks": 2,
+        "depends_on": [("Phase 05", 0)],
+        "tasks": [
+            ("Application of final protective varnish (reversible, UV-stable)", "MEDIUM"),
+            ("Full post-treatment documentation photography", "LOW"),
+            ("Preparation of final conservation treatment report", "HIGH"),
+            ("Client review, sign-off and handover", "LOW"),
+            ("Long-term care and preventive conservation guidance issued", "LOW")
+        ],
+        "milestone": "Project complete — artwork delivered with full documentation",
+        "deliverable": "Final Conservation Report & Certificate"
+    }
+]
+PHASE_NETWORK = PhaseNetwork(PHASE_TEMPLATES)
+
+
+def match_option(options: List[str], value: str) -> str:
+    """Return the option equal to `value`, or the only one it is a case-insensitive prefix of.
+
+    Raises ValueError when `value` matches no option or several.
+    """
+    lowered = value.strip().lower()
+    matches = [o for o in options if o.lower() == lowered] or [o for o in options if o.lower().startswith(lowered)]
+    if len(matches) != 1:
+        raise ValueError(f"'{value}' must identify one of: {', '.join(options)}")
+    return matches[0]
+
+
+def calc_weeks(base_w: float, dmg_level: int, size_f: float, urg_f: float, team_f: float) -> int:
+    """Base weeks per phase scaled by damage, size, urgency and team."""
+    return max(1, round(base_w * (dmg_level / 2) * size_f * urg_f * team_f))
+
+
+@lru_cache(maxsize=512)
+def phase_durations(dmg_level: int, size_f: float, urg_f: float, team_f: float) -> Tuple[int, ...]:
+    """Weeks per template phase; 0 for a phase the damage level skips."""
+    return tuple(
+        calc_weeks(t["base_weeks"], dmg_level, size_f, urg_f, team_f) if dmg_level >= t.get("min_damage", 0) else 0
+        for t in PHASE_TEMPLATES
+    )
+
+
+def phase_closure(phase_ids: Iterable[str], dmg_level: Optional[int] = None) -> Tuple[str, ...]:
+    """The phases plus everything they depend on, in template order.
+
+    With `dmg_level`, phases that damage level skips are dropped. A skipped
+    phase asked for directly pulls in nothing. One reached as a dependency
+    still has its predecessors followed, because the network passes their
+    constraints through it.
+    """
+    templates = {t["phase"]: t for t in PHASE_TEMPLATES}
+
+    def active(pid: str) -> bool:
+        return dmg_level is None or dmg_level >= templates[pid].get("min_damage", 0)
+
+    seen, stack = set(), [pid for pid in phase_ids if active(pid)]
+    while stack:
+        pid = stack.pop()
+        if pid not in seen:
+            seen.add(pid)
+            stack.extend(dep for dep, _ in templates[pid].get("depends_on", ()))
+    return tuple(t["phase"] for t in PHASE_TEMPLATES if t["phase"] in seen and active(t["phase"]))
+
+
+def scope_phases(goals: Sequence[str], dmg_level: Optional[int] = None) -> Tuple[str, ...]:
+    """Phase ids the goals require, with their dependencies; every phase when no goal is given."""
+    if not goals:
+        return phase_closure((t["phase"] for t in PHASE_TEMPLATES), dmg_level)
+    return phase_closure((pid for goal in goals for pid in GOAL_PHASES[goal]), dmg_level)
+
+
+def scoped_durations(durations: Sequence[int], scope: Sequence[str]) -> Tuple[int, ...]:
+    """Zero the weeks of every phase outside `scope`."""
+    return tuple(d if t["phase"] in scope else 0 for d, t in zip(durations, PHASE_TEMPLATES))
+
+
+def build_recommendations(dmg_level: int, urgency: str, goals: List[str]) -> List[Tuple[str, str, str]]:
+    rec_items = []
+    if dmg_level >= 4:
+        rec_items.append(("🚨", "HIGH", "Immediate structural stabilisation is critical. Do not proceed to cleaning before securing all fragile elements."))
+    if "Scientific documentation" in goals:
+        rec_items.append(("🔬", "MEDIUM", "Allow additional 2–3 weeks for laboratory analysis turnaround. Partner with a university conservation science department."))
+    if "Public exhibition prep" in goals:
+        rec_items.append(("🖼️", "MEDIUM", "Build a 4-week buffer before exhibition date. Final varnish requires 2 weeks to cure fully under stable conditions."))
+    if urgency in ["Priority (3–6 months)", "Urgent (< 3 months)"]:
+        rec_items.append(("⚡", "HIGH", "Compressed timeline increases risk. Consider expanding team size or reducing scope to only critical interventions."))
+    rec_items.append(("📋", "LOW", "Document every intervention in a running treatment log. Photographs before, during and after each phase are mandatory."))
+    rec_items.append(("🌡️", "LOW", "Maintain stable environment throughout: 18–22°C, 45–55% RH. Fluctuations can undo treatment gains."))
+    if "Digital archiving" in goals:
+        rec_items.append(("💾", "LOW", "Schedule multispectral imaging session at end of Phase 3 (cleaned but pre-inpainted) for the highest-quality archive record."))
+    return rec_items
+
+
+def plan_timeline(artwork_type: str, damage_severity: str, size: str, urgency: str,
+                  team_size: str, goals: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Compute the phase-by-phase plan for one artwork, scoped to the phases its goals need.
+
+    Raises KeyError for a parameter value that is not one of the planner options.
+    """
+    goals = list(goals or [])
+    dmg_level, risk_base = damage_map[damage_severity]
+    size_f = size_map[size]
+    urg_f = urgency_map[urgency]
+    team_f = team_map[team_size]
+
+    # The goals decide which phases are in scope, exactly as in the deadline solver
+    scope = scope_phases(goals, dmg_level)
+    durations = scoped_durations(phase_durations(dmg_level, size_f, urg_f, team_f), scope)
+    network = PHASE_NETWORK.schedule(durations)
+    active_phases = [
+        dict(template, weeks=weeks, start_week=start + 1, end_week=finish,
+             slack_weeks=slack, critical=critical)
+        for template, weeks, start, finish, slack, critical in zip(
+            PHASE_TEMPLATES, durations, network.start, network.finish, network.slack, network.critical)
+        if weeks
+    ]
+
+    total_weeks = network.total
+    return {
+        "params": {
+            "artwork_type": artwork_type, "damage_severity": damage_severity, "size": size,
+            "urgency": urgency, "team_size": team_size, "goals": goals
+        },
+        "dmg_level": dmg_level,
+        "risk_level": risk_base,
+        "scope": list(scope),
+        "phases": active_phases,
+        "critical_path": [p["phase"] for p in active_phases if p["critical"]],
+        "total_weeks": total_weeks,
+        "sequential_weeks": sum(durations),
+        "total_months": round(total_weeks / 4.3, 1),
+        "urgent_overrun": urgency == "Urgent (< 3 months)" and total_weeks > 12,
+        "recommendations": build_recommendations(dmg_level, urgency, goals),
+    }
+
+
+def timeline_export_text(plan: Dict[str, Any], project_name: str = "N/A",
+                         generated_at: Optional[datetime] = None,
+                         dates: Optional[List[Dict[str, Any]]] = None, calendar_name: str = "") -> str:
+    """Plain-text plan; `dates` (from calendars.dated_phases) adds the calendar dates of each phase."""
+    params = plan["params"]
+    generated_at = generated_at or datetime.now()
+    dates = dates or [None] * len(plan["phases"])
+    calendar_line = ""
+    if dates and dates[0] is not None:
+        calendar_line = (f"Calendar:        {dates[0]['start_date']:%a %d %b %Y} → {dates[-1]['end_date']:%a %d %b %Y}"
+                         f" ({calendar_name or 'working weeks'})\n")
+    lines = [f"""ARTRESTORER AI — RESTORATION TIMELINE PLAN
+══════════════════════════════════════════════════════
+Generated: {generated_at.strftime('%B %d, %Y at %H:%M')}
+Project: {project_name} | {params['artwork_type']}
+
+PARAMETERS
+Artwork Type:    {params['artwork_type']}
+Damage:          {params['damage_severity']}
+Scale:           {params['size']}
+Team:            {params['team_size']}
+Urgency:         {params['urgency']}
+Goals:           {', '.join(params['goals'])}
+
+SUMMARY
+Total Duration:  {plan['total_weeks']} weeks (~{plan['total_months']} months)
+Phases:          {len(plan['phases'])}
+Critical Path:   {' → '.join(plan['critical_path'])}
+Overlap Saving:  {plan['sequential_weeks'] - plan['total_weeks']} weeks vs. {plan['sequential_weeks']} back to back
+Risk Level:      {plan['risk_level']}
+{calendar_line}
+PHASES
+"""]
+    for ph, dated in zip(plan["phases"], dates):
+        timing = "critical" if ph['critical'] else f"{ph['slack_weeks']}w float"
+        when = f" · {dated['start_date']:%d %b %Y} – {dated['end_date']:%d %b %Y}" if dated else ""
+        lines.append(f"\n{ph['phase']}: {ph['title']}\nWeeks {ph['start_week']}–{ph['end_week']} ({ph['weeks']}w, {timing}){when}\n")
+        lines.extend(f"  [{p}] {t}\n" for t, p in ph['tasks'])
+        lines.append(f"Milestone: {ph['milestone']}\nDeliverable: {ph['deliverable']}\n")
+    return "".join(lines)
@@ -1,2174 +1,1389 @@
-import streamlit as st
-import json
-from datetime import datetime
-from typing import Dict, List, Any
-import os
-from openai import OpenAI
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Page configuration
-st.set_page_config(
-    page_title="ArtRestorer AI - Cultural Heritage Preservation",
-    layout="wide",
-    initial_sidebar_state="collapsed"
-)
-
-# ==================== OPENAI API CONFIGURATION ====================
-openai_api_key = os.getenv('OPENAI_API_KEY')
-
-if not openai_api_key:
-    st.error("❌ OpenAI API key not found! Please add OPENAI_API_KEY to your .env file")
-    st.stop()
-
-openai_client = OpenAI(api_key=openai_api_key)
-
-# ==================== GLOBAL CSS ====================
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@300;400;500;600;700&family=Inter:wght@300;400;500;600;700&family=JetBrains+Mono:wght@400;500;600&display=swap');
-
-    :root {
-        --bg-primary: #0f0f23;
-        --bg-secondary: #1a1a2e;
-        --bg-tertiary: #16213e;
-        --accent-cyan: #06d6a0;
-        --accent-purple: #8b5cf6;
-        --accent-pink: #ec4899;
-        --accent-orange: #f97316;
-        --text-primary: #f8fafc;
-        --text-secondary: #cbd5e1;
-        --text-muted: #94a3b8;
-        --border-color: rgba(148, 163, 184, 0.1);
-        --border-accent: rgba(6, 214, 160, 0.3);
-    }
-
-    /* ========== GLOBAL RESETS ========== */
-    .stApp {
-        background: linear-gradient(135deg, #0f0f23 0%, #1a1a2e 50%, #16213e 100%);
-        font-family: 'Inter', sans-serif;
-    }
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    .stDeployButton {display: none;}
-
-    /* ========== HEADER ========== */
-    .site-header {
-        background: linear-gradient(135deg, rgba(15,15,35,0.95) 0%, rgba(26,26,46,0.95) 100%);
-        border-bottom: 2px solid;
-        border-image: linear-gradient(90deg, var(--accent-cyan), var(--accent-purple), var(--accent-pink)) 1;
-        padding: 1.5rem 2rem;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        backdrop-filter: blur(20px);
-        position: relative;
-        margin: -6rem -6rem 2rem -6rem;
-    }
-    .site-header::after {
-        content: '';
-        position: absolute;
-        bottom: -2px; left: 0; right: 0;
-        height: 2px;
-        background: linear-gradient(90deg, transparent, var(--accent-cyan), var(--accent-purple), transparent);
-        animation: shimmer 3s infinite;
-    }
-    @keyframes shimmer {
-        0%, 100% { opacity: 0.3; }
-        50% { opacity: 1; }
-    }
-    .header-logo {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 2rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple));
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        letter-spacing: -0.5px;
-    }
-    .header-tagline {
-        font-family: 'JetBrains Mono', monospace;
-        font-size: 0.7rem;
-        color: var(--text-muted);
-        letter-spacing: 2px;
-        text-transform: uppercase;
-        margin-top: 0.3rem;
-        text-align: center;
-    }
-
-    /* ========== HERO ========== */
-    .hero-wrapper {
-        position: relative;
-        padding: 4rem 2rem 5rem;
-        text-align: center;
-        overflow: hidden;
-    }
-    .hero-bg-orb {
-        position: absolute;
-        border-radius: 50%;
-        filter: blur(150px);
-        opacity: 0.15;
-        pointer-events: none;
-        animation: float 20s infinite ease-in-out;
-    }
-    @keyframes float {
-        0%, 100% { transform: translate(0, 0) scale(1); }
-        33% { transform: translate(30px, -30px) scale(1.1); }
-        66% { transform: translate(-30px, 30px) scale(0.9); }
-    }
-    .hero-bg-orb-1 {
-        width: 500px; height: 500px;
-        background: var(--accent-cyan);
-        top: -150px; left: -100px;
-    }
-    .hero-bg-orb-2 {
-        width: 450px; height: 450px;
-        background: var(--accent-purple);
-        bottom: -100px; right: -100px;
-        animation-delay: -10s;
-    }
-    .hero-eyebrow {
-        font-family: 'JetBrains Mono', monospace;
-        font-size: 0.75rem;
-        color: var(--accent-cyan);
-        letter-spacing: 3px;
-        text-transform: uppercase;
-        margin-bottom: 1.5rem;
-        display: inline-block;
-        padding: 0.5rem 1.5rem;
-        border: 1px solid var(--border-accent);
-        border-radius: 50px;
-        background: rgba(6, 214, 160, 0.05);
-        position: relative;
-        overflow: hidden;
-    }
-    .hero-eyebrow::before {
-        content: '';
-        position: absolute;
-        top: 0; left: -100%;
-        width: 100%; height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(6, 214, 160, 0.1), transparent);
-        animation: slide 3s infinite;
-    }
-    @keyframes slide {
-        0% { left: -100%; }
-        100% { left: 100%; }
-    }
-    .hero-title {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: clamp(3rem, 7vw, 5.5rem);
-        font-weight: 700;
-        color: var(--text-primary);
-        line-height: 1.1;
-        margin: 0 0 0.5rem 0;
-        letter-spacing: -2px;
-    }
-    .hero-title-accent {
-        background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple), var(--accent-pink));
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        font-weight: 700;
-    }
-    .hero-subtitle {
-        font-family: 'Inter', sans-serif;
-        font-size: 1.1rem;
-        color: var(--text-secondary);
-        margin: 1.5rem auto 3rem auto;
-        max-width: 600px;
-        line-height: 1.7;
-        font-weight: 400;
-    }
-    .hero-divider {
-        width: 120px;
-        height: 3px;
-        background: linear-gradient(90deg, var(--accent-cyan), var(--accent-purple), var(--accent-pink));
-        margin: 0 auto 3rem;
-        border-radius: 2px;
-    }
-
-    /* ========== FEATURE GRID ========== */
-    .features-label {
-        font-family: 'JetBrains Mono', monospace;
-        font-size: 0.7rem;
-        color: var(--text-muted);
-        letter-spacing: 3px;
-        text-transform: uppercase;
-        text-align: center;
-        margin: 3rem 0 2rem;
-    }
-    .feature-card-dark {
-        background: rgba(26,26,46,0.6);
-        border: 1px solid var(--border-color);
-        border-radius: 20px;
-        padding: 2rem 1.5rem;
-        text-align: center;
-        transition: all 0.4s cubic-bezier(0.23, 1, 0.32, 1);
-        position: relative;
-        overflow: hidden;
-        backdrop-filter: blur(10px);
-        height: 220px;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: center;
-    }
-    .feature-card-dark::before {
-        content: '';
-        position: absolute;
-        top: 0; left: 0; right: 0;
-        height: 3px;
-        background: linear-gradient(90deg, var(--accent-cyan), var(--accent-purple));
-        opacity: 0;
-        transition: opacity 0.4s ease;
-    }
-    .feature-card-dark:hover {
-        background: rgba(26,26,46,0.9);
-        border-color: var(--border-accent);
-        transform: translateY(-8px);
-        box-shadow: 0 20px 60px rgba(6,214,160,0.2), 0 0 40px rgba(139,92,246,0.1);
-    }
-    .feature-card-dark:hover::before { opacity: 1; }
-    .feature-icon-dark {
-        font-size: 2.5rem;
-        margin-bottom: 1rem;
-        display: block;
-        transition: transform 0.3s ease;
-        filter: drop-shadow(0 0 20px rgba(6,214,160,0.3));
-    }
-    .feature-card-dark:hover .feature-icon-dark {
-        transform: scale(1.2) rotateY(360deg);
-    }
-    .feature-card-dark h3 {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 1.15rem;
-        font-weight: 600;
-        background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple));
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin: 0 0 0.6rem 0;
-        letter-spacing: -0.3px;
-    }
-    .feature-card-dark p {
-        color: var(--text-muted);
-        font-size: 0.85rem;
-        line-height: 1.5;
-        margin: 0;
-    }
-
-    /* ========== WHY SECTION ========== */
-    .why-card {
-        background: rgba(26,26,46,0.5);
-        border: 1px solid var(--border-color);
-        border-radius: 24px;
-        padding: 2.5rem 2rem;
-        text-align: center;
-        backdrop-filter: blur(10px);
-        height: 280px;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: center;
-        transition: all 0.3s ease;
-        position: relative;
-        overflow: hidden;
-    }
-    .why-card::after {
-        content: '';
-        position: absolute;
-        inset: 0;
-        background: linear-gradient(135deg, rgba(6,214,160,0.05), rgba(139,92,246,0.05));
-        opacity: 0;
-        transition: opacity 0.3s ease;
-    }
-    .why-card:hover {
-        border-color: var(--border-accent);
-        background: rgba(26,26,46,0.8);
-        transform: translateY(-4px);
-    }
-    .why-card:hover::after { opacity: 1; }
-    .why-card-icon {
-        font-size: 3rem;
-        margin-bottom: 1.2rem;
-        display: block;
-        filter: drop-shadow(0 0 25px rgba(6,214,160,0.4));
-    }
-    .why-card h3 {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 1.4rem;
-        color: var(--text-primary);
-        margin: 0 0 0.8rem 0;
-        font-weight: 600;
-    }
-    .why-card p {
-        color: var(--text-secondary);
-        font-size: 0.9rem;
-        line-height: 1.6;
-        margin: 0;
-    }
-
-    /* ========== CTA SECTION ========== */
-    .cta-block {
-        background: linear-gradient(135deg, rgba(6,214,160,0.08) 0%, rgba(139,92,246,0.08) 100%);
-        border: 1px solid var(--border-accent);
-        border-radius: 28px;
-        padding: 4rem 2rem;
-        text-align: center;
-        margin: 4rem 0 2rem;
-        position: relative;
-        overflow: hidden;
-    }
-    .cta-block::before {
-        content: '';
-        position: absolute;
-        top: 0; left: 0; right: 0;
-        height: 2px;
-        background: linear-gradient(90deg, transparent, var(--accent-cyan), var(--accent-purple), transparent);
-    }
-    .cta-block h2 {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 2.8rem;
-        font-weight: 700;
-        color: var(--text-primary);
-        margin-bottom: 1rem;
-        letter-spacing: -1px;
-    }
-    .cta-block p {
-        color: var(--text-secondary);
-        font-size: 1.1rem;
-        margin-bottom: 2.5rem;
-    }
-
-    /* ========== BUTTONS ========== */
-    .stButton > button {
-        background: linear-gradient(135deg, var(--accent-cyan) 0%, var(--accent-purple) 100%);
-        color: white;
-        border: none;
-        padding: 1rem 2.8rem;
-        font-size: 0.95rem;
-        font-weight: 600;
-        border-radius: 12px;
-        cursor: pointer;
-        font-family: 'Space Grotesk', sans-serif;
-        letter-spacing: 0.3px;
-        width: 100%;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 20px rgba(6,214,160,0.3);
-        border: 1px solid rgba(255,255,255,0.1);
-    }
-    .stButton > button:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 8px 35px rgba(6,214,160,0.5), 0 0 40px rgba(139,92,246,0.3);
-        background: linear-gradient(135deg, var(--accent-purple) 0%, var(--accent-pink) 100%);
-    }
-
-    /* ========== WELCOME CARD ========== */
-    .welcome-card {
-        background: rgba(26,26,46,0.7);
-        border: 1px solid var(--border-accent);
-        border-radius: 28px;
-        padding: 3rem 2.5rem;
-        max-width: 720px;
-        margin: 0 auto;
-        backdrop-filter: blur(20px);
-    }
-    .welcome-title {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 2.5rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple));
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        text-align: center;
-        margin-bottom: 0.5rem;
-    }
-    .welcome-subtitle {
-        text-align: center;
-        color: var(--text-secondary);
-        font-size: 1rem;
-        margin-bottom: 2.5rem;
-    }
-
-    /* ========== FORM INPUTS ========== */
-    .stTextInput > label,
-    .stSelectbox > label,
-    .stTextArea > label {
-        color: var(--text-secondary) !important;
-        font-size: 0.8rem !important;
-        font-weight: 600 !important;
-        letter-spacing: 1px !important;
-        text-transform: uppercase !important;
-        font-family: 'JetBrains Mono', monospace !important;
-    }
-    .stTextInput > div > div > input,
-    .stTextArea > div > div > textarea,
-    .stSelectbox > div > div {
-        background: rgba(15,15,35,0.9) !important;
-        border: 1px solid var(--border-color) !important;
-        border-radius: 12px !important;
-        color: var(--text-primary) !important;
-        font-family: 'Inter', sans-serif !important;
-        font-size: 0.95rem !important;
-        transition: all 0.3s ease !important;
-    }
-    .stTextInput > div > div > input:focus,
-    .stTextArea > div > div > textarea:focus {
-        border-color: var(--accent-cyan) !important;
-        box-shadow: 0 0 0 3px rgba(6,214,160,0.1) !important;
-        background: rgba(15,15,35,1) !important;
-    }
-    .stSelectbox > div > div > div {
-        color: var(--text-primary) !important;
-    }
-
-    /* ========== TABS ========== */
-    .stTabs [data-baseweb="tab-list"] {
-        background: rgba(15,15,35,0.9);
-        border-radius: 16px;
-        padding: 0.5rem;
-        gap: 0.4rem;
-        border: 1px solid var(--border-color);
-    }
-    .stTabs [data-baseweb="tab"] {
-        background: transparent;
-        border: none;
-        color: var(--text-muted);
-        padding: 0.8rem 1.6rem;
-        font-size: 0.85rem;
-        font-weight: 600;
-        border-radius: 10px;
-        font-family: 'Space Grotesk', sans-serif;
-        letter-spacing: 0.3px;
-        transition: all 0.3s ease;
-    }
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, rgba(6,214,160,0.15), rgba(139,92,246,0.15)) !important;
-        color: var(--accent-cyan) !important;
-        border: 1px solid var(--border-accent) !important;
-        box-shadow: 0 0 20px rgba(6,214,160,0.2);
-    }
-
-    /* ========== USER GREETING ========== */
-    .user-greeting {
-        background: linear-gradient(135deg, rgba(6,214,160,0.1), rgba(139,92,246,0.1));
-        border: 1px solid var(--border-accent);
-        border-radius: 20px;
-        padding: 1.5rem 2rem;
-        margin-bottom: 2rem;
-        display: flex;
-        align-items: center;
-        gap: 1.5rem;
-    }
-    .greeting-avatar {
-        width: 56px; height: 56px;
-        background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple));
-        border-radius: 16px;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 1.6rem;
-        flex-shrink: 0;
-        color: white;
-        font-weight: 700;
-        font-family: 'Space Grotesk', sans-serif;
-        box-shadow: 0 4px 20px rgba(6,214,160,0.3);
-    }
-    .greeting-text h3 {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 1.5rem;
-        color: var(--text-primary);
-        margin: 0 0 0.3rem 0;
-        font-weight: 600;
-    }
-    .greeting-text p {
-        color: var(--text-secondary);
-        font-size: 0.85rem;
-        margin: 0;
-    }
-
-    /* ========== MAIN CARD ========== */
-    .glass-card {
-        background: rgba(26,26,46,0.6);
-        border: 1px solid var(--border-color);
-        border-radius: 24px;
-        padding: 2.5rem;
-        margin-bottom: 2rem;
-        backdrop-filter: blur(15px);
-    }
-    .glass-card h2 {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 1.8rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple));
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin-top: 0;
-        letter-spacing: -0.5px;
-    }
-
-    /* ========== FEATURE SELECTOR ========== */
-    .feature-selector {
-        background: rgba(15,15,35,0.7);
-        border: 1px solid var(--border-accent);
-        border-radius: 16px;
-        padding: 1.5rem;
-        margin: 1.5rem 0;
-    }
-    .feature-selector h3 {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 1.2rem;
-        color: var(--accent-cyan);
-        margin: 0 0 1rem 0;
-        font-weight: 600;
-    }
-
-    /* ========== TEMPERATURE SLIDER ========== */
-    .slider-container {
-        background: rgba(15,15,35,0.7);
-        border: 1px solid var(--border-color);
-        border-radius: 20px;
-        padding: 2rem;
-        margin: 1.5rem 0;
-    }
-    .stSlider > div > div > div > div {
-        background: linear-gradient(90deg, var(--accent-cyan), var(--accent-purple), var(--accent-pink)) !important;
-        height: 8px !important;
-        border-radius: 10px !important;
-    }
-    .stSlider > div > div > div > div > div {
-        background: white !important;
-        border: 3px solid var(--accent-cyan) !important;
-        width: 24px !important;
-        height: 24px !important;
-        box-shadow: 0 2px 15px rgba(6,214,160,0.6) !important;
-    }
-    .stSlider > label {
-        color: var(--text-secondary) !important;
-        font-size: 0.8rem !important;
-        letter-spacing: 1px !important;
-        text-transform: uppercase !important;
-        font-family: 'JetBrains Mono', monospace !important;
-    }
-
-    /* ========== RESULT BOX ========== */
-    .result-box {
-        background: rgba(15,15,35,0.9);
-        border: 1px solid var(--border-color);
-        border-radius: 24px;
-        padding: 2.5rem;
-        backdrop-filter: blur(20px);
-    }
-    .result-box h3 {
-        font-family: 'Space Grotesk', sans-serif;
-        color: var(--accent-cyan);
-        font-size: 1.8rem;
-        margin-top: 0;
-        font-weight: 700;
-    }
-    .result-text {
-        line-height: 2;
-        color: var(--text-secondary);
-        font-family: 'Inter', sans-serif;
-        font-size: 1rem;
-    }
-    .result-text h2 {
-        background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple));
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        font-family: 'Space Grotesk', sans-serif;
-        margin-top: 2rem;
-        margin-bottom: 1rem;
-        font-size: 1.7rem;
-        font-weight: 700;
-    }
-    .result-text h3 {
-        color: var(--accent-purple);
-        font-family: 'Space Grotesk', sans-serif;
-        margin-top: 1.5rem;
-        margin-bottom: 0.8rem;
-        font-size: 1.35rem;
-        font-weight: 600;
-    }
-    .result-text strong { color: var(--accent-cyan); font-weight: 600; }
-    .result-text ul, .result-text li { margin: 0.5rem 0; line-height: 1.8; }
-
-    /* ========== SECTION LABELS ========== */
-    .section-eyebrow {
-        font-family: 'JetBrains Mono', monospace;
-        font-size: 0.7rem;
-        color: var(--accent-cyan);
-        letter-spacing: 3px;
-        text-transform: uppercase;
-        margin-bottom: 0.8rem;
-        display: block;
-    }
-    .section-title {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 2.2rem;
-        font-weight: 700;
-        color: var(--text-primary);
-        margin: 0 0 0.8rem 0;
-    }
-
-    /* ========== INSIGHTS ========== */
-    .insight-header {
-        background: linear-gradient(135deg, rgba(6,214,160,0.12), rgba(139,92,246,0.12));
-        border: 1px solid var(--border-accent);
-        border-radius: 20px;
-        padding: 2rem;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-
-    /* ========== TIMELINE PLANNER ========== */
-    .timeline-card {
-        background: rgba(26,26,46,0.6);
-        border: 1px solid var(--border-color);
-        border-radius: 20px;
-        padding: 1.5rem;
-        margin-bottom: 1rem;
-        position: relative;
-        transition: all 0.3s ease;
-    }
-    .timeline-card:hover {
-        border-color: var(--border-accent);
-        background: rgba(26,26,46,0.9);
-        box-shadow: 0 4px 20px rgba(6,214,160,0.1);
-    }
-    .timeline-phase-label {
-        font-family: 'JetBrains Mono', monospace;
-        font-size: 0.7rem;
-        color: var(--accent-cyan);
-        letter-spacing: 2px;
-        text-transform: uppercase;
-        margin-bottom: 0.5rem;
-    }
-    .timeline-phase-title {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 1.35rem;
-        color: var(--accent-cyan);
-        margin: 0 0 0.5rem 0;
-        font-weight: 600;
-    }
-    .timeline-duration-badge {
-        display: inline-block;
-        background: linear-gradient(135deg, rgba(6,214,160,0.15), rgba(139,92,246,0.15));
-        border: 1px solid var(--border-accent);
-        color: var(--accent-cyan);
-        padding: 0.3rem 0.8rem;
-        border-radius: 25px;
-        font-size: 0.75rem;
-        font-family: 'JetBrains Mono', monospace;
-        margin-bottom: 0.8rem;
-    }
-    .phase-task {
-        background: rgba(15,15,35,0.6);
-        border-left: 3px solid var(--accent-purple);
-        padding: 0.7rem 1.1rem;
-        border-radius: 0 10px 10px 0;
-        margin: 0.5rem 0;
-        color: var(--text-secondary);
-        font-size: 0.88rem;
-    }
-    .priority-high { border-left-color: var(--accent-pink); }
-    .priority-medium { border-left-color: var(--accent-orange); }
-    .priority-low { border-left-color: var(--accent-cyan); }
-    .timeline-connector {
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        margin: 0.5rem 0;
-        color: var(--text-muted);
-        font-size: 1.5rem;
-    }
-    .milestone-dot {
-        width: 14px; height: 14px;
-        background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple));
-        border-radius: 50%;
-        box-shadow: 0 0 15px rgba(6,214,160,0.6);
-        display: inline-block;
-        margin-right: 0.5rem;
-        flex-shrink: 0;
-    }
-    .risk-badge {
-        display: inline-block;
-        padding: 0.25rem 0.7rem;
-        border-radius: 25px;
-        font-size: 0.7rem;
-        font-family: 'JetBrains Mono', monospace;
-        margin-left: 0.5rem;
-        font-weight: 600;
-    }
-    .risk-high { background: rgba(236,72,153,0.2); color: var(--accent-pink); border: 1px solid rgba(236,72,153,0.4); }
-    .risk-medium { background: rgba(249,115,22,0.2); color: var(--accent-orange); border: 1px solid rgba(249,115,22,0.4); }
-    .risk-low { background: rgba(6,214,160,0.2); color: var(--accent-cyan); border: 1px solid rgba(6,214,160,0.4); }
-
-    .summary-stat {
-        background: rgba(15,15,35,0.9);
-        border: 1px solid var(--border-color);
-        border-radius: 16px;
-        padding: 1.5rem;
-        text-align: center;
-    }
-    .summary-stat .stat-value {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 2.5rem;
-        background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple));
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        font-weight: 700;
-        line-height: 1;
-        margin-bottom: 0.4rem;
-    }
-    .summary-stat .stat-label {
-        font-size: 0.7rem;
-        color: var(--text-muted);
-        text-transform: uppercase;
-        letter-spacing: 2px;
-        font-family: 'JetBrains Mono', monospace;
-    }
-
-    /* ========== QUIZ (FEATURE GALLERY) ========== */
-    .quiz-header {
-        background: linear-gradient(135deg, rgba(26,26,46,0.9), rgba(15,15,35,0.95));
-        border: 1px solid var(--border-accent);
-        border-radius: 20px;
-        padding: 1.5rem 2rem;
-        margin-bottom: 1.5rem;
-    }
-    .quiz-header h3 {
-        font-family: 'Space Grotesk', sans-serif;
-        color: var(--accent-cyan);
-        font-size: 1.5rem;
-        margin: 0 0 0.3rem 0;
-        font-weight: 700;
-    }
-    .quiz-header p {
-        color: var(--text-secondary);
-        font-size: 0.88rem;
-        margin: 0;
-    }
-
-    /* ========== RADIO BUTTONS ========== */
-    .stRadio > div > label {
-        background: rgba(26,26,46,0.6) !important;
-        border: 1px solid var(--border-color) !important;
-        border-radius: 12px !important;
-        padding: 0.9rem 1.3rem !important;
-        color: var(--text-primary) !important;
-        transition: all 0.2s ease !important;
-        margin-bottom: 0.5rem !important;
-        display: block !important;
-    }
-    .stRadio > div > label:hover {
-        border-color: var(--border-accent) !important;
-        background: rgba(26,26,46,0.9) !important;
-        box-shadow: 0 0 15px rgba(6,214,160,0.1);
-    }
-
-    /* ========== FILE UPLOADER ========== */
-    .stFileUploader > div {
-        background: rgba(15,15,35,0.7) !important;
-        border: 1px dashed var(--border-accent) !important;
-        border-radius: 16px !important;
-    }
-
-    /* ========== SLIDER MULTISELECT ========== */
-    .stMultiSelect > div > div {
-        background: rgba(15,15,35,0.9) !important;
-        border: 1px solid var(--border-color) !important;
-        border-radius: 12px !important;
-    }
-    .stMultiSelect > div > div > div {
-        color: var(--text-primary) !important;
-    }
-
-    /* ========== NUMBER INPUT ========== */
-    .stNumberInput > div > div > input {
-        background: rgba(15,15,35,0.9) !important;
-        border: 1px solid var(--border-color) !important;
-        border-radius: 12px !important;
-        color: var(--text-primary) !important;
-    }
-
-    /* ========== FEEDBACK FORM ========== */
-    .feedback-modal-inner {
-        background: rgba(26,26,46,0.95);
-        border: 1px solid var(--border-accent);
-        border-radius: 28px;
-        padding: 3rem 2.5rem;
-        backdrop-filter: blur(20px);
-        margin: 2rem 0;
-    }
-
-    /* ========== FOOTER ========== */
-    .site-footer {
-        border-top: 1px solid var(--border-color);
-        padding: 2rem 1rem;
-        text-align: center;
-        margin-top: 4rem;
-        color: var(--text-muted);
-        font-size: 0.82rem;
-        font-family: 'JetBrains Mono', monospace;
-    }
-    .site-footer span {
-        background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple));
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        font-weight: 600;
-    }
-
-    /* ========== MISC ========== */
-    .divider-gold {
-        border: none;
-        height: 2px;
-        background: linear-gradient(90deg, transparent, var(--border-accent), transparent);
-        margin: 2rem 0;
-    }
-    .badge-teal {
-        display: inline-block;
-        background: rgba(6,214,160,0.15);
-        border: 1px solid rgba(6,214,160,0.4);
-        color: var(--accent-cyan);
-        padding: 0.3rem 0.8rem;
-        border-radius: 25px;
-        font-size: 0.75rem;
-        font-family: 'JetBrains Mono', monospace;
-        letter-spacing: 0.5px;
-        font-weight: 600;
-    }
-    .badge-gold {
-        display: inline-block;
-        background: rgba(139,92,246,0.15);
-        border: 1px solid rgba(139,92,246,0.4);
-        color: var(--accent-purple);
-        padding: 0.3rem 0.8rem;
-        border-radius: 25px;
-        font-size: 0.75rem;
-        font-family: 'JetBrains Mono', monospace;
-        letter-spacing: 0.5px;
-        font-weight: 600;
-    }
-
-    /* Streamlit specific overrides */
-    [data-testid="stMarkdownContainer"] p { color: var(--text-secondary); }
-    div[data-testid="metric-container"] {
-        background: rgba(26,26,46,0.6);
-        border: 1px solid var(--border-color);
-        border-radius: 16px;
-        padding: 1rem;
-    }
-    .stSelectbox svg { color: var(--accent-cyan) !important; }
-    .stSpinner { color: var(--accent-cyan) !important; }
-
-</style>
-""", unsafe_allow_html=True)
-
-# ==================== SESSION STATE ====================
-if 'page' not in st.session_state:
-    st.session_state.page = 'landing'
-if 'user_data' not in st.session_state:
-    st.session_state.user_data = {}
-if 'result_text' not in st.session_state:
-    st.session_state.result_text = ""
-
-# ==================== FEATURE DESCRIPTIONS ====================
-feature_descriptions = {
-    'period': 'Expert restoration guidance for Baroque and Renaissance artworks using historically accurate techniques',
-    'cultural': 'Restore and enhance traditional patterns from Mughal, Islamic, Celtic, Asian, and indigenous arts',
-    'sculptural': 'Reconstruct eroded or damaged features in sculptures, statues, and three-dimensional artifacts',
-    'textile': 'Expert restoration for tapestries, embroidery, historical fabrics, and woven artifacts',
-    'abstract': 'Restore contemporary, abstract, expressionist, and modern artworks',
-    'manuscript': 'Restore illuminated manuscripts, scrolls, codices, and historical documents',
-    'mural': 'Restore wall paintings, cave art, frescoes, and architectural murals',
-    'ceramic': 'Restore pottery, porcelain, ceramic vessels, and glazed artifacts',
-    'symbol': 'Decode and restore symbolic elements, religious imagery, inscriptions, and cultural icons',
-    'educational': 'Create engaging museum descriptions, exhibition content, and educational materials'
-}
-
-def render_header():
-    st.markdown("""
-    <div class="site-header">
-        <div>
-            <div class="header-logo">◆ ArtRestorer AI</div>
-            <div class="header-tagline">Cultural Heritage · Digital Preservation</div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-# ==================== LANDING PAGE ====================
-if st.session_state.page == 'landing':
-    render_header()
-
-    # Hero
-    st.markdown("""
-    <div class="hero-wrapper">
-        <div class="hero-bg-orb hero-bg-orb-1"></div>
-        <div class="hero-bg-orb hero-bg-orb-2"></div>
-        <div class="hero-eyebrow">AI · Heritage · Innovation</div>
-        <h1 class="hero-title">Restore the Past,<br><span class="hero-title-accent">Shape the Future</span></h1>
-        <div class="hero-divider"></div>
-        <p class="hero-subtitle">
-            Cutting-edge AI technology meets timeless artistic tradition. Expert guidance for conservators, curators, historians and collectors worldwide.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Features label
-    st.markdown('<p class="features-label">━━━ Core Capabilities ━━━</p>', unsafe_allow_html=True)
-
-    features_showcase = [
-        {"icon": "🎭", "title": "Period-Specific Restoration", "desc": "Baroque, Renaissance, Gothic — historically accurate techniques"},
-        {"icon": "🕌", "title": "Cultural Pattern Enhancement", "desc": "Mughal, Islamic, Celtic and indigenous design restoration"},
-        {"icon": "🗿", "title": "Sculptural Reconstruction", "desc": "3D artifacts, statues — detailed erosion and loss analysis"},
-        {"icon": "🧵", "title": "Textile & Tapestry Repair", "desc": "Historical fabrics, embroidery and woven artifact restoration"},
-        {"icon": "🎨", "title": "Modern Art Recovery", "desc": "Abstract and contemporary works, innovative approaches"},
-        {"icon": "📜", "title": "Manuscript Conservation", "desc": "Ancient scrolls, illuminated texts and fragile documents"},
-        {"icon": "🏛️", "title": "Mural & Fresco Revival", "desc": "Cave paintings, frescoes and architectural murals"},
-        {"icon": "🏺", "title": "Ceramic Restoration", "desc": "Pottery, porcelain and glazed artifact reconstruction"},
-        {"icon": "🔯", "title": "Symbol Interpretation", "desc": "Religious imagery, inscriptions and cultural iconography"}
-    ]
-
-    for i in range(0, len(features_showcase), 3):
-        cols = st.columns(3, gap="medium")
-        for j in range(3):
-            if i + j < len(features_showcase):
-                f = features_showcase[i + j]
-                with cols[j]:
-                    st.markdown(f"""
-                    <div class="feature-card-dark">
-                        <span class="feature-icon-dark">{f['icon']}</span>
-                        <h3>{f['title']}</h3>
-                        <p>{f['desc']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-    # Why Choose
-    st.markdown('<div style="margin-top: 4rem;"></div>', unsafe_allow_html=True)
-    st.markdown("""
-    <p class="features-label">━━━ Why ArtRestorer AI ━━━</p>
-    """, unsafe_allow_html=True)
-
-    c1, c2, c3 = st.columns(3, gap="medium")
-    with c1:
-        st.markdown("""
-        <div class="why-card">
-            <span class="why-card-icon">🔬</span>
-            <h3>Expert Analysis</h3>
-            <p>AI-powered insights rooted in historical research and global conservation best practices.</p>
-        </div>
-        """, unsafe_allow_html=True)
-    with c2:
-        st.markdown("""
-        <div class="why-card">
-            <span class="why-card-icon">⚡</span>
-            <h3>Instant Guidance</h3>
-            <p>Comprehensive restoration analysis delivered in seconds, not days of manual research.</p>
-        </div>
-        """, unsafe_allow_html=True)
-    with c3:
-        st.markdown("""
-        <div class="why-card">
-            <span class="why-card-icon">🌍</span>
-            <h3>Global Heritage</h3>
-            <p>Deep support for diverse cultural traditions spanning every continent and era.</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    # CTA
-    st.markdown("""
-    <div class="cta-block">
-        <h2>Begin Your Restoration Journey</h2>
-        <p>Join conservators and art enthusiasts worldwide in preserving cultural heritage.</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    col1, col2, col3 = st.columns([1, 1, 1])
-    with col2:
-        if st.button("Enter Application →", key="landing_continue"):
-            st.session_state.page = 'welcome'
-            st.rerun()
-
-    st.markdown("""
-    <div class="site-footer">
-        <span>ArtRestorer AI</span> · Powered by OpenAI · Cultural Heritage Preservation
-    </div>
-    """, unsafe_allow_html=True)
-
-
-# ==================== WELCOME PAGE ====================
-elif st.session_state.page == 'welcome':
-    render_header()
-
-    st.markdown('<div style="margin: 2rem 0;"></div>', unsafe_allow_html=True)
-
-    st.markdown("""
-    <div class="welcome-card">
-        <div class="welcome-title">Welcome</div>
-        <p class="welcome-subtitle">Tell us about yourself to personalise your experience</p>
-    """, unsafe_allow_html=True)
-
-    user_name = st.text_input("Your Name", placeholder="Enter your full name", key="name_input")
-
-    artwork_type = st.selectbox(
-        "Artwork Type",
-        ["", "Painting (Oil, Acrylic, Watercolor)", "Sculpture (Stone, Bronze, Wood)",
-         "Textile (Tapestry, Fabric, Embroidery)", "Manuscript (Scrolls, Books, Documents)",
-         "Mural/Fresco (Wall Painting)", "Ceramic/Pottery (Vessels, Tiles)",
-         "Mixed Media/Contemporary Art", "Other Heritage Artifact"],
-        key="artwork_input"
-    )
-
-    user_role = st.selectbox(
-        "Your Role",
-        ["", "Professional Conservator/Restorer", "Museum Curator", "Art Historian/Researcher",
-         "Student (Art/Conservation)", "Private Collector", "Artist",
-         "Art Enthusiast/Hobbyist", "Educator/Teacher"],
-        key="role_input"
-    )
-
-    user_goal = st.selectbox(
-        "Primary Goal",
-        ["", "Physical restoration guidance", "Digital restoration/reconstruction",
-         "Artwork analysis and documentation", "Educational content creation",
-         "Academic research", "Preventive conservation", "Exhibition planning"],
-        key="goal_input"
-    )
-
-    st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
-
-    if st.button("Begin Analysis →", key="begin_btn"):
-        if user_name and artwork_type and user_role and user_goal:
-            st.session_state.user_data = {
-                'name': user_name,
-                'artwork_type': artwork_type,
-                'role': user_role,
-                'goal': user_goal
-            }
-            st.session_state.page = 'main'
-            st.rerun()
-        else:
-            st.error("Please complete all fields to continue.")
-
-    st.markdown('</div>', unsafe_allow_html=True)
-
-
-# ==================== MAIN APPLICATION ====================
-elif st.session_state.page == 'main':
-    render_header()
-    st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
-
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "🖼️  Restoration Assistant",
-        "📚  Feature Gallery",
-        "🏛️  Cultural Insights",
-        "🗓️  Timeline Planner"
-    ])
-
-    # ==================== TAB 1: RESTORATION ASSISTANT ====================
-    with tab1:
-        user = st.session_state.user_data
-        initials = user['name'][0].upper() if user.get('name') else "?"
-        st.markdown(f"""
-        <div class="user-greeting">
-            <div class="greeting-avatar">{initials}</div>
-            <div class="greeting-text">
-                <h3>Hello, {user.get('name', '')} 👋</h3>
-                <p>{user.get('artwork_type', '')} · {user.get('role', '')}</p>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown('<h2>Art Restoration Analysis</h2>', unsafe_allow_html=True)
-
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown('<span class="section-eyebrow">Upload Image (Optional)</span>', unsafe_allow_html=True)
-            uploaded_file = st.file_uploader("", type=['png', 'jpg', 'jpeg'], key="image_upload", label_visibility="collapsed")
-            if uploaded_file is not None:
-                st.image(uploaded_file, caption="Uploaded Artwork", use_container_width=True)
-
-        with col2:
-            artwork_description = st.text_area(
-                "Artwork Description",
-                placeholder="Describe the artwork: medium, period, visible damage, dimensions, provenance...",
-                height=200,
-                key="description_input"
-            )
-
-        # Feature Selector
-        st.markdown('<div class="feature-selector">', unsafe_allow_html=True)
-        st.markdown('<h3>Select Analysis Type</h3>', unsafe_allow_html=True)
-        feature_select = st.selectbox(
-            "Analysis Type",
-            [
-                "1. 🎭 Period-Specific Restoration (Baroque/Renaissance)",
-                "2. 🕌 Cultural Pattern Enhancement (Traditional Arts)",
-                "3. 🗿 Sculptural Reconstruction",
-                "4. 🧵 Textile & Tapestry Repair",
-                "5. 🎨 Abstract & Modern Art Recovery",
-                "6. 📜 Ancient Manuscript Conservation",
-                "7. 🏛️ Mural & Fresco Revival",
-                "8. 🏺 Ceramic & Pottery Reconstruction",
-                "9. 🔯 Symbol & Iconography Interpretation",
-                "10. 🎓 Educational Content Generation"
-            ],
-            key="feature_select",
-            label_visibility="collapsed"
-        )
-        feature_key = ['period', 'cultural', 'sculptural', 'textile', 'abstract', 'manuscript', 'mural', 'ceramic', 'symbol', 'educational'][int(feature_select[0]) - 1]
-        st.markdown(f'<p style="color: var(--text-secondary); font-size: 0.88rem; font-style: italic; margin-top: 0.5rem;">{feature_descriptions[feature_key]}</p>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-
-        col3, col4, col5 = st.columns(3)
-        with col3:
-            art_style_options = [
-                "Baroque", "Renaissance", "Gothic", "Neoclassical", "Rococo",
-                "Romantic", "Impressionist", "Expressionist", "Art Deco", "Art Nouveau",
-                "Indian Mughal", "Indian Rajput", "Indian Pahari", "Indian Madhubani",
-                "Persian Miniature", "Islamic Geometric", "Byzantine", "Japanese Ukiyo-e",
-                "Chinese Ming Dynasty", "Aboriginal", "Egyptian", "Greek/Roman Classical"
-            ]
-            art_style = st.selectbox("Art Style / Period", [""] + art_style_options, key="style_input")
-
-        with col4:
-            damage_type_options = [
-                "Water damage/stains", "Fire damage/smoke residue",
-                "Fading from sunlight/UV exposure", "Erosion/weathering",
-                "Cracks/structural damage", "Flaking/peeling paint",
-                "Mold/biological growth", "Scratches/surface abrasions",
-                "Missing sections/losses", "Discoloration/yellowing",
-                "Torn fabric/textile damage", "Broken/fragmented pieces",
-                "Oxidation/corrosion", "Insect damage", "Previous poor restoration"
-            ]
-            damage_type = st.selectbox("Damage Type", [""] + damage_type_options, key="damage_input")
-
-        with col5:
-            cultural_context_options = [
-                "Italian Renaissance", "French Baroque", "Spanish Colonial",
-                "Flemish/Dutch", "British Victorian", "Indian Mughal",
-                "Indian Rajput", "Indian Temple Art", "Persian/Iranian",
-                "Ottoman Turkish", "Chinese Imperial", "Japanese Edo Period",
-                "Egyptian Pharaonic", "Greek Classical", "Roman Imperial",
-                "Byzantine Eastern Orthodox", "African Tribal", "Native American"
-            ]
-            cultural_context = st.selectbox("Cultural Context", [""] + cultural_context_options, key="context_input")
-
-        # Temperature Slider
-        st.markdown('<div class="slider-container">', unsafe_allow_html=True)
-        st.markdown('<span class="section-eyebrow">AI Creativity Level</span>', unsafe_allow_html=True)
-
-        temperature = st.slider("Creativity Level", 0.0, 1.0, 0.6, 0.05, key="temp_slider", label_visibility="collapsed")
-
-        if temperature <= 0.3:
-            ind_color = "#60a5fa"; ind_icon = "🎯"; ind_title = "Highly Conservative"; ind_sub = "Strict Historical Accuracy"
-            desc = "Ultra-precise restoration focusing purely on documented historical evidence and proven conservation techniques."
-        elif temperature <= 0.5:
-            ind_color = "#93c5fd"; ind_icon = "📚"; ind_title = "Conservative & Methodical"; ind_sub = "Evidence-Based Approach"
-            desc = "Careful restoration based on historical research and comparative analysis with minimal speculation."
-        elif temperature <= 0.7:
-            ind_color = "#06d6a0"; ind_icon = "⚖️"; ind_title = "Balanced & Professional"; ind_sub = "Art + Science"
-            desc = "Balanced approach combining historical accuracy with thoughtful creative suggestions. Ideal for most projects."
-        elif temperature <= 0.85:
-            ind_color = "#8b5cf6"; ind_icon = "🎨"; ind_title = "Creative & Exploratory"; ind_sub = "Artistic Interpretation"
-            desc = "Imaginative restoration suggestions exploring multiple creative possibilities while respecting historical context."
-        else:
-            ind_color = "#ec4899"; ind_icon = "✨"; ind_title = "Highly Creative"; ind_sub = "Bold Artistic Vision"
-            desc = "Maximum creativity with bold artistic interpretations. Generates innovative ideas that push boundaries."
-
-        st.markdown(f"""
-        <div style="background: rgba(15,15,35,0.9); border: 1px solid {ind_color}40; border-radius: 16px; padding: 1.5rem 2rem; margin-top: 1.5rem; display: flex; align-items: center; gap: 1.5rem;">
-            <div style="font-size: 2.5rem; flex-shrink: 0;">{ind_icon}</div>
-            <div>
-                <div style="font-family: 'Space Grotesk', sans-serif; font-size: 1.3rem; color: {ind_color}; font-weight: 600;">{ind_title} <span style="font-size: 0.75rem; font-family: 'JetBrains Mono', monospace; letter-spacing: 1px; opacity: 0.7;">{ind_sub}</span></div>
-                <div style="color: var(--text-secondary); font-size: 0.88rem; margin-top: 0.3rem; line-height: 1.5;">{desc}</div>
-            </div>
-            <div style="margin-left: auto; font-family: 'JetBrains Mono', monospace; font-size: 1.6rem; color: {ind_color}; font-weight: 600; flex-shrink: 0;">{temperature:.2f}</div>
-        </div>
-        """, unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-
-        # Generate Button
-        st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
-        if st.button("Generate AI Restoration Analysis →", key="generate_btn"):
-            if artwork_description:
-                with st.spinner("Analysing artwork and generating expert restoration guidance..."):
-                    import time
-                    time.sleep(3)
-                    st.session_state.page = 'results'
-                    creativity_level = ["highly conservative", "conservative and methodical", "balanced and professional", "creative and exploratory", "highly creative and innovative"][min(int(temperature / 0.2), 4)]
-
-                    st.session_state.result_text = f"""COMPREHENSIVE RESTORATION ANALYSIS
-══════════════════════════════════════════════════════════
-
-ARTWORK DETAILS:
-{artwork_description}
-
-STYLE/PERIOD: {art_style or 'Not specified'}
-DAMAGE TYPE: {damage_type or 'general wear'}
-CULTURAL CONTEXT: {cultural_context or 'Not specified'}
-ANALYSIS TYPE: {feature_select}
-AI CREATIVITY LEVEL: {temperature} ({creativity_level})
-
-══════════════════════════════════════════════════════════
-
-EXPERT RESTORATION GUIDANCE:
-
-1. HISTORICAL CONTEXT & SIGNIFICANCE
-
-   Based on the provided description and the {art_style or 'specified'} period, this artwork represents a significant example of its time. The {cultural_context or 'general'} cultural context suggests traditional techniques and materials that were commonly employed during this era.
-
-2. CONDITION ASSESSMENT
-
-   The {damage_type or 'general wear'} presents specific challenges that require careful consideration:
-
-   • Primary concerns include structural integrity and aesthetic coherence
-   • Surface analysis reveals patterns consistent with environmental exposure
-   • Original materials and techniques must be preserved where possible
-   • Documentation of current state is essential before intervention
-
-3. RESTORATION METHODOLOGY
-
-   Step-by-step approach for conservation:
-
-   a) DOCUMENTATION PHASE
-      - Comprehensive photography (visible light, UV, infrared)
-      - Detailed condition mapping
-      - Material analysis and identification
-      - Historical research and comparative studies
-
-   b) STABILIZATION PHASE
-      - Consolidation of loose or flaking areas
-      - Structural support where needed
-      - Environmental stabilization
-      - Protection from further deterioration
-
-   c) CLEANING PHASE
-      - Surface cleaning using appropriate methods
-      - Removal of discolored varnish or overpainting
-      - pH testing and adjustment
-      - Gradual approach with constant monitoring
-
-   d) RESTORATION PHASE
-      - Loss compensation using reversible materials
-      - Color matching to original palette
-      - Texture recreation matching original techniques
-      - Integration with surrounding original material
-
-4. MATERIALS & TECHNIQUES
-
-   Recommended conservation-grade materials:
-
-   • Adhesives: Reversible synthetic polymers
-   • Consolidants: Tested for compatibility with original materials
-   • Inpainting media: Watercolors or conservation acrylics
-   • Protective coatings: UV-filtering, breathable varnishes
-
-   Traditional techniques:
-   • Period-appropriate brushwork patterns
-   • Layering methodology consistent with {art_style or 'period'} style
-   • Color mixing using historically accurate pigment knowledge
-
-5. CULTURAL & HISTORICAL CONSIDERATIONS
-
-   Respect for {cultural_context or "the artwork's"} traditions:
-   • Consultation with cultural heritage experts
-   • Understanding of symbolic and religious significance
-   • Preservation of authentic character and patina
-   • Balance between restoration and historical integrity
-
-6. TECHNICAL SPECIFICATIONS
-
-   Color Palette Recommendations:
-   • Earth tones: Raw umber, burnt sienna, yellow ochre
-   • Primary colors adjusted for period accuracy
-   • Consideration of natural pigment aging
-
-   Application Techniques:
-   • Brushstroke direction following original patterns
-   • Layering sequence respecting traditional methods
-   • Glazing techniques for depth and luminosity
-
-7. CONSERVATION CHALLENGES & SOLUTIONS
-
-   Challenge 1: {damage_type or 'damage'} extent
-   Solution: Gradual intervention with regular assessment
-
-   Challenge 2: Material compatibility
-   Solution: Comprehensive testing on sample areas
-
-   Challenge 3: Color matching aged surfaces
-   Solution: Create reference samples and account for natural aging
-
-   Challenge 4: Maintaining authenticity
-   Solution: Document all interventions, use distinguishable but harmonious restoration
-
-8. PREVENTIVE CONSERVATION
-
-   Environmental Controls:
-   • Temperature: 18-22°C (64-72°F)
-   • Relative humidity: 45-55%
-   • Light levels: <150 lux for sensitive materials
-   • UV filtration on all light sources
-
-   Handling & Display:
-   • Proper mounting and support systems
-   • Protection from physical contact
-   • Regular monitoring and condition checks
-
-9. ETHICAL CONSIDERATIONS
-
-   Following international conservation ethics (ICOM-CC, AIC):
-   • Minimal intervention principle
-   • Reversibility of all treatments
-   • Documentation of all procedures
-   • Respect for original artist's intent
-
-10. DOCUMENTATION & REPORTING
-
-    Essential records to maintain:
-    • Before, during, and after treatment photographs
-    • Written treatment reports
-    • Material samples and analysis results
-    • Conservation decision rationale
-
-══════════════════════════════════════════════════════════
-
-CONCLUSION:
-
-This restoration project requires a balanced approach combining historical accuracy, technical expertise, and cultural sensitivity. The {damage_type or 'damage'} can be addressed through systematic conservation methods while preserving the artwork's integrity.
-
-All treatments should prioritize long-term stability and maintain the artwork's research and cultural value.
-
-══════════════════════════════════════════════════════════
-
-IMPORTANT DISCLAIMER:
-This analysis is advisory only. All physical restoration work must be performed by certified professional conservators following appropriate institutional guidelines.
-
-══════════════════════════════════════════════════════════
-"""
-                    st.rerun()
-            else:
-                st.error("Please provide an artwork description to proceed.")
-
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    # ==================== TAB 2: FEATURE GALLERY ====================
-    with tab2:
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown('<span class="section-eyebrow">All Capabilities</span>', unsafe_allow_html=True)
-        st.markdown('<h2 style="font-family: \'Space Grotesk\', sans-serif; font-size: 2rem; font-weight: 700; margin-top: 0;">Feature Gallery</h2>', unsafe_allow_html=True)
-
-        features = [
-            {"icon": "🎭", "title": "Period-Specific Restoration",
-             "desc": "Expert restoration guidance for Baroque and Renaissance artworks using historically accurate techniques",
-             "cases": ["Renaissance portraits with sfumato technique", "Baroque paintings with dramatic chiaroscuro", "Dutch Golden Age realistic lighting", "Rococo delicate pastels and gold leaf"]},
-            {"icon": "🕌", "title": "Cultural Pattern Enhancement",
-             "desc": "Restore and enhance traditional patterns from Mughal, Islamic, Celtic, Asian, and indigenous arts",
-             "cases": ["Mughal miniature floral borders", "Islamic geometric tessellations", "Celtic knotwork patterns", "Japanese ukiyo-e wave patterns"]},
-            {"icon": "🗿", "title": "Sculptural Reconstruction",
-             "desc": "Reconstruct eroded or damaged features in sculptures, statues, and three-dimensional artifacts",
-             "cases": ["Greek/Roman marble statues", "Indian temple sculptures", "Egyptian hieroglyphic carvings", "Mayan stele reconstructions"]},
-            {"icon": "🧵", "title": "Textile & Tapestry Repair",
-             "desc": "Expert restoration for tapestries, embroidery, historical fabrics, and woven artifacts",
-             "cases": ["Medieval tapestries (Bayeux style)", "Chinese silk embroidery", "Indian Banarasi sarees", "Persian carpets"]},
-            {"icon": "🎨", "title": "Abstract & Modern Art Recovery",
-             "desc": "Restore contemporary, abstract, expressionist, and modern artworks",
-             "cases": ["Pollock drip paintings", "Rothko color fields", "Abstract impressionism texture recovery", "Minimalist hard-edge works"]},
-            {"icon": "📜", "title": "Ancient Manuscript Conservation",
-             "desc": "Restore illuminated manuscripts, scrolls, codices, and historical documents",
-             "cases": ["Book of Kells style illuminations", "Arabic/Persian calligraphy scrolls", "Sanskrit palm leaf manuscripts", "Dead Sea Scrolls preservation"]},
-            {"icon": "🏛️", "title": "Mural & Fresco Revival",
-             "desc": "Restore wall paintings, cave art, frescoes, and architectural murals",
-             "cases": ["Ajanta/Ellora cave paintings", "Roman Pompeii frescoes", "Mexican muralism (Diego Rivera style)", "Aboriginal rock art"]},
-            {"icon": "🏺", "title": "Ceramic & Pottery Reconstruction",
-             "desc": "Restore pottery, porcelain, ceramic vessels, and glazed artifacts",
-             "cases": ["Chinese Ming dynasty porcelain", "Greek amphoras and pottery", "Native American pottery", "Japanese raku ceramics"]},
-            {"icon": "🔯", "title": "Symbol & Iconography Interpretation",
-             "desc": "Decode and restore symbolic elements, religious imagery, inscriptions, and cultural icons",
-             "cases": ["Egyptian hieroglyphics interpretation", "Christian iconography (Byzantine style)", "Hindu temple symbolism", "Mayan glyph decoding"]},
-            {"icon": "🎓", "title": "Educational Content Generation",
-             "desc": "Create engaging museum descriptions, exhibition content, and educational materials",
-             "cases": ["Museum placard content", "Virtual exhibition descriptions", "Educational tour scripts", "Accessibility-friendly art explanations"]}
-        ]
-
-        def safe_rerun():
-            if hasattr(st, 'experimental_rerun'):
-                try:
-                    st.experimental_rerun()
-                    return
-                except Exception:
-                    pass
-            try:
-                from streamlit.runtime.scriptrunner import RerunException
-                raise RerunException()
-            except Exception:
-                st.session_state['_rerun_trigger'] = not st.session_state.get('_rerun_trigger', False)
-
-        cases = []
-        for f in features:
-            for case in f['cases']:
-                cases.append({"case": case, "feature": f['title']})
-
-        import random
-
-        if 'quiz_questions' not in st.session_state:
-            pool = cases.copy()
-            num_q = min(6, max(3, len(pool)))
-            sample = random.sample(pool, num_q)
-            titles = [f['title'] for f in features]
-            questions = []
-            for s in sample:
-                correct = s['feature']
-                wrongs = [t for t in titles if t != correct]
-                choices = random.sample(wrongs, min(3, len(wrongs))) + [correct]
-                random.shuffle(choices)
-                questions.append({'prompt': s['case'], 'correct': correct, 'choices': choices})
-            st.session_state.quiz_questions = questions
-            st.session_state.q_index = 0
-            st.session_state.score = 0
-
-        st.markdown("""
-        <div class="quiz-header">
-            <h3>Knowledge Quiz</h3>
-            <p>Match each use case to the correct AI restoration feature.</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        questions = st.session_state.quiz_questions
-        qidx = st.session_state.q_index
-
-        if qidx < len(questions):
-            q = questions[qidx]
-            st.markdown(f"""
-            <div style="display: flex; align-items: center; justify-content: space-between; margin-bottom: 1rem;">
-                <span class="badge-gold">Question {qidx+1} of {len(questions)}</span>
-                <span class="badge-teal">Score: {st.session_state.score}</span>
-            </div>
-            """, unsafe_allow_html=True)
-
-            st.markdown(f"""
-            <div style="background: rgba(15,15,35,0.7); border: 1px solid var(--border-color); border-radius: 14px; padding: 1.2rem 1.5rem; margin-bottom: 1.5rem; color: var(--text-primary); font-size: 1.05rem; font-style: italic; border-left: 3px solid var(--accent-cyan);">
-                "{q['prompt']}"
-            </div>
-            """, unsafe_allow_html=True)
-
-            selected = st.radio('Which feature best matches this use case?', q['choices'], key=f'choice_{qidx}')
-            if st.button('Submit Answer →', key=f'submit_{qidx}'):
-                if selected == q['correct']:
-                    st.session_state.score += 1
-                    st.success('✓ Correct — well done!')
-                else:
-                    st.error(f"✗ The correct answer was: {q['correct']}")
-                st.session_state.q_index += 1
-                safe_rerun()
-        else:
-            total = len(questions)
-            score = st.session_state.score
-            pct = int((score / total) * 100)
-            st.markdown(f"""
-            <div style="background: linear-gradient(135deg, rgba(6,214,160,0.12), rgba(139,92,246,0.12)); border: 1px solid var(--border-accent); border-radius: 20px; padding: 2rem; text-align: center; margin-bottom: 1.5rem;">
-                <div style="font-family: 'Space Grotesk', sans-serif; font-size: 3.5rem; background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple)); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; line-height: 1; font-weight: 700;">{score}/{total}</div>
-                <div style="color: var(--text-muted); font-family: 'JetBrains Mono', monospace; font-size: 0.75rem; letter-spacing: 2px; text-transform: uppercase; margin-top: 0.5rem;">Quiz Complete · {pct}% Accuracy</div>
-            </div>
-            """, unsafe_allow_html=True)
-            if st.button('Play Again', key='quiz_restart'):
-                del st.session_state.quiz_questions
-                del st.session_state.q_index
-                del st.session_state.score
-                safe_rerun()
-
-        with st.expander('View Full Feature Gallery'):
-            for feature in features:
-                cases_html = "".join([f"<li style='color: var(--text-secondary); font-size: 0.88rem;'>{case}</li>" for case in feature['cases']])
-                st.markdown(f"""
-                <div style="background: rgba(15,15,35,0.7); border: 1px solid var(--border-color); border-radius: 16px; padding: 1.5rem; margin-bottom: 1rem; border-left: 3px solid var(--accent-cyan);">
-                    <div style="display: flex; align-items: center; gap: 1rem; margin-bottom: 0.8rem;">
-                        <span style="font-size: 1.8rem;">{feature['icon']}</span>
-                        <div>
-                            <div style="font-family: 'Space Grotesk', sans-serif; font-size: 1.2rem; color: var(--accent-cyan); font-weight: 600;">{feature['title']}</div>
-                            <div style="color: var(--text-secondary); font-size: 0.82rem; margin-top: 0.2rem;">{feature['desc']}</div>
-                        </div>
-                    </div>
-                    <ul style="margin: 0; padding-left: 1.2rem;">{cases_html}</ul>
-                </div>
-                """, unsafe_allow_html=True)
-
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    # ==================== TAB 3: CULTURAL INSIGHTS ====================
-    with tab3:
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown('<span class="section-eyebrow">Heritage Knowledge Base</span>', unsafe_allow_html=True)
-        st.markdown('<h2 style="font-family: \'Space Grotesk\', sans-serif; font-size: 2rem; font-weight: 700; margin-top: 0;">Cultural & Historical Insights</h2>', unsafe_allow_html=True)
-
-        insight_type = st.selectbox(
-            "Select Art Period or Cultural Tradition",
-            ["Renaissance (Italian)", "Baroque (European)", "Rococo (French)",
-             "Indian Mughal Art", "Indian Rajput Painting", "Islamic Art & Calligraphy",
-             "Japanese Ukiyo-e", "Chinese Ming Dynasty", "Byzantine Art",
-             "Egyptian Art", "Greek Classical Art", "Aboriginal Australian Art"],
-            key="cultural_insight_select"
-        )
-
-        cultural_insights = {
-            "Renaissance (Italian)": {
-                "emoji": "🎨", "period": "14th–17th Century",
-                "background": "The Renaissance marked a cultural rebirth in Europe, emphasizing humanism, naturalism, and classical learning. Artists like Leonardo da Vinci, Michelangelo, and Raphael revolutionized art with techniques like linear perspective, sfumato, and anatomical accuracy.",
-                "importance": "Renaissance art represents a pivotal shift from medieval symbolism to realistic representation. It laid the foundation for Western art and introduced techniques still used today. The period's emphasis on individual expression and scientific observation changed how humans viewed themselves.",
-                "restoration": "Renaissance paintings require extreme care due to fragile egg tempera and oil layers. Restoration must preserve original glazing techniques, gold leaf applications, and the delicate balance of light and shadow. Modern conservators use non-invasive imaging before any intervention.",
-                "techniques": ["Linear Perspective", "Sfumato (Leonardo's technique)", "Chiaroscuro (light/shadow)", "Contrapposto (natural poses)", "Oil glazing layers"],
-                "famous_works": ["Mona Lisa", "The Last Supper", "Sistine Chapel Ceiling", "The Birth of Venus"]
-            },
-            "Baroque (European)": {
-                "emoji": "✨", "period": "17th–18th Century",
-                "background": "Baroque art emerged as a dramatic, emotional response to the Protestant Reformation. Characterized by intense emotion, movement, and theatrical lighting, it was used by the Catholic Church to inspire faith through grandeur and spectacle.",
-                "importance": "Baroque art revolutionized emotional expression in painting and sculpture. Artists like Caravaggio, Rembrandt, and Rubens created works with unprecedented drama and realism.",
-                "restoration": "Baroque works often feature heavy impasto, dramatic chiaroscuro, and dark varnish layers. Restoration requires careful varnish removal to reveal original colors while preserving the intentional darkness that creates dramatic effects.",
-                "techniques": ["Tenebrism (dramatic contrast)", "Dynamic composition", "Rich color palette", "Emotional intensity", "Movement and energy"],
-                "famous_works": ["The Night Watch", "Ecstasy of Saint Teresa", "Las Meninas", "The Calling of St Matthew"]
-            },
-            "Rococo (French)": {
-                "emoji": "🌸", "period": "18th Century",
-                "background": "Rococo emerged as a lighter, more playful reaction to Baroque grandeur. Characterized by pastel colors, delicate ornamentation, and themes of romance and leisure, it flourished in French aristocratic salons.",
-                "importance": "Rococo art captured the elegance and refinement of 18th-century aristocratic culture. Its emphasis on pleasure, intimacy, and decorative beauty influenced interior design, fashion, and the decorative arts.",
-                "restoration": "Rococo works often feature delicate pastel pigments, gold leaf, and intricate detail. Restoration requires preserving the lightness and airiness of the style while addressing fading and deterioration of fragile materials.",
-                "techniques": ["Pastel color palette", "Asymmetric curves", "Gold leaf detailing", "Delicate brushwork", "Playful subject matter"],
-                "famous_works": ["The Swing", "Pilgrimage to Cythera", "Diana Leaving Her Bath", "Rococo interiors of Versailles"]
-            },
-            "Indian Mughal Art": {
-                "emoji": "🕌", "period": "16th–19th Century",
-                "background": "Mughal miniature paintings blend Persian, Indian, and Islamic artistic traditions. Created for royal courts, these intricate works depicted historical events, court life, flora, and fauna with meticulous detail and vibrant colors.",
-                "importance": "Mughal art represents a unique synthesis of diverse cultural influences, documenting historical events and showcasing the sophistication of Mughal court culture.",
-                "restoration": "Mughal miniatures are painted on paper with natural pigments and gold. Restoration must address insect damage, pigment fading, and paper deterioration while preserving delicate gold leaf work.",
-                "techniques": ["Fine brushwork (single hair brushes)", "Natural mineral pigments", "Gold leaf application", "Intricate border patterns", "Layered composition"],
-                "famous_works": ["Hamzanama manuscripts", "Akbarnama", "Padshahnama", "Baburnama illustrations"]
-            },
-            "Indian Rajput Painting": {
-                "emoji": "🎭", "period": "16th–19th Century",
-                "background": "Rajput paintings from various royal courts depicted Hindu mythology, poetry, and courtly life. These works are known for bold colors, emotional expression, and spiritual themes, particularly illustrations of Krishna and Radha.",
-                "importance": "Rajput art preserved Hindu religious narratives and courtly culture. Each school developed distinctive styles contributing to India's diverse artistic heritage.",
-                "restoration": "Similar to Mughal art but with distinctive regional techniques. Rajput works often use more vibrant colors and thicker paper. Conservation must respect religious symbolism.",
-                "techniques": ["Bold flat colors", "Expressive faces and gestures", "Symbolic use of color", "Poetry-inspired compositions", "Regional stylistic variations"],
-                "famous_works": ["Bani Thani (Kishangarh)", "Ragamala paintings", "Krishna Lila series", "Mewar Ramayana"]
-            },
-            "Islamic Art & Calligraphy": {
-                "emoji": "🕌", "period": "7th Century–Present",
-                "background": "Islamic art emphasizes geometric patterns, arabesques, and calligraphy due to religious restrictions on figurative representation. Quranic verses become art through elaborate scripts like Kufic, Naskh, and Thuluth.",
-                "importance": "Islamic art demonstrates how religious principles can inspire mathematical precision and aesthetic beauty. Calligraphy elevates written language to divine art.",
-                "restoration": "Islamic manuscripts and architectural decorations require specialized knowledge of Arabic scripts and geometric principles. Symmetry and pattern integrity must be preserved.",
-                "techniques": ["Sacred geometry", "Arabesque patterns", "Illuminated manuscripts", "Tilework (zellige)", "Various calligraphic scripts"],
-                "famous_works": ["Blue Quran", "Alhambra decorations", "Topkapi manuscripts", "Isfahan mosque tiles"]
-            },
-            "Japanese Ukiyo-e": {
-                "emoji": "🎌", "period": "17th–19th Century",
-                "background": "Ukiyo-e are woodblock prints depicting kabuki actors, beautiful women, landscapes, and everyday life in Edo-period Japan. Artists like Hokusai and Hiroshige influenced Western Impressionism.",
-                "importance": "Ukiyo-e democratized art in Japan and profoundly influenced European artists like Van Gogh and Monet, showcasing masterful composition and color gradation.",
-                "restoration": "Woodblock prints are vulnerable to light damage, foxing, and paper degradation. Restoration requires understanding traditional Japanese papermaking and printing techniques.",
-                "techniques": ["Woodblock printing", "Bokashi (color gradation)", "Bold outlines", "Flat color areas", "Asymmetric composition"],
-                "famous_works": ["The Great Wave", "Thirty-Six Views of Mt. Fuji", "Fifty-Three Stations of Tokaido", "Beauties of the Yoshiwara"]
-            },
-            "Chinese Ming Dynasty": {
-                "emoji": "🐉", "period": "14th–17th Century",
-                "background": "Ming Dynasty art revived classical Chinese traditions. Known for blue and white porcelain, landscape paintings, and calligraphy, Ming artists emphasized harmony between humans and nature.",
-                "importance": "Ming art represents the pinnacle of Chinese ceramic production and landscape painting. The period's artistic output influenced global trade and aesthetic preferences worldwide.",
-                "restoration": "Ming ceramics require specialized knowledge of high-fire techniques and cobalt pigments. Paintings on silk demand extreme care due to material fragility.",
-                "techniques": ["Blue and white porcelain", "Monochrome ink landscapes", "Calligraphic painting", "Scholar's rocks", "Court painting traditions"],
-                "famous_works": ["Ming vases", "Shen Zhou landscapes", "Tang Yin paintings", "Imperial porcelain"]
-            },
-            "Byzantine Art": {
-                "emoji": "☦️", "period": "4th–15th Century",
-                "background": "Byzantine art served the Eastern Orthodox Church, creating iconic religious images with gold backgrounds, frontal poses, and spiritual symbolism. Mosaics and icons were designed to inspire devotion.",
-                "importance": "Byzantine art preserved classical traditions through the medieval period and established the visual language of Orthodox Christianity.",
-                "restoration": "Byzantine mosaics and icons require specialized conservation of gold leaf, tempera on wood panels, and glass tesserae. Religious protocols must be observed.",
-                "techniques": ["Gold leaf backgrounds", "Egg tempera", "Mosaic tesserae", "Hierarchical scaling", "Symbolic color use"],
-                "famous_works": ["Hagia Sophia mosaics", "Vladimir Mother of God", "Ravenna mosaics", "Christ Pantocrator"]
-            },
-            "Egyptian Art": {
-                "emoji": "🏛️", "period": "3000–30 BCE",
-                "background": "Ancient Egyptian art served religious and political purposes, depicting gods, pharaohs, and the afterlife. The strict artistic conventions lasted for millennia, demonstrating extraordinary cultural continuity.",
-                "importance": "Egyptian art provides insight into one of history's longest-lasting civilizations. Tomb paintings, sculptures, and hieroglyphics preserved knowledge for over 3,000 years.",
-                "restoration": "Egyptian artifacts require climate control due to their age. Pigments derived from minerals need careful stabilization. Many works involve stone, papyrus, or plaster.",
-                "techniques": ["Hierarchical scale", "Composite view", "Register composition", "Symbolic color", "Relief carving"],
-                "famous_works": ["Tutankhamun's mask", "Nefertiti bust", "Tomb of Nefertari", "Book of the Dead papyri"]
-            },
-            "Greek Classical Art": {
-                "emoji": "🏛️", "period": "5th–4th Century BCE",
-                "background": "Classical Greek art emphasized ideal beauty, proportion, and naturalism. Sculptors like Phidias and Praxiteles created works embodying philosophical ideals of harmony and balance.",
-                "importance": "Greek classical art established standards of beauty and proportion that shaped Western civilization, influencing art, architecture, and aesthetics for millennia.",
-                "restoration": "Ancient Greek sculptures often survive as Roman copies or fragments. Restoration involves careful cleaning of marble and ethical decisions about reconstruction.",
-                "techniques": ["Contrapposto stance", "Golden ratio proportions", "Idealized naturalism", "Bronze hollow-casting", "Polychrome marble"],
-                "famous_works": ["Parthenon sculptures", "Discobolus", "Venus de Milo", "Winged Victory"]
-            },
-            "Aboriginal Australian Art": {
-                "emoji": "🪃", "period": "40,000+ years–Present",
-                "background": "Aboriginal art is one of the world's oldest continuous art traditions, depicting Dreamtime stories, ancestral beings, and connection to land. Rock paintings and dot paintings encode spiritual knowledge.",
-                "importance": "Aboriginal art represents humanity's oldest living art tradition, preserving tens of thousands of years of cultural knowledge inseparable from spiritual beliefs and connection to country.",
-                "restoration": "Aboriginal art restoration requires consultation with traditional owners and respect for sacred content. Rock art conservation must consider environmental exposure.",
-                "techniques": ["Dot painting", "X-ray art (showing internal organs)", "Natural ochre pigments", "Symbolic mapping", "Layered narratives"],
-                "famous_works": ["Bradshaw paintings", "X-ray art (Kakadu)", "Papunya Tula movement", "Wandjina spirit figures"]
-            }
-        }
-
-        if insight_type in cultural_insights:
-            insight = cultural_insights[insight_type]
-            st.markdown(f"""
-            <div class="insight-header">
-                <div style="font-size: 3rem; margin-bottom: 0.8rem;">{insight['emoji']}</div>
-                <div style="font-family: 'Space Grotesk', sans-serif; font-size: 2.2rem; color: var(--text-primary); font-weight: 700;">{insight_type}</div>
-                <div style="margin-top: 0.5rem;"><span class="badge-teal">📅 {insight['period']}</span></div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            sections = [
-                ("📖", "Historical Background", insight['background'], "var(--accent-cyan)"),
-                ("⭐", "Cultural Importance", insight['importance'], "var(--accent-purple)"),
-                ("🛠️", "Restoration Considerations", insight['restoration'], "var(--accent-pink)"),
-            ]
-            for icon, title, content, color in sections:
-                st.markdown(f"""
-                <div style="background: rgba(15,15,35,0.7); border: 1px solid {color}25; border-left: 3px solid {color}; border-radius: 14px; padding: 1.5rem 2rem; margin-bottom: 1.2rem;">
-                    <div style="font-family: 'Space Grotesk', sans-serif; font-size: 1.1rem; color: {color}; margin-bottom: 0.8rem; font-weight: 600;">{icon} {title}</div>
-                    <p style="color: var(--text-secondary); font-size: 0.92rem; line-height: 1.75; margin: 0;">{content}</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            st.markdown("""
-            <div style="font-family: 'Space Grotesk', sans-serif; font-size: 1.1rem; color: var(--accent-cyan); margin: 1.5rem 0 1rem 0; font-weight: 600;">🎨 Key Artistic Techniques</div>
-            """, unsafe_allow_html=True)
-            cols = st.columns(2)
-            for idx, technique in enumerate(insight['techniques']):
-                with cols[idx % 2]:
-                    st.markdown(f"""
-                    <div style="background: rgba(15,15,35,0.6); border: 1px solid var(--border-color); border-radius: 12px; padding: 0.8rem 1rem; margin-bottom: 0.8rem; display: flex; align-items: center; gap: 0.8rem;">
-                        <div class="milestone-dot"></div>
-                        <span style="color: var(--text-primary); font-size: 0.9rem;">{technique}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-            st.markdown("""
-            <div style="font-family: 'Space Grotesk', sans-serif; font-size: 1.1rem; color: var(--accent-cyan); margin: 1.5rem 0 1rem 0; font-weight: 600;">🖼️ Famous Masterpieces</div>
-            """, unsafe_allow_html=True)
-            for work in insight['famous_works']:
-                st.markdown(f"""
-                <div style="background: rgba(15,15,35,0.6); border: 1px solid var(--border-color); border-radius: 12px; padding: 0.8rem 1.2rem; margin-bottom: 0.6rem; display: flex; align-items: center; gap: 1rem;">
-                    <span style="color: var(--accent-cyan); font-size: 1.1rem;">◆</span>
-                    <span style="color: var(--text-primary); font-size: 0.92rem; font-family: 'Space Grotesk', sans-serif; font-size: 1.05rem;">{work}</span>
-                </div>
-                """, unsafe_allow_html=True)
-
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    # ==================== TAB 4: AI RESTORATION TIMELINE PLANNER ====================
-    with tab4:
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown('<span class="section-eyebrow">Project Planning Tool</span>', unsafe_allow_html=True)
-        st.markdown('<h2 style="font-family: \'Space Grotesk\', sans-serif; font-size: 2rem; font-weight: 700; margin-top: 0;">AI Restoration Timeline Planner</h2>', unsafe_allow_html=True)
-        st.markdown('<p style="color: var(--text-secondary); font-size: 0.92rem; margin-bottom: 2rem; line-height: 1.6;">Configure your project parameters and receive a detailed, phase-by-phase restoration timeline with risk assessments, milestones, and expert scheduling recommendations.</p>', unsafe_allow_html=True)
-
-        # Input Panel
-        st.markdown('<div style="background: rgba(15,15,35,0.7); border: 1px solid var(--border-color); border-radius: 20px; padding: 2rem; margin-bottom: 2rem;">', unsafe_allow_html=True)
-        st.markdown('<div style="font-family: \'Space Grotesk\', sans-serif; font-size: 1.3rem; color: var(--accent-cyan); margin-bottom: 1.5rem; font-weight: 600;">Project Parameters</div>', unsafe_allow_html=True)
-
-        tl_col1, tl_col2 = st.columns(2)
-        with tl_col1:
-            tl_artwork_type = st.selectbox("Artwork Type", [
-                "Oil Painting", "Watercolor on Paper", "Stone Sculpture",
-                "Bronze Sculpture", "Textile / Tapestry", "Illuminated Manuscript",
-                "Mural / Fresco", "Ceramic / Pottery", "Mixed Media"
-            ], key="tl_art_type")
-
-            tl_damage_severity = st.select_slider("Damage Severity", options=[
-                "Minimal (surface dust/light scratches)",
-                "Moderate (fading, minor losses)",
-                "Significant (structural cracks, major losses)",
-                "Severe (major structural damage, 50%+ loss)",
-                "Critical (near-total deterioration)"
-            ], value="Moderate (fading, minor losses)", key="tl_damage")
-
-            tl_size = st.selectbox("Artwork Scale", [
-                "Small (< 30cm)", "Medium (30–100cm)", "Large (100–200cm)",
-                "Very Large (> 200cm)", "Monumental (architectural scale)"
-            ], key="tl_size")
-
-        with tl_col2:
-            tl_urgency = st.selectbox("Project Urgency", [
-                "Flexible (timeline open)", "Standard (6–12 months)",
-                "Priority (3–6 months)", "Urgent (< 3 months)"
-            ], key="tl_urgency")
-
-            tl_team_size = st.select_slider("Conservation Team Size", options=[
-                "Solo conservator", "2–3 specialists", "4–6 person team", "Large institutional team (7+)"
-            ], value="2–3 specialists", key="tl_team")
-
-            tl_goals = st.multiselect("Restoration Goals", [
-                "Stabilisation only", "Full visual restoration",
-                "Scientific documentation", "Public exhibition prep",
-                "Digital archiving", "Loan/transport preparation",
-                "Educational reproduction", "Insurance documentation"
-            ], default=["Stabilisation only", "Full visual restoration"], key="tl_goals")
-
-        st.markdown('</div>', unsafe_allow_html=True)
-
-        if st.button("Generate Restoration Timeline →", key="gen_timeline"):
-            # Timeline generation logic
-            damage_map = {
-                "Minimal (surface dust/light scratches)": (1, "LOW"),
-                "Moderate (fading, minor losses)": (2, "MEDIUM"),
-                "Significant (structural cracks, major losses)": (3, "HIGH"),
-                "Severe (major structural damage, 50%+ loss)": (4, "HIGH"),
-                "Critical (near-total deterioration)": (5, "HIGH")
-            }
-            size_map = {
-                "Small (< 30cm)": 0.7,
-                "Medium (30–100cm)": 1.0,
-                "Large (100–200cm)": 1.4,
-                "Very Large (> 200cm)": 1.8,
-                "Monumental (architectural scale)": 2.5
-            }
-            urgency_map = {
-                "Flexible (timeline open)": 1.0,
-                "Standard (6–12 months)": 0.85,
-                "Priority (3–6 months)": 0.65,
-                "Urgent (< 3 months)": 0.45
-            }
-            team_map = {
-                "Solo conservator": 1.3,
-                "2–3 specialists": 1.0,
-                "4–6 person team": 0.75,
-                "Large institutional team (7+)": 0.55
-            }
-
-            dmg_level, risk_base = damage_map[tl_damage_severity]
-            size_f = size_map[tl_size]
-            urg_f = urgency_map[tl_urgency]
-            team_f = team_map[tl_team_size]
-
-            # Base weeks per phase scaled by damage, size, urgency, team
-            def calc_weeks(base_w):
-                return max(1, round(base_w * (dmg_level / 2) * size_f * urg_f * team_f))
-
-            phases = [
-                {
-                    "phase": "Phase 01", "icon": "🔬",
-                    "title": "Assessment & Documentation",
-                    "weeks": calc_weeks(3),
-                    "tasks": [
-                        ("Comprehensive visual inspection and condition mapping", "HIGH"),
-                        ("UV fluorescence, X-radiography, infrared reflectography", "HIGH"),
-                        ("Material sampling and scientific analysis (pigment, substrate, binding media)", "MEDIUM"),
-                        ("Historical research, provenance investigation and archival study", "MEDIUM"),
-                        ("Photographic documentation (raking light, multispectral)", "LOW")
-                    ],
-                    "milestone": "Condition Report & Treatment Proposal approved by stakeholders",
-                    "deliverable": "Detailed Condition Report"
-                },
-                {
-                    "phase": "Phase 02", "icon": "🛡️",
-                    "title": "Emergency Stabilisation",
-                    "weeks": calc_weeks(2),
-                    "tasks": [
-                        ("Consolidation of flaking or delaminating paint layers", "HIGH"),
-                        ("Structural support for fragile or cracked substrate", "HIGH"),
-                        ("Local facing of vulnerable areas prior to treatment", "MEDIUM"),
-                        ("Climate and environmental stabilisation measures", "LOW")
-                    ],
-                    "milestone": "Artwork structurally stable and safe to proceed",
-                    "deliverable": "Stabilisation Report"
-                },
-                {
-                    "phase": "Phase 03", "icon": "🧹",
-                    "title": "Surface Cleaning & Preparation",
-                    "weeks": calc_weeks(4),
-                    "tasks": [
-                        ("Dry mechanical cleaning — removal of surface deposits", "LOW"),
-                        ("Solvent-based cleaning of discoloured varnish layers", "HIGH"),
-                        ("Aqueous cleaning where appropriate (pH controlled)", "MEDIUM"),
-                        ("Removal of previous (incompatible) restorations or overpaints", "HIGH"),
-                        ("Final surface preparation and assessment of original material revealed", "MEDIUM")
-                    ],
-                    "milestone": "Original surface fully accessible and documented",
-                    "deliverable": "Cleaning Test Records & Solubility Maps"
-                },
-                {
-                    "phase": "Phase 04", "icon": "🔧",
-                    "title": "Structural Conservation",
-                    "weeks": calc_weeks(3) if dmg_level >= 3 else 0,
-                    "tasks": [
-                        ("Structural consolidation of substrate (relining, cradling, backing)", "HIGH"),
-                        ("Loss filling with appropriate conservation-grade fills", "MEDIUM"),
-                        ("Surface texture inpainting to match surrounding original", "MEDIUM"),
-                        ("Adhesive consolidation of all previously loose elements", "LOW")
-                    ],
-                    "milestone": "Structural integrity fully restored",
-                    "deliverable": "Structural Treatment Report"
-                },
-                {
-                    "phase": "Phase 05", "icon": "🎨",
-                    "title": "Aesthetic Restoration & Inpainting",
-                    "weeks": calc_weeks(5),
-                    "tasks": [
-                        ("Colour matching and reference sample creation", "HIGH"),
-                        ("Inpainting of losses using reversible conservation media", "HIGH"),
-                        ("Texture recreation to integrate losses with original surface", "HIGH"),
-                        ("Intermediate varnish application for visual unification", "MEDIUM"),
-                        ("Chromatic reintegration review with client / curator", "MEDIUM")
-                    ],
-                    "milestone": "Visual reintegration approved — aesthetic integrity restored",
-                    "deliverable": "Inpainting Log & Photographic Record"
-                },
-                {
-                    "phase": "Phase 06", "icon": "✅",
-                    "title": "Final Varnishing, Review & Handover",
-                    "weeks": calc_weeks(2),
-                    "tasks": [
-                        ("Application of final protective varnish (reversible, UV-stable)", "MEDIUM"),
-                        ("Full post-treatment documentation photography", "LOW"),
-                        ("Preparation of final conservation treatment report", "HIGH"),
-                        ("Client review, sign-off and handover", "LOW"),
-                        ("Long-term care and preventive conservation guidance issued", "LOW")
-                    ],
-                    "milestone": "Project complete — artwork delivered with full documentation",
-                    "deliverable": "Final Conservation Report & Certificate"
-                }
-            ]
-
-            active_phases = [p for p in phases if p['weeks'] > 0]
-            total_weeks = sum(p['weeks'] for p in active_phases)
-            total_months = round(total_weeks / 4.3, 1)
-
-            risk_map = {"HIGH": "risk-high", "MEDIUM": "risk-medium", "LOW": "risk-low"}
-
-            # Summary stats
-            st.markdown('<hr class="divider-gold">', unsafe_allow_html=True)
-            st.markdown("""
-            <div style="font-family: 'Space Grotesk', sans-serif; font-size: 1.5rem; color: var(--text-primary); margin: 1.5rem 0 1rem 0; font-weight: 700;">
-                Project Summary
-            </div>
-            """, unsafe_allow_html=True)
-
-            s1, s2, s3, s4 = st.columns(4)
-            for col, val, label in [
-                (s1, f"{total_weeks}w", "Total Duration"),
-                (s2, f"{total_months}mo", "Approx. Months"),
-                (s3, str(len(active_phases)), "Project Phases"),
-                (s4, risk_base, "Risk Level")
-            ]:
-                with col:
-                    st.markdown(f"""
-                    <div class="summary-stat">
-                        <div class="stat-value">{val}</div>
-                        <div class="stat-label">{label}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-            # Urgency note
-            if tl_urgency == "Urgent (< 3 months)" and total_weeks > 12:
-                st.warning(f"⚠️ Urgent timeline selected but estimated duration is {total_weeks} weeks. Consider expanding team size or scoping down goals.")
-
-            # Gantt-style visual timeline
-            st.markdown("""
-            <div style="font-family: 'Space Grotesk', sans-serif; font-size: 1.5rem; color: var(--text-primary); margin: 2rem 0 1rem 0; font-weight: 700;">
-                Phase-by-Phase Timeline
-            </div>
-            """, unsafe_allow_html=True)
-
-            running_week = 0
-            for i, phase in enumerate(active_phases):
-                start_w = running_week + 1
-                end_w = running_week + phase['weeks']
-                running_week = end_w
-
-                priority_colors = {"HIGH": "#ec4899", "MEDIUM": "#f97316", "LOW": "#06d6a0"}
-
-                tasks_html = ""
-                for task, priority in phase['tasks']:
-                    color = priority_colors[priority]
-                    tasks_html += f"""
-                    <div style="background: rgba(10,14,26,0.6); border-left: 3px solid {color}; padding: 0.7rem 1.1rem; border-radius: 0 12px 12px 0; margin: 0.5rem 0; display: flex; align-items: center; justify-content: space-between; gap: 1rem;">
-                        <span style="color: var(--text-secondary); font-size: 0.85rem; flex: 1;">{task}</span>
-                        <span class="risk-badge {risk_map[priority]}">{priority}</span>
-                    </div>
-                    """
-
-                week_bar_pct = int((phase['weeks'] / max(total_weeks, 1)) * 100)
-                bar_color = "#06d6a0" if i % 2 == 0 else "#8b5cf6"
-
-                st.markdown(f"""
-                <div class="timeline-card">
-                    <div style="display: flex; align-items: flex-start; justify-content: space-between; gap: 1rem; flex-wrap: wrap;">
-                        <div>
-                            <div class="timeline-phase-label">{phase['phase']} · {phase['icon']}</div>
-                            <div class="timeline-phase-title">{phase['title']}</div>
-                            <div style="display: flex; gap: 0.5rem; flex-wrap: wrap; margin-top: 0.5rem;">
-                                <span class="timeline-duration-badge">Weeks {start_w}–{end_w}</span>
-                                <span class="timeline-duration-badge">{phase['weeks']} week{'s' if phase['weeks'] != 1 else ''}</span>
-                            </div>
-                        </div>
-                        <div style="text-align: right; flex-shrink: 0;">
-                            <div style="font-family: 'JetBrains Mono', monospace; font-size: 0.7rem; color: var(--text-muted); letter-spacing: 1px; text-transform: uppercase;">Share of total</div>
-                            <div style="font-family: 'Space Grotesk', sans-serif; font-size: 1.8rem; color: {bar_color}; font-weight: 700;">{week_bar_pct}%</div>
-                        </div>
-                    </div>
-
-                    <div style="background: rgba(10,14,26,0.6); border-radius: 6px; height: 8px; margin: 1rem 0; overflow: hidden;">
-                        <div style="width: {week_bar_pct}%; height: 100%; background: linear-gradient(90deg, {bar_color}cc, {bar_color}); border-radius: 6px;"></div>
-                    </div>
-
-                    <div style="margin-top: 1rem;">
-                        {tasks_html}
-                    </div>
-
-                    <div style="background: rgba(6,214,160,0.08); border: 1px dashed rgba(6,214,160,0.3); border-radius: 12px; padding: 0.8rem 1.2rem; margin-top: 1rem; display: flex; align-items: center; gap: 0.8rem;">
-                        <div class="milestone-dot"></div>
-                        <div>
-                            <div style="font-family: 'JetBrains Mono', monospace; font-size: 0.65rem; color: var(--accent-cyan); letter-spacing: 1px; text-transform: uppercase;">Milestone</div>
-                            <div style="color: var(--text-primary); font-size: 0.88rem; margin-top: 0.2rem;">{phase['milestone']}</div>
-                        </div>
-                    </div>
-                    <div style="margin-top: 0.8rem; display: flex; align-items: center; gap: 0.5rem;">
-                        <span style="color: var(--text-muted); font-size: 0.75rem; font-family: 'JetBrains Mono', monospace; text-transform: uppercase; letter-spacing: 1px;">Deliverable →</span>
-                        <span class="badge-teal">{phase['deliverable']}</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-
-                if i < len(active_phases) - 1:
-                    st.markdown('<div class="timeline-connector">↓</div>', unsafe_allow_html=True)
-
-            # Recommendations
-            st.markdown("""
-            <div style="font-family: 'Space Grotesk', sans-serif; font-size: 1.5rem; color: var(--text-primary); margin: 2rem 0 1rem 0; font-weight: 700;">
-                Planning Recommendations
-            </div>
-            """, unsafe_allow_html=True)
-
-            rec_items = []
-            if dmg_level >= 4:
-                rec_items.append(("🚨", "HIGH", "Immediate structural stabilisation is critical. Do not proceed to cleaning before securing all fragile elements."))
-            if "Scientific documentation" in tl_goals:
-                rec_items.append(("🔬", "MEDIUM", "Allow additional 2–3 weeks for laboratory analysis turnaround. Partner with a university conservation science department."))
-            if "Public exhibition prep" in tl_goals:
-                rec_items.append(("🖼️", "MEDIUM", "Build a 4-week buffer before exhibition date. Final varnish requires 2 weeks to cure fully under stable conditions."))
-            if tl_urgency in ["Priority (3–6 months)", "Urgent (< 3 months)"]:
-                rec_items.append(("⚡", "HIGH", "Compressed timeline increases risk. Consider expanding team size or reducing scope to only critical interventions."))
-            rec_items.append(("📋", "LOW", "Document every intervention in a running treatment log. Photographs before, during and after each phase are mandatory."))
-            rec_items.append(("🌡️", "LOW", "Maintain stable environment throughout: 18–22°C, 45–55% RH. Fluctuations can undo treatment gains."))
-            if "Digital archiving" in tl_goals:
-                rec_items.append(("💾", "LOW", "Schedule multispectral imaging session at end of Phase 3 (cleaned but pre-inpainted) for the highest-quality archive record."))
-
-            for icon, priority, text in rec_items:
-                color = {"HIGH": "#ec4899", "MEDIUM": "#f97316", "LOW": "#06d6a0"}[priority]
-                st.markdown(f"""
-                <div style="background: rgba(15,15,35,0.7); border: 1px solid {color}30; border-left: 3px solid {color}; border-radius: 12px; padding: 1rem 1.2rem; margin-bottom: 0.8rem; display: flex; align-items: flex-start; gap: 1rem;">
-                    <span style="font-size: 1.3rem; flex-shrink: 0; margin-top: 0.1rem;">{icon}</span>
-                    <div style="flex: 1;">
-                        <span class="risk-badge {risk_map[priority]}" style="margin-bottom: 0.4rem; display: inline-block;">{priority}</span>
-                        <p style="color: var(--text-secondary); font-size: 0.88rem; margin: 0; line-height: 1.6;">{text}</p>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-
-            # Download button
-            timeline_export = f"""ARTRESTORER AI — RESTORATION TIMELINE PLAN
-══════════════════════════════════════════════════════
-Generated: {datetime.now().strftime('%B %d, %Y at %H:%M')}
-Project: {st.session_state.user_data.get('name', 'N/A')} | {tl_artwork_type}
-
-PARAMETERS
-Artwork Type:    {tl_artwork_type}
-Damage:          {tl_damage_severity}
-Scale:           {tl_size}
-Team:            {tl_team_size}
-Urgency:         {tl_urgency}
-Goals:           {', '.join(tl_goals)}
-
-SUMMARY
-Total Duration:  {total_weeks} weeks (~{total_months} months)
-Phases:          {len(active_phases)}
-Risk Level:      {risk_base}
-
-PHASES
-"""
-            rw = 0
-            for ph in active_phases:
-                sw = rw + 1; ew = rw + ph['weeks']; rw = ew
-                timeline_export += f"\n{ph['phase']}: {ph['title']}\nWeeks {sw}–{ew} ({ph['weeks']}w)\n"
-                for t, p in ph['tasks']:
-                    timeline_export += f"  [{p}] {t}\n"
-                timeline_export += f"Milestone: {ph['milestone']}\nDeliverable: {ph['deliverable']}\n"
-
-            st.download_button(
-                label="📥 Download Timeline Plan",
-                data=timeline_export,
-                file_name=f"Timeline_{tl_artwork_type.replace(' ','_')}_{datetime.now().strftime('%Y%m%d')}.txt",
-                mime="text/plain",
-                key="dl_timeline"
-            )
-
-        st.markdown('</div>', unsafe_allow_html=True)
-
-
-# ==================== RESULTS PAGE ====================
-elif st.session_state.page == 'results':
-    render_header()
-    st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
-
-    st.markdown("""
-    <div style="text-align: center; margin-bottom: 2.5rem;">
-        <span class="section-eyebrow">Analysis Complete</span>
-        <div class="section-title">Restoration Report</div>
-        <p style="color: var(--text-secondary); font-size: 1rem; max-width: 500px; margin: 0 auto;">Expert AI guidance generated for your artwork</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    user = st.session_state.user_data
-    initials = user['name'][0].upper() if user.get('name') else "?"
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, rgba(6,214,160,0.1), rgba(139,92,246,0.1)); border: 1px solid var(--border-accent); border-radius: 20px; padding: 1.5rem 2rem; margin-bottom: 2rem; display: flex; align-items: center; gap: 1.5rem; flex-wrap: wrap;">
-        <div style="width: 52px; height: 52px; background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple)); border-radius: 14px; display: flex; align-items: center; justify-content: center; font-family: 'Space Grotesk', sans-serif; font-size: 1.5rem; color: white; font-weight: 700; flex-shrink: 0; box-shadow: 0 4px 20px rgba(6,214,160,0.3);">{initials}</div>
-        <div style="flex: 1; min-width: 200px;">
-            <div style="font-family: 'Space Grotesk', sans-serif; font-size: 1.3rem; color: var(--text-primary); font-weight: 600;">{user.get('name', '')}</div>
-            <div style="color: var(--text-secondary); font-size: 0.82rem; margin-top: 0.2rem;">{user.get('artwork_type', '')} · {user.get('role', '')} · {user.get('goal', '')}</div>
-        </div>
-        <div><span class="badge-teal">📅 {datetime.now().strftime('%b %d, %Y')}</span></div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    col_a, col_b = st.columns([5, 1])
-    with col_a:
-        st.markdown('<div style="font-family: \'Space Grotesk\', sans-serif; font-size: 1.5rem; color: var(--accent-cyan); margin-bottom: 0.5rem; font-weight: 700;">Detailed Analysis Report</div>', unsafe_allow_html=True)
-    with col_b:
-        st.download_button(
-            label="📥 Export",
-            data=f"""ARTRESTORER AI — RESTORATION ANALYSIS REPORT
-══════════════════════════════════════════════════════
-PREPARED FOR: {user.get('name', '')}
-ROLE: {user.get('role', '')} | TYPE: {user.get('artwork_type', '')}
-DATE: {datetime.now().strftime('%B %d, %Y')}
-
-{st.session_state.result_text}
-
-══════════════════════════════════════════════════════
-Generated by ArtRestorer AI · Cultural Heritage Preservation
-This analysis is advisory only. Always consult certified conservators.
-""",
-            file_name=f"ArtRestorer_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-            mime="text/plain",
-            key="download_report"
-        )
-
-    st.markdown('<hr class="divider-gold">', unsafe_allow_html=True)
-
-    # Format result
-    formatted = st.session_state.result_text
-    formatted = formatted.replace("COMPREHENSIVE RESTORATION ANALYSIS",
-        "<div style='font-family: Space Grotesk, sans-serif; font-size: 1.6rem; background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple)); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; font-weight: 700; letter-spacing: -0.5px;'>Comprehensive Restoration Analysis</div>")
-    formatted = formatted.replace("EXPERT RESTORATION GUIDANCE:",
-        "<div style='font-family: Space Grotesk, sans-serif; font-size: 1.4rem; color: var(--accent-purple); margin: 2rem 0 0.8rem; font-weight: 700; letter-spacing: -0.3px;'>Expert Restoration Guidance</div>")
-    formatted = formatted.replace("CONCLUSION:",
-        "<div style='font-family: Space Grotesk, sans-serif; font-size: 1.3rem; color: var(--accent-cyan); margin: 2rem 0 0.5rem; font-weight: 700;'>Conclusion</div>")
-    formatted = formatted.replace("IMPORTANT DISCLAIMER:",
-        "<div style='font-family: JetBrains Mono, monospace; font-size: 0.7rem; color: var(--accent-pink); letter-spacing: 2px; text-transform: uppercase; margin: 1.5rem 0 0.5rem; font-weight: 600;'>Important Disclaimer</div>")
-    formatted = formatted.replace("══════════════════════════════════════════════════════════",
-        "<hr style='border: none; height: 2px; background: linear-gradient(90deg, transparent, var(--border-accent), transparent); margin: 1.5rem 0;'>")
-
-    st.markdown(f"""
-    <div class="result-box">
-        <div class="result-text" style="font-size: 0.93rem; line-height: 1.9;">{formatted}</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown('<div style="margin-top: 2rem; text-align: center;"></div>', unsafe_allow_html=True)
-    col1, col2, col3 = st.columns([1, 1, 1])
-    with col2:
-        if st.button("← Analyse Another Artwork", key="back_btn"):
-            st.session_state.page = 'main'
-            st.rerun()
-
-    # Feedback
-    st.markdown("""
-    <div style="text-align: center; margin: 4rem 0 1rem;">
-        <div style="font-family: 'Space Grotesk', sans-serif; font-size: 2rem; color: var(--text-primary); font-weight: 700;">Share Your Experience</div>
-        <p style="color: var(--text-secondary); font-size: 0.9rem; margin-top: 0.5rem;">Help us improve ArtRestorer AI</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    col_fb1, col_fb2, col_fb3 = st.columns([1, 1, 1])
-    with col_fb2:
-        if st.button("📝 Open Feedback Form", key="open_feedback_results"):
-            st.session_state.show_feedback_results = True
-
-    if 'show_feedback_results' not in st.session_state:
-        st.session_state.show_feedback_results = False
-
-    if st.session_state.show_feedback_results:
-        st.markdown('<div class="feedback-modal-inner">', unsafe_allow_html=True)
-        st.markdown("""
-        <div style="text-align: center; margin-bottom: 2rem;">
-            <div style="font-family: 'Space Grotesk', sans-serif; font-size: 2rem; background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple)); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; font-weight: 700;">We Value Your Feedback</div>
-            <p style="color: var(--text-secondary); font-size: 0.9rem; margin-top: 0.5rem;">Your input shapes the future of ArtRestorer AI</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        col_fb1, col_fb2 = st.columns(2)
-        with col_fb1:
-            feedback_name = st.text_input("Your Name", key="feedback_name_results", placeholder="Enter your name")
-            feedback_email = st.text_input("Email (Optional)", key="feedback_email_results", placeholder="your@email.com")
-            feedback_rating = st.select_slider(
-                "Overall Rating",
-                options=["⭐ Poor", "⭐⭐ Fair", "⭐⭐⭐ Good", "⭐⭐⭐⭐ Very Good", "⭐⭐⭐⭐⭐ Excellent"],
-                value="⭐⭐⭐ Good", key="feedback_rating_results"
-            )
-        with col_fb2:
-            feedback_category = st.selectbox(
-                "Feedback Category",
-                ["General Feedback", "Feature Request", "Bug Report", "Accuracy of Analysis", "User Experience", "Other"],
-                key="feedback_category_results"
-            )
-            feedback_recommend = st.radio(
-                "Would you recommend ArtRestorer AI?",
-                ["👍 Yes", "🤔 Maybe", "👎 No"],
-                horizontal=True, key="feedback_recommend_results"
-            )
-
-        feedback_comments = st.text_area(
-            "Your Comments & Suggestions",
-            placeholder="Share your thoughts or report issues...",
-            height=150, key="feedback_comments_results"
-        )
-
-        col_fb_btn1, col_fb_btn2, col_fb_btn3 = st.columns([1, 1, 1])
-        with col_fb_btn1:
-            if st.button("Cancel", key="cancel_feedback_results"):
-                st.session_state.show_feedback_results = False
-                st.rerun()
-        with col_fb_btn2:
-            if st.button("Submit Feedback →", key="submit_feedback_results"):
-                if feedback_name and feedback_comments:
-                    st.success("✅ Thank you for your feedback! It helps us improve.")
-                    st.balloons()
-                    import time; time.sleep(2)
-                    st.session_state.show_feedback_results = False
-                    st.rerun()
-                else:
-                    st.error("Please provide your name and comments.")
-
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    st.markdown("""
-    <div class="site-footer">
-        <span>ArtRestorer AI</span> · Powered by OpenAI · Cultural Heritage Preservation
-    </div>
-    """, unsafe_allow_html=True)
+import streamlit as st
+import streamlit.components.v1 as components
+import hmac
+import html
+import io
+import json
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Dict, List, Any
+import os
+import random
+import time
+import asyncio
+from openai import OpenAI, OpenAIError
+from dotenv import load_dotenv
+from artrestorer import sweep
+from artrestorer.batch import DEFAULT_CONCURRENCY, parse_batch_file, run_batch
+from artrestorer.cache import AnalysisCache, open_default_cache
+from artrestorer.calendars import HOLIDAY_PRESETS, WORKWEEKS, build_calendar, dated_phases, parse_holidays
+from artrestorer.client import create_async_openai_client, create_openai_client
+from artrestorer.engine import FEATURE_KEYS, FEATURE_OPTIONS, analysis_cache_key, feature_descriptions, stream_analysis
+from artrestorer.exports import (
+    EXPORT_FORMATS, FORMAT_LABELS, PORTFOLIO_FORMATS, TIMELINE_FORMATS, available_formats, export_file_name,
+    get_export_cache, portfolio_export, report_export, timeline_export
+)
+from artrestorer.feedback import (
+    CATEGORIES as FEEDBACK_CATEGORIES, RATINGS as FEEDBACK_RATINGS, RECOMMEND, FeedbackStore, open_default_feedback_store
+)
+from artrestorer.history import AnalysisHistory, open_default_history
+from artrestorer.knowledge import get_knowledge
+from artrestorer.metrics import (
+    ANALYSIS_REQUESTS, ERRORS, REGISTRY, RERUN_SECONDS, TAB_SECONDS, start_server as start_metrics_server, timed_fragment
+)
+from artrestorer.montecarlo import histogram_rows, simulate_plan
+from artrestorer.profiler import MODES as PROFILER_MODES, RunProfiler
+from artrestorer.portfolio import (
+    DEFAULT_CONSERVATORS, parse_deadline, parse_portfolio_file, schedule_portfolio
+)
+from artrestorer.report import build_report, render_html
+from artrestorer.search import SearchIndex
+from artrestorer.solver import solve_deadline
+from artrestorer.theme import inline_stylesheet_html, publish_stylesheet, stylesheet_loader_html
+from artrestorer.timeline import (
+    ARTWORK_TYPES, DAMAGE_SEVERITIES, DEFAULT_GOALS, GOALS, SIZES, TEAM_SIZES, URGENCIES, plan_timeline
+)
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Page configuration
+st.set_page_config(
+    page_title="ArtRestorer AI - Cultural Heritage Preservation",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+rerun_started = time.perf_counter()
+
+# ==================== ADMIN PROFILER ====================
+# Admins open the app with ?admin=<ARTRESTORER_ADMIN_TOKEN>; everyone else skips this block entirely
+admin_token = os.getenv('ARTRESTORER_ADMIN_TOKEN', '')
+is_admin = bool(admin_token) and hmac.compare_digest(st.query_params.get('admin', ''), admin_token)
+run_profiler = None
+if is_admin:
+    if 'profiles' not in st.session_state:
+        st.session_state.profiles = []
+    # A run that ended in st.rerun() or an exception never reached the end of the script
+    stale = st.session_state.pop('active_profiler', None)
+    if stale is not None:
+        st.session_state.profiles.insert(0, stale.stop(complete=False))
+    if st.session_state.get('profiler_on'):
+        run_profiler = RunProfiler(st.session_state.get('page', 'landing'),
+                                   st.session_state.get('profiler_mode', PROFILER_MODES[0])).start()
+        st.session_state.active_profiler = run_profiler
+
+
+def render_profiler_panel():
+    with st.sidebar:
+        st.markdown("### 🔬 Run Profiler")
+        st.toggle("Profile every full run", key="profiler_on",
+                  help="Fragment-only reruns are not profiled. Turn off when done; profiling slows the app.")
+        st.radio("Mode", PROFILER_MODES, key="profiler_mode", horizontal=True,
+                 help="sampling: flame graph of stacks every 2 ms · cprofile: exact call counts, higher overhead")
+        del st.session_state.profiles[5:]
+        for i, result in enumerate(st.session_state.profiles):
+            status = "" if result.complete else " · cut short"
+            with st.expander(f"{result.label} · {result.seconds * 1000:,.0f} ms · {result.started_at:%H:%M:%S}{status}",
+                             expanded=i == 0):
+                unit = "samples" if result.mode == "sampling" else "calls"
+                st.caption(f"{result.mode} · {result.samples:,} {unit}")
+                st.code(result.stats_text, language=None)
+                stem = f"profile_{result.label}_{result.started_at:%Y%m%d_%H%M%S}"
+                if result.mode == "sampling":
+                    st.download_button("🔥 Flame graph (.svg)", result.svg, file_name=f"{stem}.svg",
+                                       mime="image/svg+xml", on_click="ignore", key=f"profile_svg_{i}")
+                    st.download_button("Collapsed stacks (.folded)", result.collapsed, file_name=f"{stem}.folded",
+                                       mime="text/plain", on_click="ignore", key=f"profile_folded_{i}")
+                else:
+                    st.download_button("pstats (.prof)", result.prof, file_name=f"{stem}.prof",
+                                       mime="application/octet-stream", on_click="ignore", key=f"profile_prof_{i}")
+
+# ==================== OPENAI API CONFIGURATION ====================
+openai_api_key = os.getenv('OPENAI_API_KEY')
+
+if not openai_api_key:
+    st.error("❌ OpenAI API key not found! Please add OPENAI_API_KEY to your .env file")
+    st.stop()
+
+
+@st.cache_resource
+def get_openai_client(api_key: str) -> OpenAI:
+    # One pooled client per server process: every session and rerun reuses its keep-alive connections
+    return create_openai_client(api_key)
+
+
+openai_client = get_openai_client(openai_api_key)
+
+
+@st.cache_resource
+def start_metrics():
+    # Scrape-time collectors plus the /metrics listener, once per process (off unless ARTRESTORER_METRICS_PORT is set)
+    REGISTRY.register_collector("artrestorer_openai_pool", openai_client.pool_metrics.snapshot)
+    REGISTRY.register_collector("artrestorer_export_cache", get_export_cache().stats)
+    return start_metrics_server()
+
+
+start_metrics()
+
+# ==================== GLOBAL CSS ====================
+@st.cache_resource
+def get_stylesheet_name() -> str:
+    # Published once per process as a content-hashed static file; empty when static serving is off
+    return publish_stylesheet() if st.get_option("server.enableStaticServing") else ""
+
+
+stylesheet_name = get_stylesheet_name()
+if stylesheet_name:
+    components.html(stylesheet_loader_html(stylesheet_name), height=0)
+else:
+    st.markdown(inline_stylesheet_html(), unsafe_allow_html=True)
+
+# ==================== KNOWLEDGE BASE ====================
+# Frozen, process-wide snapshot of the static reference data; reloaded when the data file changes
+kb = get_knowledge()
+
+
+@st.cache_resource(max_entries=2)
+def get_search_index(kb_version: float, _kb) -> SearchIndex:
+    # Built once per knowledge base snapshot and shared by every session
+    return SearchIndex.from_knowledge(_kb)
+
+
+search_index = get_search_index(kb.mtime, kb)
+
+
+def open_tradition(name: str):
+    st.session_state.cultural_insight_select = name
+    st.session_state.kb_search = ""
+
+
+# ==================== SESSION STATE ====================
+if 'page' not in st.session_state:
+    st.session_state.page = 'landing'
+if 'user_data' not in st.session_state:
+    st.session_state.user_data = {}
+if 'report' not in st.session_state:
+    st.session_state.report = None
+rerun_page = st.session_state.page
+
+# Keyed input widgets of each main tab, in tab order. Uploaders cannot be set through
+# Session State, so a pending upload is dropped when its tab closes.
+TAB_WIDGET_KEYS = (
+    ("description_input", "feature_select", "style_input", "damage_input", "context_input", "temp_slider",
+     "batch_concurrency"),
+    (),
+    ("kb_search", "cultural_insight_select"),
+    ("tl_art_type", "tl_damage", "tl_size", "tl_urgency", "tl_team", "tl_goals", "cal_start", "cal_workweek",
+     "cal_preset", "cal_holidays", "solver_deadline", "portfolio_pool"),
+    ("history_search", "history_feature"),
+)
+
+# ==================== ANALYSIS ENGINE ====================
+@st.cache_resource
+def get_analysis_cache() -> AnalysisCache:
+    # One cache per server process, shared by every session
+    cache = open_default_cache()
+    REGISTRY.register_collector("artrestorer_analysis_cache", cache.stats)
+    return cache
+
+
+@st.cache_resource
+def get_feedback_store() -> FeedbackStore:
+    # One store and writer thread per server process
+    store = open_default_feedback_store()
+    REGISTRY.register_collector("artrestorer_feedback", store.stats)
+    return store
+
+
+@st.cache_resource
+def get_history() -> AnalysisHistory:
+    # One connection per server process, shared by every session
+    return open_default_history()
+
+
+def export_data(render, area: str, label: str):
+    """Deferred download data that records a failed render, for show_export_failures() to report on the next run."""
+    failures = st.session_state.setdefault(f'export_failures_{area}', {})
+
+    def data():
+        try:
+            return render()
+        except Exception as e:
+            ERRORS.inc(where="export", error=type(e).__name__)
+            failures[label] = f"{type(e).__name__}: {e}"
+            raise
+    return data
+
+
+def show_export_failures(area: str):
+    for label, message in st.session_state.pop(f'export_failures_{area}', {}).items():
+        st.error(f"❌ {label} export failed: {message}")
+
+
+def render_header():
+    st.markdown("""
+    <div class="site-header">
+        <div>
+            <div class="header-logo">◆ ArtRestorer AI</div>
+            <div class="header-tagline">Cultural Heritage · Digital Preservation</div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+# ==================== LANDING PAGE ====================
+if st.session_state.page == 'landing':
+    render_header()
+
+    # Hero
+    st.markdown("""
+    <div class="hero-wrapper">
+        <div class="hero-bg-orb hero-bg-orb-1"></div>
+        <div class="hero-bg-orb hero-bg-orb-2"></div>
+        <div class="hero-eyebrow">AI · Heritage · Innovation</div>
+        <h1 class="hero-title">Restore the Past,<br><span class="hero-title-accent">Shape the Future</span></h1>
+        <div class="hero-divider"></div>
+        <p class="hero-subtitle">
+            Cutting-edge AI technology meets timeless artistic tradition. Expert guidance for conservators, curators, historians and collectors worldwide.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Features label
+    st.markdown('<p class="features-label">━━━ Core Capabilities ━━━</p>', unsafe_allow_html=True)
+
+    features_showcase = kb.showcase_features
+
+    for i in range(0, len(features_showcase), 3):
+        cols = st.columns(3, gap="medium")
+        for j in range(3):
+            if i + j < len(features_showcase):
+                f = features_showcase[i + j]
+                with cols[j]:
+                    st.markdown(f"""
+                    <div class="feature-card-dark">
+                        <span class="feature-icon-dark">{f['icon']}</span>
+                        <h3>{f['title']}</h3>
+                        <p>{f['desc']}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+    # Why Choose
+    st.markdown('<div style="margin-top: 4rem;"></div>', unsafe_allow_html=True)
+    st.markdown("""
+    <p class="features-label">━━━ Why ArtRestorer AI ━━━</p>
+    """, unsafe_allow_html=True)
+
+    c1, c2, c3 = st.columns(3, gap="medium")
+    with c1:
+        st.markdown("""
+        <div class="why-card">
+            <span class="why-card-icon">🔬</span>
+            <h3>Expert Analysis</h3>
+            <p>AI-powered insights rooted in historical research and global conservation best practices.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with c2:
+        st.markdown("""
+        <div class="why-card">
+            <span class="why-card-icon">⚡</span>
+            <h3>Instant Guidance</h3>
+            <p>Comprehensive restoration analysis delivered in seconds, not days of manual research.</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with c3:
+        st.markdown("""
+        <div class="why-card">
+            <span class="why-card-icon">🌍</span>
+            <h3>Global Heritage</h3>
+            <p>Deep support for diverse cultural traditions spanning every continent and era.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # CTA
+    st.markdown("""
+    <div class="cta-block">
+        <h2>Begin Your Restoration Journey</h2>
+        <p>Join conservators and art enthusiasts worldwide in preserving cultural heritage.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        if st.button("Enter Application →", key="landing_continue"):
+            st.session_state.page = 'welcome'
+            st.rerun()
+
+    st.markdown("""
+    <div class="site-footer">
+        <span>ArtRestorer AI</span> · Powered by OpenAI · Cultural Heritage Preservation
+    </div>
+    """, unsafe_allow_html=True)
+
+
+# ==================== WELCOME PAGE ====================
+elif st.session_state.page == 'welcome':
+    render_header()
+
+    st.markdown('<div style="margin: 2rem 0;"></div>', unsafe_allow_html=True)
+
+    st.markdown("""
+    <div class="welcome-card">
+        <div class="welcome-title">Welcome</div>
+        <p class="welcome-subtitle">Tell us about yourself to personalise your experience</p>
+    """, unsafe_allow_html=True)
+
+    user_name = st.text_input("Your Name", placeholder="Enter your full name", key="name_input")
+
+    artwork_type = st.selectbox("Artwork Type", ("",) + kb.artwork_types, key="artwork_input")
+
+    user_role = st.selectbox("Your Role", ("",) + kb.user_roles, key="role_input")
+
+    user_goal = st.selectbox("Primary Goal", ("",) + kb.user_goals, key="goal_input")
+
+    st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
+
+    if st.button("Begin Analysis →", key="begin_btn"):
+        if user_name and artwork_type and user_role and user_goal:
+            st.session_state.user_data = {
+                'name': user_name,
+                'artwork_type': artwork_type,
+                'role': user_role,
+                'goal': user_goal
+            }
+            st.session_state.page = 'main'
+            st.rerun()
+        else:
+            st.error("Please complete all fields to continue.")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+# ==================== MAIN APPLICATION ====================
+elif st.session_state.page == 'main':
+    render_header()
+    st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
+
+    # Only the open tab's body runs; switching tabs reruns the script to render the newly opened one
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "🖼️  Restoration Assistant",
+        "📚  Feature Gallery",
+        "🏛️  Cultural Insights",
+        "🗓️  Timeline Planner",
+        "🗂️  My History"
+    ], key="main_tab", on_change="rerun")
+
+    # Streamlit drops the state of widgets that are not drawn, so re-store the closed tabs' values
+    quiz_choice = f"choice_{st.session_state.get('q_index', 0)}"
+    for tab, widget_keys in zip((tab1, tab2, tab3, tab4, tab5), TAB_WIDGET_KEYS):
+        if not tab.open:
+            for widget_key in widget_keys + ((quiz_choice,) if tab is tab2 else ()):
+                if widget_key in st.session_state:
+                    st.session_state[widget_key] = st.session_state[widget_key]
+
+    # ==================== TAB 1: RESTORATION ASSISTANT ====================
+    if tab1.open:
+        with tab1, TAB_SECONDS.time(tab="assistant"):
+            user = st.session_state.user_data
+            initials = user['name'][0].upper() if user.get('name') else "?"
+            st.markdown(f"""
+            <div class="user-greeting">
+                <div class="greeting-avatar">{initials}</div>
+                <div class="greeting-text">
+                    <h3>Hello, {user.get('name', '')} 👋</h3>
+                    <p>{user.get('artwork_type', '')} · {user.get('role', '')}</p>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown('<h2>Art Restoration Analysis</h2>', unsafe_allow_html=True)
+
+            @st.fragment
+            @timed_fragment("analysis_form")
+            def analysis_form():
+                """The analysis inputs; editing them, the creativity slider included, reruns only this form."""
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown('<span class="section-eyebrow">Upload Image (Optional)</span>', unsafe_allow_html=True)
+                    uploaded_file = st.file_uploader("", type=['png', 'jpg', 'jpeg'], key="image_upload", label_visibility="collapsed")
+                    if uploaded_file is not None:
+                        st.image(uploaded_file, caption="Uploaded Artwork", use_container_width=True)
+
+                with col2:
+                    artwork_description = st.text_area(
+                        "Artwork Description",
+                        placeholder="Describe the artwork: medium, period, visible damage, dimensions, provenance...",
+                        height=200,
+                        key="description_input"
+                    )
+
+                # Feature Selector
+                st.markdown('<div class="feature-selector">', unsafe_allow_html=True)
+                st.markdown('<h3>Select Analysis Type</h3>', unsafe_allow_html=True)
+                feature_select = st.selectbox(
+                    "Analysis Type",
+                    FEATURE_OPTIONS,
+                    key="feature_select",
+                    label_visibility="collapsed"
+                )
+                feature_key = FEATURE_KEYS[FEATURE_OPTIONS.index(feature_select)]
+                st.markdown(f'<p style="color: var(--text-secondary); font-size: 0.88rem; font-style: italic; margin-top: 0.5rem;">{feature_descriptions[feature_key]}</p>', unsafe_allow_html=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+
+                col3, col4, col5 = st.columns(3)
+                with col3:
+                    art_style = st.selectbox("Art Style / Period", ("",) + kb.art_styles, key="style_input")
+
+                with col4:
+                    damage_type = st.selectbox("Damage Type", ("",) + kb.damage_types, key="damage_input")
+
+                with col5:
+                    cultural_context = st.selectbox("Cultural Context", ("",) + kb.cultural_contexts, key="context_input")
+
+                # Temperature Slider
+                st.markdown('<div class="slider-container">', unsafe_allow_html=True)
+                st.markdown('<span class="section-eyebrow">AI Creativity Level</span>', unsafe_allow_html=True)
+
+                temperature = st.slider("Creativity Level", 0.0, 1.0, 0.6, 0.05, key="temp_slider", label_visibility="collapsed")
+
+                if temperature <= 0.3:
+                    ind_color = "#60a5fa"; ind_icon = "🎯"; ind_title = "Highly Conservative"; ind_sub = "Strict Historical Accuracy"
+                    desc = "Ultra-precise restoration focusing purely on documented historical evidence and proven conservation techniques."
+                elif temperature <= 0.5:
+                    ind_color = "#93c5fd"; ind_icon = "📚"; ind_title = "Conservative & Methodical"; ind_sub = "Evidence-Based Approach"
+                    desc = "Careful restoration based on historical research and comparative analysis with minimal speculation."
+                elif temperature <= 0.7:
+                    ind_color = "#06d6a0"; ind_icon = "⚖️"; ind_title = "Balanced & Professional"; ind_sub = "Art + Science"
+                    desc = "Balanced approach combining historical accuracy with thoughtful creative suggestions. Ideal for most projects."
+                elif temperature <= 0.85:
+                    ind_color = "#8b5cf6"; ind_icon = "🎨"; ind_title = "Creative & Exploratory"; ind_sub = "Artistic Interpretation"
+                    desc = "Imaginative restoration suggestions exploring multiple creative possibilities while respecting historical context."
+                else:
+                    ind_color = "#ec4899"; ind_icon = "✨"; ind_title = "Highly Creative"; ind_sub = "Bold Artistic Vision"
+                    desc = "Maximum creativity with bold artistic interpretations. Generates innovative ideas that push boundaries."
+
+                st.markdown(f"""
+                <div style="background: rgba(15,15,35,0.9); border: 1px solid {ind_color}40; border-radius: 16px; padding: 1.5rem 2rem; margin-top: 1.5rem; display: flex; align-items: center; gap: 1.5rem;">
+                    <div style="font-size: 2.5rem; flex-shrink: 0;">{ind_icon}</div>
+                    <div>
+                        <div style="font-family: var(--font-display); font-size: 1.3rem; color: {ind_color}; font-weight: 600;">{ind_title} <span style="font-size: 0.75rem; font-family: var(--font-mono); letter-spacing: 1px; opacity: 0.7;">{ind_sub}</span></div>
+                        <div style="color: var(--text-secondary); font-size: 0.88rem; margin-top: 0.3rem; line-height: 1.5;">{desc}</div>
+                    </div>
+                    <div style="margin-left: auto; font-family: var(--font-mono); font-size: 1.6rem; color: {ind_color}; font-weight: 600; flex-shrink: 0;">{temperature:.2f}</div>
+                </div>
+                """, unsafe_allow_html=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+
+                # Generate Button
+                st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
+                if st.button("Generate AI Restoration Analysis →", key="generate_btn"):
+                    if artwork_description:
+                        st.session_state.analysis_request = {
+                            'artwork_description': artwork_description,
+                            'art_style': art_style,
+                            'damage_type': damage_type,
+                            'cultural_context': cultural_context,
+                            'feature_key': feature_key,
+                            'feature_label': feature_select,
+                            'temperature': temperature,
+                        }
+                        st.session_state.report = None
+                        st.session_state.page = 'results'
+                        st.rerun()
+                    else:
+                        st.error("Please provide an artwork description to proceed.")
+
+            analysis_form()
+
+            # Batch Mode
+            with st.expander("📦 Batch Analysis — CSV / JSONL catalogue"):
+                st.markdown('<p style="color: var(--text-secondary); font-size: 0.88rem;">One artwork per row with columns <code>description</code>, <code>style</code>, <code>damage_type</code>, <code>cultural_context</code>, <code>analysis_type</code> (key, number or label) and <code>creativity</code> (0.0–1.0). Reports are collected into a downloadable zip archive.</p>', unsafe_allow_html=True)
+                batch_file = st.file_uploader("Catalogue file", type=['csv', 'jsonl', 'ndjson'], key="batch_upload")
+                batch_concurrency = st.number_input("Concurrent requests", min_value=1, max_value=32, value=DEFAULT_CONCURRENCY, key="batch_concurrency")
+
+                if batch_file is not None and st.button("Run Batch Analysis →", key="batch_btn"):
+                    batch_records, batch_errors = parse_batch_file(batch_file.name, batch_file.getvalue())
+                    for err in batch_errors[:10]:
+                        st.warning(f"Skipped — {err}")
+                    if len(batch_errors) > 10:
+                        st.warning(f"…and {len(batch_errors) - 10} more skipped rows.")
+
+                    if batch_records:
+                        progress_bar = st.progress(0.0, text=f"0 / {len(batch_records)} analysed")
+                        failures = []
+
+                        def report_progress(done, total, entry):
+                            progress_bar.progress(done / total, text=f"{done} / {total} analysed · #{entry['index']} {entry['status']}")
+                            if entry['status'] == 'error':
+                                failures.append(entry)
+
+                        # Built in memory and kept in the session until the next run replaces it; nothing on disk to clean up
+                        archive_buffer = io.BytesIO()
+
+                        async def run_batch_job():
+                            async with create_async_openai_client(openai_api_key, int(batch_concurrency)) as async_client:
+                                return await run_batch(batch_records, async_client, archive_buffer, user,
+                                                       concurrency=int(batch_concurrency), cache=get_analysis_cache(),
+                                                       history=get_history(), on_progress=report_progress)
+
+                        manifest = asyncio.run(run_batch_job())
+                        st.session_state.batch_archive = archive_buffer.getvalue()
+                        ok_count = sum(1 for m in manifest if m['status'] == 'ok')
+                        st.success(f"✅ {ok_count} of {len(manifest)} artworks analysed.")
+                        for entry in failures[:10]:
+                            st.error(f"#{entry['index']} (line {entry['source_line']}): {entry['error']}")
+                    else:
+                        st.error("No valid records found in the uploaded file.")
+
+                if st.session_state.get('batch_archive'):
+                    st.download_button(
+                        label="📥 Download Batch Archive",
+                        data=st.session_state.batch_archive,
+                        file_name=f"ArtRestorer_Batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                        mime="application/zip",
+                        key="download_batch"
+                    )
+
+            st.markdown('</div>', unsafe_allow_html=True)
+
+    # ==================== TAB 2: FEATURE GALLERY ====================
+    if tab2.open:
+        with tab2, TAB_SECONDS.time(tab="gallery"):
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown('<span class="section-eyebrow">All Capabilities</span>', unsafe_allow_html=True)
+            st.markdown('<h2 style="font-family: var(--font-display); font-size: 2rem; font-weight: 700; margin-top: 0;">Feature Gallery</h2>', unsafe_allow_html=True)
+
+            @st.fragment
+            @timed_fragment("knowledge_quiz")
+            def knowledge_quiz():
+                """The quiz; answering a question reruns only this fragment."""
+                if 'quiz_questions' not in st.session_state:
+                    pool = list(kb.gallery_cases)
+                    num_q = min(6, max(3, len(pool)))
+                    sample = random.sample(pool, num_q)
+                    titles = [f['title'] for f in kb.gallery_features]
+                    questions = []
+                    for s in sample:
+                        correct = s['feature']
+                        wrongs = [t for t in titles if t != correct]
+                        choices = random.sample(wrongs, min(3, len(wrongs))) + [correct]
+                        random.shuffle(choices)
+                        questions.append({'prompt': s['case'], 'correct': correct, 'choices': choices})
+                    st.session_state.quiz_questions = questions
+                    st.session_state.q_index = 0
+                    st.session_state.score = 0
+                    st.session_state.quiz_feedback = None
+
+                st.markdown("""
+                <div class="quiz-header">
+                    <h3>Knowledge Quiz</h3>
+                    <p>Match each use case to the correct AI restoration feature.</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+                questions = st.session_state.quiz_questions
+                qidx = st.session_state.q_index
+
+                # Feedback on the previous answer, recorded by the submit callback
+                feedback = st.session_state.get('quiz_feedback')
+                if feedback is not None:
+                    correct, answer = feedback
+                    if correct:
+                        st.success('✓ Correct — well done!')
+                    else:
+                        st.error(f"✗ The correct answer was: {answer}")
+
+                if qidx < len(questions):
+                    q = questions[qidx]
+                    st.markdown(f"""
+                    <div style="display: flex; align-items: center; justify-content: space-between; margin-bottom: 1rem;">
+                        <span class="badge-gold">Question {qidx+1} of {len(questions)}</span>
+                        <span class="badge-teal">Score: {st.session_state.score}</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    st.markdown(f"""
+                    <div style="background: rgba(15,15,35,0.7); border: 1px solid var(--border-color); border-radius: 14px; padding: 1.2rem 1.5rem; margin-bottom: 1.5rem; color: var(--text-primary); font-size: 1.05rem; font-style: italic; border-left: 3px solid var(--accent-cyan);">
+                        "{q['prompt']}"
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    def submit_answer():
+                        correct = st.session_state[f'choice_{qidx}'] == q['correct']
+                        st.session_state.score += int(correct)
+                        st.session_state.quiz_feedback = (correct, q['correct'])
+                        st.session_state.q_index += 1
+
+                    st.radio('Which feature best matches this use case?', q['choices'], key=f'choice_{qidx}')
+                    st.button('Submit Answer →', key=f'submit_{qidx}', on_click=submit_answer)
+                else:
+                    total = len(questions)
+                    score = st.session_state.score
+                    pct = int((score / total) * 100)
+                    st.markdown(f"""
+                    <div style="background: linear-gradient(135deg, rgba(6,214,160,0.12), rgba(139,92,246,0.12)); border: 1px solid var(--border-accent); border-radius: 20px; padding: 2rem; text-align: center; margin-bottom: 1.5rem;">
+                        <div style="font-family: var(--font-display); font-size: 3.5rem; background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple)); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; line-height: 1; font-weight: 700;">{score}/{total}</div>
+                        <div style="color: var(--text-muted); font-family: var(--font-mono); font-size: 0.75rem; letter-spacing: 2px; text-transform: uppercase; margin-top: 0.5rem;">Quiz Complete · {pct}% Accuracy</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    def restart_quiz():
+                        for name in ('quiz_questions', 'q_index', 'score', 'quiz_feedback'):
+                            st.session_state.pop(name, None)
+
+                    st.button('Play Again', key='quiz_restart', on_click=restart_quiz)
+
+            knowledge_quiz()
+
+            with st.expander('View Full Feature Gallery'):
+                for feature in kb.gallery_features:
+                    cases_html = "".join([f"<li style='color: var(--text-secondary); font-size: 0.88rem;'>{case}</li>" for case in feature['cases']])
+                    st.markdown(f"""
+                    <div style="background: rgba(15,15,35,0.7); border: 1px solid var(--border-color); border-radius: 16px; padding: 1.5rem; margin-bottom: 1rem; border-left: 3px solid var(--accent-cyan);">
+                        <div style="display: flex; align-items: center; gap: 1rem; margin-bottom: 0.8rem;">
+                            <span style="font-size: 1.8rem;">{feature['icon']}</span>
+                            <div>
+                                <div style="font-family: var(--font-display); font-size: 1.2rem; color: var(--accent-cyan); font-weight: 600;">{feature['title']}</div>
+                                <div style="color: var(--text-secondary); font-size: 0.82rem; margin-top: 0.2rem;">{feature['desc']}</div>
+                            </div>
+                        </div>
+                        <ul style="margin: 0; padding-left: 1.2rem;">{cases_html}</ul>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+            st.markdown('</div>', unsafe_allow_html=True)
+
+    # ==================== TAB 3: CULTURAL INSIGHTS ====================
+    if tab3.open:
+        with tab3, TAB_SECONDS.time(tab="insights"):
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown('<span class="section-eyebrow">Heritage Knowledge Base</span>', unsafe_allow_html=True)
+            st.markdown('<h2 style="font-family: var(--font-display); font-size: 2rem; font-weight: 700; margin-top: 0;">Cultural & Historical Insights</h2>', unsafe_allow_html=True)
+
+            # Knowledge base search
+            search_query = st.text_input(
+                "Search the knowledge base",
+                placeholder="Search traditions, techniques, masterpieces, use cases… (typos are fine)",
+                key="kb_search"
+            )
+            if search_query.strip():
+                started = time.perf_counter()
+                hits = search_index.search(search_query, limit=8)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                st.caption(f"{len(hits)} result{'s' if len(hits) != 1 else ''} · {elapsed_ms:.1f} ms")
+                kind_labels = {"tradition": "Tradition", "feature": "Analysis Feature", "case": "Use Case"}
+                for n, hit in enumerate(hits):
+                    hit_col, open_col = st.columns([6, 1])
+                    with hit_col:
+                        st.markdown(f"""
+                        <div class="search-hit">
+                            <div style="display: flex; align-items: center; gap: 0.6rem; margin-bottom: 0.3rem;">
+                                <span class="badge-teal">{kind_labels[hit.kind]}</span>
+                                <span style="font-family: var(--font-display); color: var(--text-primary); font-weight: 600;">{html.escape(hit.title)}</span>
+                            </div>
+                            <div style="color: var(--text-muted); font-family: var(--font-mono); font-size: 0.65rem; letter-spacing: 1px; text-transform: uppercase;">{hit.field}</div>
+                            <p style="color: var(--text-secondary); font-size: 0.88rem; margin: 0.3rem 0 0; line-height: 1.6;">{hit.snippet}</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    with open_col:
+                        if hit.kind == "tradition":
+                            st.button("Open →", key=f"kb_open_{n}", on_click=open_tradition, args=(hit.ref,))
+                if not hits:
+                    st.info("No matches — try a broader term.")
+
+            insight_type = st.selectbox(
+                "Select Art Period or Cultural Tradition",
+                kb.cultural_traditions,
+                key="cultural_insight_select"
+            )
+
+            if insight_type in kb.cultural_insights:
+                insight = kb.cultural_insights[insight_type]
+                st.markdown(f"""
+                <div class="insight-header">
+                    <div style="font-size: 3rem; margin-bottom: 0.8rem;">{insight['emoji']}</div>
+                    <div style="font-family: var(--font-display); font-size: 2.2rem; color: var(--text-primary); font-weight: 700;">{insight_type}</div>
+                    <div style="margin-top: 0.5rem;"><span class="badge-teal">📅 {insight['period']}</span></div>
+                </div>
+                """, unsafe_allow_html=True)
+
+                sections = [
+                    ("📖", "Historical Background", insight['background'], "var(--accent-cyan)"),
+                    ("⭐", "Cultural Importance", insight['importance'], "var(--accent-purple)"),
+                    ("🛠️", "Restoration Considerations", insight['restoration'], "var(--accent-pink)"),
+                ]
+                for icon, title, content, color in sections:
+                    st.markdown(f"""
+                    <div style="background: rgba(15,15,35,0.7); border: 1px solid {color}25; border-left: 3px solid {color}; border-radius: 14px; padding: 1.5rem 2rem; margin-bottom: 1.2rem;">
+                        <div style="font-family: var(--font-display); font-size: 1.1rem; color: {color}; margin-bottom: 0.8rem; font-weight: 600;">{icon} {title}</div>
+                        <p style="color: var(--text-secondary); font-size: 0.92rem; line-height: 1.75; margin: 0;">{content}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                st.markdown("""
+                <div style="font-family: var(--font-display); font-size: 1.1rem; color: var(--accent-cyan); margin: 1.5rem 0 1rem 0; font-weight: 600;">🎨 Key Artistic Techniques</div>
+                """, unsafe_allow_html=True)
+                cols = st.columns(2)
+                for idx, technique in enumerate(insight['techniques']):
+                    with cols[idx % 2]:
+                        st.markdown(f"""
+                        <div style="background: rgba(15,15,35,0.6); border: 1px solid var(--border-color); border-radius: 12px; padding: 0.8rem 1rem; margin-bottom: 0.8rem; display: flex; align-items: center; gap: 0.8rem;">
+                            <div class="milestone-dot"></div>
+                            <span style="color: var(--text-primary); font-size: 0.9rem;">{technique}</span>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                st.markdown("""
+                <div style="font-family: var(--font-display); font-size: 1.1rem; color: var(--accent-cyan); margin: 1.5rem 0 1rem 0; font-weight: 600;">🖼️ Famous Masterpieces</div>
+                """, unsafe_allow_html=True)
+                for work in insight['famous_works']:
+                    st.markdown(f"""
+                    <div style="background: rgba(15,15,35,0.6); border: 1px solid var(--border-color); border-radius: 12px; padding: 0.8rem 1.2rem; margin-bottom: 0.6rem; display: flex; align-items: center; gap: 1rem;">
+                        <span style="color: var(--accent-cyan); font-size: 1.1rem;">◆</span>
+                        <span style="color: var(--text-primary); font-size: 0.92rem; font-family: var(--font-display); font-size: 1.05rem;">{work}</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+            st.markdown('</div>', unsafe_allow_html=True)
+
+    # ==================== TAB 4: AI RESTORATION TIMELINE PLANNER ====================
+    if tab4.open:
+        with tab4, TAB_SECONDS.time(tab="timeline"):
+            @st.fragment
+            @timed_fragment("timeline_planner")
+            def timeline_planner():
+                """The whole planner; its inputs feed the sweep, the solver and the plan, so any of them reruns only this tab."""
+                st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+                st.markdown('<span class="section-eyebrow">Project Planning Tool</span>', unsafe_allow_html=True)
+                st.markdown('<h2 style="font-family: var(--font-display); font-size: 2rem; font-weight: 700; margin-top: 0;">AI Restoration Timeline Planner</h2>', unsafe_allow_html=True)
+                st.markdown('<p style="color: var(--text-secondary); font-size: 0.92rem; margin-bottom: 2rem; line-height: 1.6;">Configure your project parameters and receive a detailed, phase-by-phase restoration timeline with risk assessments, milestones, and expert scheduling recommendations.</p>', unsafe_allow_html=True)
+
+                # Input Panel
+                st.markdown('<div style="background: rgba(15,15,35,0.7); border: 1px solid var(--border-color); border-radius: 20px; padding: 2rem; margin-bottom: 2rem;">', unsafe_allow_html=True)
+                st.markdown('<div style="font-family: var(--font-display); font-size: 1.3rem; color: var(--accent-cyan); margin-bottom: 1.5rem; font-weight: 600;">Project Parameters</div>', unsafe_allow_html=True)
+
+                tl_col1, tl_col2 = st.columns(2)
+                with tl_col1:
+                    tl_artwork_type = st.selectbox("Artwork Type", ARTWORK_TYPES, key="tl_art_type")
+
+                    tl_damage_severity = st.select_slider("Damage Severity", options=DAMAGE_SEVERITIES,
+                                                          value="Moderate (fading, minor losses)", key="tl_damage")
+
+                    tl_size = st.selectbox("Artwork Scale", SIZES, key="tl_size")
+
+                with tl_col2:
+                    tl_urgency = st.selectbox("Project Urgency", URGENCIES, key="tl_urgency")
+
+                    tl_team_size = st.select_slider("Conservation Team Size", options=TEAM_SIZES,
+                                                    value="2–3 specialists", key="tl_team")
+
+                    tl_goals = st.multiselect("Restoration Goals", GOALS, default=DEFAULT_GOALS, key="tl_goals")
+
+                st.markdown('</div>', unsafe_allow_html=True)
+
+                with st.expander("📅 Working Calendar — dates, working days and closures", expanded=False):
+                    wc1, wc2, wc3 = st.columns(3)
+                    with wc1:
+                        cal_start = st.date_input("Project start", value=datetime.now().date(), key="cal_start")
+                    with wc2:
+                        cal_workweek = st.selectbox("Working days", list(WORKWEEKS), key="cal_workweek")
+                    with wc3:
+                        cal_preset = st.selectbox("Holiday calendar", list(HOLIDAY_PRESETS), key="cal_preset")
+                    cal_holidays_text = st.text_area(
+                        "Institution closures", key="cal_holidays", height=90,
+                        placeholder="One date or range per line, e.g.\n2026-12-21..2027-01-03, winter closure\n2027-04-12"
+                    )
+                    cal_extra, cal_errors = parse_holidays(cal_holidays_text)
+                    for err in cal_errors:
+                        st.warning(f"Ignored {err}")
+                    work_calendar = build_calendar(cal_workweek, cal_preset, cal_extra, cal_start, horizon_weeks=520)
+                    st.caption(f"Planner weeks are working weeks of {work_calendar.days_per_week} days; "
+                               f"closures push later phases out. {len(work_calendar.holidays)} closure days on file.")
+
+                with st.expander("📊 Scenario Sweep & Sensitivity", expanded=False):
+                    summary = sweep.grid_summary(tl_goals)
+                    st.caption(f"All {summary['scenarios']} damage × scale × urgency × team scenarios: "
+                               f"{summary['min_weeks']}–{summary['max_weeks']} weeks, median {summary['median_weeks']:g}. "
+                               "Bars show the range of total weeks when one factor varies and the rest stay as selected above; "
+                               "every scenario covers only the phases the selected goals need, as the plan does.")
+                    rows = sweep.tornado(tl_damage_severity, tl_size, tl_urgency, tl_team_size, tl_goals)
+                    shares = sweep.variance_shares(tl_goals)
+                    span_lo = min(r['low_weeks'] for r in rows)
+                    span = max(1, max(r['high_weeks'] for r in rows) - span_lo)
+                    baseline_pct = (rows[0]['baseline'] - span_lo) / span * 100
+                    for r in rows:
+                        left = (r['low_weeks'] - span_lo) / span * 100
+                        width = max(1.0, r['swing'] / span * 100)
+                        st.markdown(f"""
+                        <div style="margin: 0.6rem 0;">
+                            <div style="display: flex; justify-content: space-between; font-size: 0.8rem; color: var(--text-secondary);">
+                                <span><strong style="color: var(--text-primary);">{r['label']}</strong> · {shares[r['factor']]:.0%} of variance</span>
+                                <span style="font-family: var(--font-mono);">{r['low_weeks']}w – {r['high_weeks']}w (±{r['swing']})</span>
+                            </div>
+                            <div style="position: relative; background: rgba(10,14,26,0.6); border-radius: 6px; height: 14px; margin-top: 0.3rem;">
+                                <div style="position: absolute; left: {left:.1f}%; width: {width:.1f}%; height: 100%; background: linear-gradient(90deg, #06d6a0, #8b5cf6); border-radius: 6px;"></div>
+                                <div style="position: absolute; left: {baseline_pct:.1f}%; top: -3px; width: 2px; height: 20px; background: var(--accent-orange);"></div>
+                            </div>
+                            <div style="display: flex; justify-content: space-between; font-size: 0.7rem; color: var(--text-muted);">
+                                <span>{html.escape(r['low_level'])}</span><span>{html.escape(r['high_level'])}</span>
+                            </div>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    st.caption(f"Total weeks by damage severity and team size at {tl_size} scale, {tl_urgency} urgency:")
+                    st.dataframe(sweep.damage_team_table(tl_size, tl_urgency, tl_goals), hide_index=True, width="stretch")
+
+                with st.expander("🎯 Deadline Solver — what does it take to finish by a date?", expanded=False):
+                    solver_deadline = st.date_input("Must be complete by", value=cal_start + timedelta(weeks=26),
+                                                    min_value=cal_start + timedelta(weeks=1), key="solver_deadline")
+                    deadline_weeks = parse_deadline(solver_deadline.isoformat(), cal_start, work_calendar)
+                    solved = solve_deadline(tl_damage_severity, tl_size, deadline_weeks, tl_goals)
+                    st.caption(f"{deadline_weeks} working weeks away · scope for the selected goals: {', '.join(solved['scope'])} · "
+                               f"{solved['evaluated']} of {solved['search_space']} team/urgency combinations needed a full schedule.")
+                    if solved['solutions']:
+                        st.dataframe([
+                            {"Team": s['team_size'], "Urgency": s['urgency'], "Weeks": s['total_weeks'],
+                             "Spare weeks": s['spare_weeks'], "Cost (conservator-weeks)": s['cost'],
+                             "Also fits": ", ".join(s['optional_phases_fit']) or "—"}
+                            for s in solved['solutions']
+                        ], hide_index=True, width="stretch")
+                    else:
+                        st.error(f"No team size or urgency meets this date. The fastest option takes {solved['fastest_weeks']} weeks; "
+                                 "move the deadline or drop goals.")
+
+                if st.button("Generate Restoration Timeline →", key="gen_timeline"):
+                    plan = plan_timeline(tl_artwork_type, tl_damage_severity, tl_size, tl_urgency, tl_team_size, tl_goals)
+                    active_phases = plan['phases']
+                    total_weeks = plan['total_weeks']
+                    total_months = plan['total_months']
+                    risk_base = plan['risk_level']
+
+                    risk_map = {"HIGH": "risk-high", "MEDIUM": "risk-medium", "LOW": "risk-low"}
+
+                    # Summary stats
+                    st.markdown('<hr class="divider-gold">', unsafe_allow_html=True)
+                    st.markdown("""
+                    <div style="font-family: var(--font-display); font-size: 1.5rem; color: var(--text-primary); margin: 1.5rem 0 1rem 0; font-weight: 700;">
+                        Project Summary
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    s1, s2, s3, s4 = st.columns(4)
+                    for col, val, label in [
+                        (s1, f"{total_weeks}w", "Total Duration"),
+                        (s2, f"{total_months}mo", "Approx. Months"),
+                        (s3, str(len(active_phases)), "Project Phases"),
+                        (s4, risk_base, "Risk Level")
+                    ]:
+                        with col:
+                            st.markdown(f"""
+                            <div class="summary-stat">
+                                <div class="stat-value">{val}</div>
+                                <div class="stat-label">{label}</div>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                    overlap_saving = plan['sequential_weeks'] - total_weeks
+                    if overlap_saving > 0:
+                        st.caption(f"Overlapping phases save {overlap_saving} weeks against running all {len(active_phases)} back to back "
+                                   f"({plan['sequential_weeks']}w). Critical path: {' → '.join(plan['critical_path'])}.")
+
+                    # Urgency note
+                    if plan['urgent_overrun']:
+                        st.warning(f"⚠️ Urgent timeline selected but estimated duration is {total_weeks} weeks. Consider expanding team size or scoping down goals.")
+
+                    # Duration confidence (Monte Carlo over per-phase PERT distributions)
+                    simulation = simulate_plan(plan, seed=0)
+                    st.markdown("""
+                    <div style="font-family: var(--font-display); font-size: 1.5rem; color: var(--text-primary); margin: 2rem 0 1rem 0; font-weight: 700;">
+                        Duration Confidence
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    c1, c2, c3, c4 = st.columns(4)
+                    for col, val, label in [
+                        (c1, f"{simulation['percentiles']['P50']:g}w", "P50 Completion"),
+                        (c2, f"{simulation['percentiles']['P80']:g}w", "P80 Completion"),
+                        (c3, f"{simulation['percentiles']['P95']:g}w", "P95 Completion"),
+                        (c4, f"{simulation['on_time_probability']:.0%}", f"Within {total_weeks}w")
+                    ]:
+                        with col:
+                            st.markdown(f"""
+                            <div class="summary-stat">
+                                <div class="stat-value">{val}</div>
+                                <div class="stat-label">{label}</div>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                    st.bar_chart(histogram_rows(simulation), x="weeks", y="share", x_label="Completion (weeks)",
+                                 y_label="Share of outcomes", color="#8b5cf6", height=220)
+                    st.caption(f"{simulation['samples']:,} simulated projects in {simulation['elapsed_ms']:g} ms · "
+                               f"each phase drawn from a PERT distribution around its estimate, widened for {risk_base} risk.")
+
+                    # Gantt-style visual timeline
+                    st.markdown("""
+                    <div style="font-family: var(--font-display); font-size: 1.5rem; color: var(--text-primary); margin: 2rem 0 1rem 0; font-weight: 700;">
+                        Phase-by-Phase Timeline
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    plan_dates = dated_phases(plan, work_calendar, cal_start)
+                    for i, (phase, dated) in enumerate(zip(active_phases, plan_dates)):
+                        start_w = phase['start_week']
+                        end_w = phase['end_week']
+
+                        priority_colors = {"HIGH": "#ec4899", "MEDIUM": "#f97316", "LOW": "#06d6a0"}
+
+                        tasks_html = ""
+                        for task, priority in phase['tasks']:
+                            color = priority_colors[priority]
+                            tasks_html += f"""
+                            <div style="background: rgba(10,14,26,0.6); border-left: 3px solid {color}; padding: 0.7rem 1.1rem; border-radius: 0 12px 12px 0; margin: 0.5rem 0; display: flex; align-items: center; justify-content: space-between; gap: 1rem;">
+                                <span style="color: var(--text-secondary); font-size: 0.85rem; flex: 1;">{task}</span>
+                                <span class="risk-badge {risk_map[priority]}">{priority}</span>
+                            </div>
+                            """
+
+                        week_bar_pct = int((phase['weeks'] / max(total_weeks, 1)) * 100)
+                        bar_offset_pct = int(((start_w - 1) / max(total_weeks, 1)) * 100)
+                        bar_color = "#ec4899" if phase['critical'] else ("#06d6a0" if i % 2 == 0 else "#8b5cf6")
+                        timing_badge = ('<span class="risk-badge risk-high">Critical path</span>' if phase['critical']
+                                        else f'<span class="timeline-duration-badge">{phase["slack_weeks"]}w float</span>')
+
+                        st.markdown(f"""
+                        <div class="timeline-card">
+                            <div style="display: flex; align-items: flex-start; justify-content: space-between; gap: 1rem; flex-wrap: wrap;">
+                                <div>
+                                    <div class="timeline-phase-label">{phase['phase']} · {phase['icon']}</div>
+                                    <div class="timeline-phase-title">{phase['title']}</div>
+                                    <div style="display: flex; gap: 0.5rem; flex-wrap: wrap; margin-top: 0.5rem;">
+                                        <span class="timeline-duration-badge">Weeks {start_w}–{end_w}</span>
+                                        <span class="timeline-duration-badge">{dated['start_date']:%d %b} – {dated['end_date']:%d %b %Y}</span>
+                                        <span class="timeline-duration-badge">{phase['weeks']} week{'s' if phase['weeks'] != 1 else ''}</span>
+                                        {timing_badge}
+                                    </div>
+                                </div>
+                                <div style="text-align: right; flex-shrink: 0;">
+                                    <div style="font-family: var(--font-mono); font-size: 0.7rem; color: var(--text-muted); letter-spacing: 1px; text-transform: uppercase;">Share of total</div>
+                                    <div style="font-family: var(--font-display); font-size: 1.8rem; color: {bar_color}; font-weight: 700;">{week_bar_pct}%</div>
+                                </div>
+                            </div>
+
+                            <div style="background: rgba(10,14,26,0.6); border-radius: 6px; height: 8px; margin: 1rem 0; overflow: hidden;">
+                                <div style="margin-left: {bar_offset_pct}%; width: {week_bar_pct}%; height: 100%; background: linear-gradient(90deg, {bar_color}cc, {bar_color}); border-radius: 6px;"></div>
+                            </div>
+
+                            <div style="margin-top: 1rem;">
+                                {tasks_html}
+                            </div>
+
+                            <div style="background: rgba(6,214,160,0.08); border: 1px dashed rgba(6,214,160,0.3); border-radius: 12px; padding: 0.8rem 1.2rem; margin-top: 1rem; display: flex; align-items: center; gap: 0.8rem;">
+                                <div class="milestone-dot"></div>
+                                <div>
+                                    <div style="font-family: var(--font-mono); font-size: 0.65rem; color: var(--accent-cyan); letter-spacing: 1px; text-transform: uppercase;">Milestone</div>
+                                    <div style="color: var(--text-primary); font-size: 0.88rem; margin-top: 0.2rem;">{phase['milestone']}</div>
+                                </div>
+                            </div>
+                            <div style="margin-top: 0.8rem; display: flex; align-items: center; gap: 0.5rem;">
+                                <span style="color: var(--text-muted); font-size: 0.75rem; font-family: var(--font-mono); text-transform: uppercase; letter-spacing: 1px;">Deliverable →</span>
+                                <span class="badge-teal">{phase['deliverable']}</span>
+                            </div>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                        if i < len(active_phases) - 1:
+                            st.markdown('<div class="timeline-connector">↓</div>', unsafe_allow_html=True)
+
+                    # Recommendations
+                    st.markdown("""
+                    <div style="font-family: var(--font-display); font-size: 1.5rem; color: var(--text-primary); margin: 2rem 0 1rem 0; font-weight: 700;">
+                        Planning Recommendations
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    for icon, priority, text in plan['recommendations']:
+                        color = {"HIGH": "#ec4899", "MEDIUM": "#f97316", "LOW": "#06d6a0"}[priority]
+                        st.markdown(f"""
+                        <div style="background: rgba(15,15,35,0.7); border: 1px solid {color}30; border-left: 3px solid {color}; border-radius: 12px; padding: 1rem 1.2rem; margin-bottom: 0.8rem; display: flex; align-items: flex-start; gap: 1rem;">
+                            <span style="font-size: 1.3rem; flex-shrink: 0; margin-top: 0.1rem;">{icon}</span>
+                            <div style="flex: 1;">
+                                <span class="risk-badge {risk_map[priority]}" style="margin-bottom: 0.4rem; display: inline-block;">{priority}</span>
+                                <p style="color: var(--text-secondary); font-size: 0.88rem; margin: 0; line-height: 1.6;">{text}</p>
+                            </div>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                    # Download buttons — each format is rendered off the script thread only when clicked
+                    prepared_for = st.session_state.user_data.get('name', 'N/A')
+                    timeline_stem = f"Timeline_{tl_artwork_type.replace(' ','_')}_{datetime.now().strftime('%Y%m%d')}"
+                    timeline_formats = available_formats(TIMELINE_FORMATS)
+                    show_export_failures("timeline")
+                    for col, fmt in zip(st.columns(len(timeline_formats)), timeline_formats):
+                        with col:
+                            st.download_button(
+                                label=f"📥 {fmt.upper()}",
+                                data=export_data(partial(timeline_export, plan, fmt, prepared_for, simulation, work_calendar,
+                                                         cal_start), "timeline", FORMAT_LABELS[fmt]),
+                                file_name=export_file_name(timeline_stem, fmt),
+                                mime=EXPORT_FORMATS[fmt][0],
+                                help=f"Timeline plan as {FORMAT_LABELS[fmt]}",
+                                on_click="ignore",
+                                width="stretch",
+                                key="dl_timeline" if fmt == "txt" else f"dl_timeline_{fmt}"
+                            )
+
+                # Portfolio Mode
+                with st.expander("🗂️ Portfolio Scheduler — many artworks, one conservator pool"):
+                    st.caption("Columns: name, artwork_type, damage, size, urgency, team, deadline (week number or YYYY-MM-DD). "
+                               "Values may be any unique prefix of the planner options; missing ones use the planner defaults.")
+                    portfolio_file = st.file_uploader("Project list", type=['csv', 'jsonl', 'ndjson'], key="portfolio_upload")
+                    portfolio_pool = st.number_input("Conservators available", min_value=1, max_value=500,
+                                                     value=DEFAULT_CONSERVATORS, key="portfolio_pool")
+
+                    if portfolio_file is not None and st.button("Schedule Portfolio →", key="portfolio_btn"):
+                        portfolio_projects, portfolio_errors = parse_portfolio_file(portfolio_file.name, portfolio_file.getvalue(),
+                                                                                    cal_start, work_calendar)
+                        for err in portfolio_errors[:10]:
+                            st.warning(f"Skipped {err}")
+                        if len(portfolio_errors) > 10:
+                            st.warning(f"…and {len(portfolio_errors) - 10} more skipped rows.")
+                        st.session_state.portfolio_schedule = (
+                            schedule_portfolio(portfolio_projects, int(portfolio_pool)) if portfolio_projects else None
+                        )
+                        st.session_state.portfolio_calendar = (work_calendar, cal_start)
+
+                    schedule = st.session_state.get('portfolio_schedule')
+                    if schedule:
+                        p1, p2, p3, p4 = st.columns(4)
+                        for col, val, label in [
+                            (p1, f"{schedule['makespan_weeks']}w", "Portfolio Makespan"),
+                            (p2, f"{schedule['late_projects']}/{len(schedule['projects'])}", "Late Projects"),
+                            (p3, f"{schedule['utilisation']:.0%}", "Team Utilisation"),
+                            (p4, f"{schedule['saturated_weeks']}w", "Weeks at Capacity")
+                        ]:
+                            with col:
+                                st.markdown(f"""
+                                <div class="summary-stat">
+                                    <div class="stat-value">{val}</div>
+                                    <div class="stat-label">{label}</div>
+                                </div>
+                                """, unsafe_allow_html=True)
+
+                        st.line_chart(
+                            [{"week": w, "Busy conservators": b, "Pool": schedule['conservators']}
+                             for w, b in enumerate(schedule['busy_by_week'], 1)],
+                            x="week", y=["Busy conservators", "Pool"], color=["#06d6a0", "#ec4899"], height=220
+                        )
+                        st.dataframe(
+                            sorted(schedule['projects'], key=lambda p: (-p['late_weeks'], p['finish_week'])),
+                            hide_index=True, width="stretch", height=300
+                        )
+                        portfolio_calendar, portfolio_start = st.session_state.get('portfolio_calendar', (work_calendar, cal_start))
+                        portfolio_stem = f"Portfolio_Schedule_{datetime.now().strftime('%Y%m%d')}"
+                        show_export_failures("portfolio")
+                        for col, fmt in zip(st.columns(len(PORTFOLIO_FORMATS)), PORTFOLIO_FORMATS):
+                            with col:
+                                st.download_button(
+                                    label=f"📥 {FORMAT_LABELS[fmt]}",
+                                    data=export_data(partial(portfolio_export, schedule, fmt, portfolio_calendar, portfolio_start),
+                                                     "portfolio", FORMAT_LABELS[fmt]),
+                                    file_name=export_file_name(portfolio_stem, fmt),
+                                    mime=EXPORT_FORMATS[fmt][0],
+                                    on_click="ignore",
+                                    width="stretch",
+                                    key="dl_portfolio" if fmt == "csv" else f"dl_portfolio_{fmt}"
+                                )
+
+                st.markdown('</div>', unsafe_allow_html=True)
+
+            timeline_planner()
+
+    # ==================== TAB 5: ANALYSIS HISTORY ====================
+    if tab5.open:
+        with tab5, TAB_SECONDS.time(tab="history"):
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown('<span class="section-eyebrow">Your Archive</span>', unsafe_allow_html=True)
+            st.markdown('<h2 style="font-family: var(--font-display); font-size: 2rem; font-weight: 700; margin-top: 0;">Analysis History</h2>', unsafe_allow_html=True)
+
+            @st.fragment
+            @timed_fragment("analysis_history")
+            def analysis_history():
+                """Search and page through the user's stored analyses; only this fragment reruns."""
+                history = get_history()
+                user = st.session_state.user_data
+                hc1, hc2 = st.columns([2, 1])
+                with hc1:
+                    history_search = st.text_input("Search reports", key="history_search",
+                                                   placeholder="e.g. lapis lazuli, gold leaf, craquelure…")
+                with hc2:
+                    history_feature = st.selectbox("Analysis Type", ("All types",) + tuple(FEATURE_OPTIONS),
+                                                   key="history_feature")
+                feature_filter = None if history_feature == "All types" else FEATURE_KEYS[FEATURE_OPTIONS.index(history_feature)]
+
+                # Cursors of the pages already visited, so "newer" can step back; reset when the filters change
+                filters = (history_search, feature_filter)
+                if st.session_state.get('history_filters') != filters:
+                    st.session_state.history_filters = filters
+                    st.session_state.history_cursors = [None]
+                cursors = st.session_state.history_cursors
+                page = history.page(user, cursors[-1], feature_key=feature_filter, search=history_search)
+
+                st.caption(f"{history.count(user):,} analyses stored for {user.get('name') or 'this profile'} · "
+                           f"page {len(cursors)}")
+                st.caption("History is keyed on the profile name only, not a login: anyone who enters the "
+                           "same name on this server sees these reports.")
+                if not page.entries:
+                    st.info("No analyses match yet." if history_search or feature_filter
+                            else "Analyses you generate are saved here automatically.")
+
+                for entry in page.entries:
+                    details = " · ".join(v for v in (entry['art_style'], entry['damage_type'], entry['cultural_context']) if v)
+                    status = "" if entry['complete'] else " · <em>incomplete</em>"
+                    ec1, ec2 = st.columns([6, 1])
+                    with ec1:
+                        st.markdown(f"""
+                        <div style="background: rgba(15,15,35,0.7); border: 1px solid var(--border-color); border-left: 3px solid var(--accent-cyan); border-radius: 12px; padding: 0.9rem 1.2rem; margin-bottom: 0.6rem;">
+                            <div style="display: flex; justify-content: space-between; gap: 1rem; font-size: 0.78rem; color: var(--text-muted); font-family: var(--font-mono);">
+                                <span>{entry['created_at']:%d %b %Y · %H:%M}{status}</span><span>{html.escape(entry['feature_label'])}</span>
+                            </div>
+                            <div style="color: var(--text-primary); font-size: 0.95rem; margin-top: 0.3rem;">{html.escape(entry['description'])}</div>
+                            <div style="color: var(--text-secondary); font-size: 0.8rem; margin-top: 0.2rem;">{html.escape(details)}</div>
+                            <div style="color: var(--text-secondary); font-size: 0.82rem; margin-top: 0.4rem; font-style: italic;">{html.escape(entry['excerpt'])}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    with ec2:
+                        # Opening leaves the fragment for the results page, so it needs a full-app rerun
+                        if st.button("Open →", key=f"history_open_{entry['id']}"):
+                            report = history.get(entry['id'], user)
+                            if report is not None:
+                                st.session_state.report = report
+                                st.session_state.page = 'results'
+                                st.rerun(scope="app")
+                            st.error("This analysis is no longer available.")
+
+                pc1, pc2, pc3 = st.columns([1, 2, 1])
+                with pc1:
+                    if st.button("← Newer", key="history_newer", disabled=len(cursors) == 1):
+                        cursors.pop()
+                        st.rerun(scope="fragment")
+                with pc3:
+                    if st.button("Older →", key="history_older", disabled=page.next_cursor is None):
+                        cursors.append(page.next_cursor)
+                        st.rerun(scope="fragment")
+
+            analysis_history()
+            st.markdown('</div>', unsafe_allow_html=True)
+
+
+# ==================== RESULTS PAGE ====================
+elif st.session_state.page == 'results':
+    render_header()
+    st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
+
+    st.markdown("""
+    <div style="text-align: center; margin-bottom: 2.5rem;">
+        <span class="section-eyebrow">Analysis Complete</span>
+        <div class="section-title">Restoration Report</div>
+        <p style="color: var(--text-secondary); font-size: 1rem; max-width: 500px; margin: 0 auto;">Expert AI guidance generated for your artwork</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    user = st.session_state.user_data
+    initials = user['name'][0].upper() if user.get('name') else "?"
+    st.markdown(f"""
+    <div style="background: linear-gradient(135deg, rgba(6,214,160,0.1), rgba(139,92,246,0.1)); border: 1px solid var(--border-accent); border-radius: 20px; padding: 1.5rem 2rem; margin-bottom: 2rem; display: flex; align-items: center; gap: 1.5rem; flex-wrap: wrap;">
+        <div style="width: 52px; height: 52px; background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple)); border-radius: 14px; display: flex; align-items: center; justify-content: center; font-family: var(--font-display); font-size: 1.5rem; color: white; font-weight: 700; flex-shrink: 0; box-shadow: 0 4px 20px rgba(6,214,160,0.3);">{initials}</div>
+        <div style="flex: 1; min-width: 200px;">
+            <div style="font-family: var(--font-display); font-size: 1.3rem; color: var(--text-primary); font-weight: 600;">{user.get('name', '')}</div>
+            <div style="color: var(--text-secondary); font-size: 0.82rem; margin-top: 0.2rem;">{user.get('artwork_type', '')} · {user.get('role', '')} · {user.get('goal', '')}</div>
+        </div>
+        <div><span class="badge-teal">📅 {datetime.now().strftime('%b %d, %Y')}</span></div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col_a, col_b = st.columns([5, 1])
+    with col_a:
+        st.markdown('<div style="font-family: var(--font-display); font-size: 1.5rem; color: var(--accent-cyan); margin-bottom: 0.5rem; font-weight: 700;">Detailed Analysis Report</div>', unsafe_allow_html=True)
+    with col_b:
+        export_slot = st.empty()
+
+    st.markdown('<hr class="divider-gold">', unsafe_allow_html=True)
+
+    result_slot = st.empty()
+
+    # Stream a freshly requested analysis straight into the report view. The request stays in the
+    # session until its report is stored, so a rerun that interrupts the stream starts it again.
+    pending = st.session_state.get('analysis_request')
+    if pending is not None:
+        started_at = datetime.now()
+        complete = True
+        cache = get_analysis_cache()
+        cache_key = analysis_cache_key(pending)
+        body = cache.get(cache_key)
+        if body is not None:
+            ANALYSIS_REQUESTS.inc(source="cache")
+            st.caption("⚡ Served from the analysis cache — identical inputs were analysed recently.")
+        else:
+            ANALYSIS_REQUESTS.inc(source="api")
+            body = ""
+            result_slot.markdown(render_html(build_report(pending, body, user=user, generated_at=started_at), streaming=True),
+                                 unsafe_allow_html=True)
+            last_paint = 0.0
+            try:
+                for delta in stream_analysis(openai_client, pending, user):
+                    body += delta
+                    # Repaint at most ~20×/s; finished sections come from the render cache, only the open one is rebuilt
+                    now = time.monotonic()
+                    if now - last_paint >= 0.05:
+                        draft = build_report(pending, body, user=user, generated_at=started_at)
+                        result_slot.markdown(render_html(draft, streaming=True), unsafe_allow_html=True)
+                        last_paint = now
+            except OpenAIError as e:
+                ERRORS.inc(where="generation", error=type(e).__name__)
+                st.error(f"❌ Analysis generation failed: {e}")
+                complete = False
+            else:
+                cache.put(cache_key, body)
+        st.session_state.report = build_report(pending, body, complete=complete, user=user, generated_at=started_at)
+        if body:
+            get_history().save(st.session_state.report, user, pending['feature_key'])
+        st.session_state.pop('analysis_request', None)
+
+    report = st.session_state.report
+    if report is not None:
+        result_slot.markdown(render_html(report), unsafe_allow_html=True)
+        generated = datetime.fromisoformat(report.generated_at)
+        report_stem = f"ArtRestorer_{generated.strftime('%Y%m%d_%H%M%S')}"
+        # Each format is rendered off the script thread only when clicked, then cached by report digest
+        show_export_failures("report")
+        with export_slot.popover("📥 Export"):
+            for fmt in available_formats():
+                st.download_button(
+                    label=FORMAT_LABELS[fmt],
+                    data=export_data(partial(report_export, report, fmt), "report", FORMAT_LABELS[fmt]),
+                    file_name=export_file_name(report_stem, fmt),
+                    mime=EXPORT_FORMATS[fmt][0],
+                    on_click="ignore",
+                    width="stretch",
+                    key="download_report" if fmt == "txt" else f"download_report_{fmt}"
+                )
+
+    st.markdown('<div style="margin-top: 2rem; text-align: center;"></div>', unsafe_allow_html=True)
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        if st.button("← Analyse Another Artwork", key="back_btn"):
+            st.session_state.page = 'main'
+            st.rerun()
+
+    # Feedback
+    st.markdown("""
+    <div style="text-align: center; margin: 4rem 0 1rem;">
+        <div style="font-family: var(--font-display); font-size: 2rem; color: var(--text-primary); font-weight: 700;">Share Your Experience</div>
+        <p style="color: var(--text-secondary); font-size: 0.9rem; margin-top: 0.5rem;">Help us improve ArtRestorer AI</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col_fb1, col_fb2, col_fb3 = st.columns([1, 1, 1])
+    with col_fb2:
+        if st.button("📝 Open Feedback Form", key="open_feedback_results"):
+            st.session_state.show_feedback_results = True
+
+    if 'show_feedback_results' not in st.session_state:
+        st.session_state.show_feedback_results = False
+
+    if st.session_state.get('feedback_status') == "sent":
+        del st.session_state.feedback_status
+        st.success("✅ Thank you for your feedback! It helps us improve.")
+        st.balloons()
+
+    if st.session_state.show_feedback_results:
+        st.markdown('<div class="feedback-modal-inner">', unsafe_allow_html=True)
+        st.markdown("""
+        <div style="text-align: center; margin-bottom: 2rem;">
+            <div style="font-family: var(--font-display); font-size: 2rem; background: linear-gradient(135deg, var(--accent-cyan), var(--accent-purple)); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; font-weight: 700;">We Value Your Feedback</div>
+            <p style="color: var(--text-secondary); font-size: 0.9rem; margin-top: 0.5rem;">Your input shapes the future of ArtRestorer AI</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        col_fb1, col_fb2 = st.columns(2)
+        with col_fb1:
+            st.text_input("Your Name", key="feedback_name_results", placeholder="Enter your name")
+            st.text_input("Email (Optional)", key="feedback_email_results", placeholder="your@email.com")
+            st.select_slider(
+                "Overall Rating", options=FEEDBACK_RATINGS, value=FEEDBACK_RATINGS[2], key="feedback_rating_results"
+            )
+        with col_fb2:
+            st.selectbox("Feedback Category", FEEDBACK_CATEGORIES, key="feedback_category_results")
+            st.radio(
+                "Would you recommend ArtRestorer AI?", RECOMMEND, horizontal=True, key="feedback_recommend_results"
+            )
+
+        st.text_area(
+            "Your Comments & Suggestions",
+            placeholder="Share your thoughts or report issues...",
+            height=150, key="feedback_comments_results"
+        )
+
+        col_fb_btn1, col_fb_btn2, col_fb_btn3 = st.columns([1, 1, 1])
+        with col_fb_btn1:
+            if st.button("Cancel", key="cancel_feedback_results"):
+                st.session_state.show_feedback_results = False
+                st.rerun()
+        with col_fb_btn2:
+            def submit_feedback():
+                # Queued for the background writer; the session returns straight away
+                form = st.session_state
+                try:
+                    get_feedback_store().submit(
+                        form.feedback_name_results, form.feedback_comments_results, form.feedback_rating_results,
+                        form.feedback_category_results, form.feedback_recommend_results, form.feedback_email_results
+                    )
+                except ValueError:
+                    st.session_state.feedback_status = "invalid"
+                else:
+                    st.session_state.feedback_status = "sent"
+                    st.session_state.show_feedback_results = False
+
+            st.button("Submit Feedback →", key="submit_feedback_results", on_click=submit_feedback)
+        if st.session_state.pop('feedback_status', None) == "invalid":
+            st.error("Please provide your name and comments.")
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with st.expander("📊 What other users say — feedback by category"):
+        feedback_store = get_feedback_store()
+        overview = feedback_store.summary()
+        if overview['responses']:
+            f1, f2, f3 = st.columns(3)
+            for col, val, label in [
+                (f1, f"{overview['responses']:,}", "Responses"),
+                (f2, f"{overview['average_rating']:.2f} ★", "Average Rating"),
+                (f3, f"{overview['would_recommend']:.0%}", "Would Recommend")
+            ]:
+                with col:
+                    st.markdown(f"""
+                    <div class="summary-stat">
+                        <div class="stat-value">{val}</div>
+                        <div class="stat-label">{label}</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+            by_category = feedback_store.ratings_by_category()
+            st.bar_chart(by_category, x="category", y=[f"{n}★" for n in range(1, 6)], horizontal=True, height=260)
+            st.dataframe(by_category, hide_index=True, width="stretch",
+                         column_config={"would_recommend": st.column_config.NumberColumn(format="percent")})
+        else:
+            st.caption("No feedback yet — be the first to share yours.")
+
+    st.markdown("""
+    <div class="site-footer">
+        <span>ArtRestorer AI</span> · Powered by OpenAI · Cultural Heritage Preservation
+    </div>
+    """, unsafe_allow_html=True)
+
+# Full runs that finish normally; a run cut short by st.rerun() is measured by the run it starts
+RERUN_SECONDS.observe(time.perf_counter() - rerun_started, page=rerun_page)
+
+if run_profiler is not None:
+    del st.session_state.active_profiler
+    st.session_state.profiles.insert(0, run_profiler.stop())
+if is_admin:
+    render_profiler_panel()
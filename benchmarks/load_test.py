@@ -0,0 +1,534 @@
+"""Multi-session load test for artrestorer_redesigned.py.
+
+Starts the app under `streamlit run` and simulates N conservators against it,
+each a browser tab speaking Streamlit's own websocket protocol. Every widget
+change sends the full widget state, as the frontend does. Widgets inside a
+fragment rerun only that fragment, and a run counts as done when its final
+script_finished arrives (st.rerun hand-offs are followed). Each session goes
+through the welcome form, then runs --journeys journeys: the creativity slider,
+every main tab, the planner, a streamed analysis and the feedback form, pausing
+a randomised think time between interactions. Sessions start staggered over
+--ramp seconds.
+
+Generation goes over HTTP to the local OpenAI mock (artrestorer.mockserver),
+in its own process so mock streaming does not share the app's GIL. Analysis
+cache, feedback and history files go to a temporary directory, and every
+journey describes a different artwork so the analysis cache never
+short-circuits the stream.
+
+Each concurrency level in --sessions gets fresh sessions and reports:
+
+* throughput: completed script runs per second across all sessions, and analyses per minute;
+* rerun latency: p50/p95/p99 of the interactive runs, from sending the widget
+  change to the run's end as a browser sees it; the streamed generation run is
+  reported on its own;
+* memory: growth of the server's RSS per connected session, peak and with the
+  sessions still connected.
+
+A capacity-planning summary follows, giving the most sessions one process
+serves within --slo-ms p95, and what that means for a host of --cores cores
+and --host-memory-gib GiB.
+
+    python benchmarks/load_test.py                              # 1, 2, 4, 8 and 16 sessions
+    python benchmarks/load_test.py --sessions 8,16,32,64 --journeys 3 --think 3
+    python benchmarks/load_test.py --ttft 0.8 --tps 40 --rate-limit 0.05 --json load.json
+
+Freed memory is not returned to the OS, so levels run from smallest to largest
+and the per-session figures are best read from the largest level.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+from rerun_latency import ROOT, environment
+
+APP = os.path.join(ROOT, "artrestorer_redesigned.py")
+
+DEFAULT_LEVELS = "1,2,4,8,16"
+SLO_MS = 500.0              # p95 of interactive reruns a level must stay within
+MEMORY_HEADROOM = 0.8       # share of host memory given to app processes
+GENERATE = "generate analysis (streamed)"
+
+MAIN_TABS = ("🖼️  Restoration Assistant", "📚  Feature Gallery", "🏛️  Cultural Insights", "🗓️  Timeline Planner",
+             "🗂️  My History")
+
+
+class LoadError(Exception):
+    """A session could not carry on, e.g. an expected widget was not rendered."""
+
+
+# ---------- measurements ----------
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of a process, or None when it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        out = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True, timeout=5).stdout
+        return int(out.strip()) * 1024
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def cpu_seconds(pid: int) -> Optional[float]:
+    """User plus system CPU time of a process (Linux only), or None."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def host_memory_bytes() -> Optional[int]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linear-interpolated percentile, q in [0, 100]."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+async def watch_rss(pid: int, peak: List[int], interval: float = 0.1):
+    while True:
+        rss = rss_bytes(pid)
+        if rss:
+            peak[0] = max(peak[0], rss)
+        await asyncio.sleep(interval)
+
+
+# ---------- processes ----------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_up(process: subprocess.Popen, url: str, what: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).close()
+            return
+        except OSError:
+            if process.poll() is not None:
+                raise SystemExit(f"{what} exited during start-up")
+            time.sleep(0.2)
+    process.kill()
+    raise SystemExit(f"{what} did not start within {timeout:.0f} s")
+
+
+def start_mock(args) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    command = [sys.executable, "-m", "artrestorer", "mock-openai", "--port", str(port), "--ttft", str(args.ttft),
+               "--tps", str(args.tps), "--jitter", str(args.jitter), "--rate-limit", str(args.rate_limit),
+               "--errors", str(args.errors), "--seed", str(args.seed)]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _wait_until_up(process, f"http://127.0.0.1:{port}/health", "the mock OpenAI server")
+    return process, f"http://127.0.0.1:{port}/v1"
+
+
+def start_app(base_url: str, workdir: str) -> Tuple[subprocess.Popen, int]:
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": env.get("OPENAI_API_KEY") or "sk-load-test",
+        "OPENAI_BASE_URL": base_url,
+        "ARTRESTORER_CACHE_PATH": os.path.join(workdir, "cache.sqlite3"),
+        "ARTRESTORER_FEEDBACK_PATH": os.path.join(workdir, "feedback.sqlite3"),
+        "ARTRESTORER_HISTORY_PATH": os.path.join(workdir, "history.sqlite3"),
+    })
+    env.pop("ARTRESTORER_METRICS_PORT", None)
+    command = [sys.executable, "-m", "streamlit", "run", APP, "--server.headless", "true",
+               "--server.port", str(port), "--server.fileWatcherType", "none",
+               "--browser.gatherUsageStats", "false", "--logger.level", "error"]
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _wait_until_up(process, f"http://127.0.0.1:{port}/_stcore/health", "the Streamlit server")
+    return process, port
+
+
+def mock_stats(base_url: str) -> Dict[str, int]:
+    try:
+        with urllib.request.urlopen(base_url.rsplit("/v1", 1)[0] + "/stats", timeout=5) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return {}
+
+
+# ---------- a simulated browser tab ----------
+
+class BrowserSession:
+    """Speaks the frontend's side of /_stcore/stream for one session."""
+
+    def __init__(self, url: str, timeout: float):
+        self.url, self.timeout = url, timeout
+        self.ws = None
+        self.widgets: Dict[str, Tuple[str, str, object, str]] = {}   # key -> (id, kind, proto, fragment id)
+        self.states: Dict[str, object] = {}                          # widget id -> WidgetState we have set
+        self.exceptions: List[str] = []
+
+    async def connect(self):
+        import websockets
+
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def _track(self, delta, seen: set):
+        kind = delta.WhichOneof("type")
+        if kind == "new_element":
+            element = delta.new_element
+            name = element.WhichOneof("type")
+            proto = getattr(element, name)
+            if name == "exception":
+                self.exceptions.append(proto.message)
+            widget_id = getattr(proto, "id", "") if name else ""
+        elif kind == "add_block":
+            block = delta.add_block
+            name, proto, widget_id = block.WhichOneof("type"), block, block.id
+        else:
+            return
+        if widget_id.startswith("$$ID-"):
+            key = widget_id.split("-", 2)[2]
+            self.widgets[key] = (widget_id, name, proto, delta.fragment_id)
+            seen.add(widget_id)
+
+    async def run(self, trigger: Optional[str] = None, fragment_id: str = "") -> float:
+        """One script run from the current widget state; returns ms until its final script_finished."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.fragment_id = fragment_id
+        for widget_state in self.states.values():
+            state.widget_states.widgets.add().CopyFrom(widget_state)
+        if trigger:
+            state.widget_states.widgets.add(id=trigger, trigger_value=True)
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        seen: set = set()
+        full_run = not fragment_id
+        while True:
+            data = await asyncio.wait_for(self.ws.recv(), self.timeout)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "delta":
+                self._track(forward.delta, seen)
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    full_run = True   # st.rerun(): the app reruns in full
+                    continue
+                break
+        elapsed = (time.perf_counter() - started) * 1000
+        if full_run:
+            # Like the frontend, forget the state of widgets the page no longer shows
+            self.states = {i: s for i, s in self.states.items() if i in seen}
+        return elapsed
+
+    def _widget(self, key: str) -> Tuple[str, str, object, str]:
+        try:
+            return self.widgets[key]
+        except KeyError:
+            raise LoadError(f"widget {key!r} is not on the page") from None
+
+    def options(self, key: str) -> List[str]:
+        return list(self._widget(key)[2].options)
+
+    async def set(self, key: str, value) -> float:
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget_id, kind, _, fragment_id = self._widget(key)
+        state = WidgetState(id=widget_id)
+        if kind == "slider":
+            state.double_array_value.data.append(float(value))
+        else:   # text_input, text_area, selectbox, radio and tabs all send strings
+            state.string_value = str(value)
+        self.states[widget_id] = state
+        return await self.run(fragment_id=fragment_id)
+
+    async def click(self, key: str) -> float:
+        widget_id, _, _, fragment_id = self._widget(key)
+        return await self.run(trigger=widget_id, fragment_id=fragment_id)
+
+
+# ---------- the simulated conservator ----------
+
+def onboarding(session: BrowserSession, name: str):
+    yield "landing", lambda: session.run()
+    yield "landing -> welcome", lambda: session.click("landing_continue")
+    yield "welcome: name", lambda: session.set("name_input", name)
+    for key in ("artwork_input", "role_input", "goal_input"):
+        yield f"welcome: {key.split('_')[0]}", lambda key=key: session.set(key, session.options(key)[1])
+    yield "welcome -> main", lambda: session.click("begin_btn")
+
+
+def journey(session: BrowserSession, name: str, number: int, rng: random.Random):
+    yield "assistant: creativity slider", lambda: session.set("temp_slider", rng.choice((0.3, 0.5, 0.7, 0.9)))
+    for label in MAIN_TABS[1:]:
+        yield f"tab: {label.split(maxsplit=1)[1].lower()}", lambda label=label: session.set("main_tab", label)
+        if label == MAIN_TABS[3]:
+            yield "planner: artwork scale", lambda: session.set("tl_size", rng.choice(session.options("tl_size")))
+    yield "tab: restoration assistant", lambda: session.set("main_tab", MAIN_TABS[0])
+    yield "assistant: description", lambda: session.set(
+        "description_input", f"Oil on canvas, 17th c., flaking varnish (load test journey {number})")
+    yield GENERATE, lambda: session.click("generate_btn")
+    yield "feedback: open form", lambda: session.click("open_feedback_results")
+    yield "feedback: name", lambda: session.set("feedback_name_results", name)
+    yield "feedback: comments", lambda: session.set("feedback_comments_results", "Load test feedback")
+    yield "feedback: submit", lambda: session.click("submit_feedback_results")
+    yield "results -> main", lambda: session.click("back_btn")
+
+
+async def simulate(index: int, level: int, port: int, args, samples: List[Dict[str, object]],
+                   errors: List[str], sessions: List[BrowserSession], start_delay: float = 0.0):
+    rng = random.Random(args.seed * 1_000_003 + level * 1009 + index)
+    name = f"Load Conservator {level}-{index}"
+    await asyncio.sleep(start_delay)
+    session = BrowserSession(f"ws://127.0.0.1:{port}/_stcore/stream", args.timeout)
+    sessions.append(session)
+    steps = [onboarding(session, name)]
+    steps += [journey(session, name, (level * 1000 + index) * 100 + n, rng) for n in range(args.journeys)]
+    try:
+        await session.connect()
+        for step_name, action in (step for part in steps for step in part):
+            before = len(session.exceptions)
+            started = time.perf_counter()
+            ms = await action()
+            samples.append({"step": step_name, "started": started, "ms": ms})
+            if len(session.exceptions) > before:
+                errors.append(f"{step_name}: {session.exceptions[-1].splitlines()[0]}")
+            if args.think:
+                await asyncio.sleep(args.think * rng.uniform(0.5, 1.5))
+    except Exception as e:  # a missing widget, a run timing out, the server dropping the websocket
+        errors.append(f"session {index}: {type(e).__name__}: {e}")
+
+
+async def run_level(level: int, port: int, pid: int, args) -> Dict[str, object]:
+    before = rss_bytes(pid)
+    server_cpu, client_cpu = cpu_seconds(pid), time.process_time()
+    peak = [before or 0]
+    watcher = asyncio.ensure_future(watch_rss(pid, peak))
+    samples: List[Dict[str, object]] = []
+    errors: List[str] = []
+    sessions: List[BrowserSession] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(simulate(i, level, port, args, samples, errors, sessions, args.ramp * i / level)
+                           for i in range(level)))
+    wall = time.perf_counter() - started
+    server_cpu = cpu_seconds(pid) - server_cpu if server_cpu is not None else None
+    client_cpu = time.process_time() - client_cpu
+    connected = rss_bytes(pid)     # every session still open, as idle browser tabs would be
+    watcher.cancel()
+    for session in sessions:
+        await session.close()
+
+    interactive = [s["ms"] for s in samples if s["step"] != GENERATE]
+    generation = [s["ms"] for s in samples if s["step"] == GENERATE]
+    by_step: Dict[str, List[float]] = {}
+    for s in samples:
+        by_step.setdefault(s["step"], []).append(s["ms"])
+    per_mib = (lambda value: round((value - before) / 2 ** 20 / level, 2)) if before else (lambda value: None)
+    return {
+        "sessions": level,
+        "wall_s": round(wall, 2),
+        "runs": len(samples),
+        "runs_per_s": round(len(samples) / wall, 2),
+        "analyses_per_min": round(len(generation) / wall * 60, 1),
+        "rerun_p50_ms": round(percentile(interactive, 50), 1),
+        "rerun_p95_ms": round(percentile(interactive, 95), 1),
+        "rerun_p99_ms": round(percentile(interactive, 99), 1),
+        "rerun_max_ms": round(max(interactive, default=float("nan")), 1),
+        "generation_p50_ms": round(percentile(generation, 50), 1),
+        "generation_p95_ms": round(percentile(generation, 95), 1),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "server_cpu_pct": round(server_cpu / wall * 100, 1) if server_cpu is not None else None,
+        "load_generator_cpu_pct": round(client_cpu / wall * 100, 1),
+        "server_rss_before_mib": round(before / 2 ** 20, 1) if before else None,
+        "peak_mib_per_session": per_mib(peak[0]),
+        "connected_mib_per_session": per_mib(connected) if connected else None,
+        "steps": {name: {"n": len(v), "p50_ms": round(percentile(v, 50), 1), "p95_ms": round(percentile(v, 95), 1)}
+                  for name, v in by_step.items()},
+    }
+
+
+# ---------- reporting ----------
+
+def _cell(value: Optional[float], spec: str, width: int) -> str:
+    return f"{value:>{width}{spec}}" if value is not None else f"{'n/a':>{width}}"
+
+
+def print_levels(levels: List[Dict[str, object]]):
+    print(f"{'sessions':>8} {'runs/s':>7} {'an/min':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'gen p50 s':>9} {'gen p95 s':>9} {'errors':>6} {'MiB/sess':>9} {'srv CPU':>8}")
+    for level in levels:
+        print(f"{level['sessions']:>8} {level['runs_per_s']:>7.1f} {level['analyses_per_min']:>7.1f} "
+              f"{level['rerun_p50_ms']:>8.0f} {level['rerun_p95_ms']:>8.0f} {level['rerun_p99_ms']:>8.0f} "
+              f"{level['generation_p50_ms'] / 1000:>9.2f} {level['generation_p95_ms'] / 1000:>9.2f} "
+              f"{level['errors']:>6} {_cell(level['peak_mib_per_session'], '.2f', 9)} "
+              f"{_cell(level['server_cpu_pct'], '.0f', 7)}%")
+        for error in level["error_samples"]:
+            print(f"{'':>8} ! {error}")
+
+
+def print_steps(level: Dict[str, object]):
+    print(f"\nper interaction at {level['sessions']} session(s)")
+    print(f"{'interaction':<34} {'runs':>5} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, s in level["steps"].items():
+        print(f"{name:<34} {s['n']:>5} {s['p50_ms']:>8.0f} {s['p95_ms']:>8.0f}")
+
+
+def capacity(levels: List[Dict[str, object]], args) -> Dict[str, object]:
+    """Sessions per process within the SLO, scaled to a host by cores and memory."""
+    within = [lv for lv in levels if lv["rerun_p95_ms"] <= args.slo_ms and not lv["errors"]]
+    best = max(within, key=lambda lv: lv["sessions"]) if within else None
+    largest = levels[-1]
+    per_session = [v for v in (largest["peak_mib_per_session"], largest["connected_mib_per_session"]) if v is not None]
+    cores = args.cores or os.cpu_count() or 1
+    memory_gib = args.host_memory_gib or (host_memory_bytes() or 0) / 2 ** 30
+    summary = {
+        "slo_p95_ms": args.slo_ms,
+        "think_s": args.think,
+        "sessions_per_process": best["sessions"] if best else 0,
+        "saturated": best is not largest,
+        "runs_per_s_per_process": best["runs_per_s"] if best else 0,
+        "mib_per_session": max(max(per_session), 0.01) if per_session else None,
+        "process_base_mib": levels[0]["server_rss_before_mib"],
+        "load_generator_cpu_pct": max(lv["load_generator_cpu_pct"] for lv in levels),
+        "cores": cores,
+        "host_memory_gib": round(memory_gib, 1),
+    }
+    if best:
+        # Script runs hold the GIL, so one server process uses about one core: scale out one process per core
+        by_cpu = cores * best["sessions"]
+        summary.update({"host_sessions_by_cpu": by_cpu, "host_sessions": by_cpu, "bound_by": "cpu"})
+        if summary["mib_per_session"] and summary["process_base_mib"]:
+            budget_mib = memory_gib * 1024 * MEMORY_HEADROOM - cores * summary["process_base_mib"]
+            by_memory = max(0, int(budget_mib / summary["mib_per_session"]))
+            summary["host_sessions_by_memory"] = by_memory
+            if by_memory < by_cpu:
+                summary.update({"host_sessions": by_memory, "bound_by": "memory"})
+    return summary
+
+
+def print_capacity(summary: Dict[str, object]):
+    print("\ncapacity planning")
+    slo, think = summary["slo_p95_ms"], summary["think_s"]
+    if not summary["sessions_per_process"]:
+        print(f"  no level met p95 <= {slo:.0f} ms without errors; even the smallest level is over budget")
+        return
+    qualifier = "" if summary["saturated"] else "at least "
+    print(f"  one process: {qualifier}{summary['sessions_per_process']} active sessions within p95 <= {slo:.0f} ms "
+          f"({summary['runs_per_s_per_process']:.1f} script runs/s, {think:g} s mean think time)")
+    if not summary["saturated"]:
+        print("  the largest level tested still met the SLO; rerun with more --sessions to find the knee")
+    if summary["mib_per_session"] is not None:
+        print(f"  memory: {summary['process_base_mib']:.0f} MiB per server process + "
+              f"{summary['mib_per_session']:.1f} MiB per connected session")
+    line = (f"  host with {summary['cores']} cores and {summary['host_memory_gib']:g} GiB, one process per core: "
+            f"~{summary['host_sessions_by_cpu']} sessions by CPU")
+    if "host_sessions_by_memory" in summary:
+        line += f", ~{summary['host_sessions_by_memory']} by memory ({MEMORY_HEADROOM:.0%} of RAM)"
+    print(f"{line} -> plan for ~{summary['host_sessions']} ({summary['bound_by']}-bound)")
+    print("  idle but connected tabs cost memory, not CPU: count them against the memory figure only")
+    local_cores = os.cpu_count() or 1
+    if summary["load_generator_cpu_pct"] > 25 and local_cores < 4:
+        print(f"  note: the load generator used up to {summary['load_generator_cpu_pct']:.0f}% of a core on this "
+              f"{local_cores}-core machine and competed with the server; use a machine with a core to spare for "
+              "sizing figures")
+
+
+async def load(port: int, pid: int, levels_wanted: List[int], args) -> List[Dict[str, object]]:
+    # One untimed session first: imports, compiles and fills the process-wide caches, as in production
+    warm_errors: List[str] = []
+    warm_args = argparse.Namespace(**{**vars(args), "journeys": 1, "think": 0})
+    await simulate(0, 0, port, warm_args, [], warm_errors, [])
+    if warm_errors:
+        raise SystemExit(f"warm-up session failed: {warm_errors[0]}")
+    levels = []
+    for level in levels_wanted:
+        print(f"running {level} session(s)...", file=sys.stderr)
+        levels.append(await run_level(level, port, pid, args))
+    return levels
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", default=DEFAULT_LEVELS, help=f"concurrency levels (default {DEFAULT_LEVELS})")
+    parser.add_argument("--journeys", type=int, default=2, help="analyses per session (default 2)")
+    parser.add_argument("--think", type=float, default=1.0, help="mean think time between interactions, s (0 = flat out)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which a level's sessions start")
+    parser.add_argument("--timeout", type=float, default=180.0, help="give up on a run after this many seconds")
+    parser.add_argument("--slo-ms", type=float, default=SLO_MS, help="p95 rerun latency budget (default 500)")
+    parser.add_argument("--cores", type=int, help="cores per host for the summary (default: this machine)")
+    parser.add_argument("--host-memory-gib", type=float, help="memory per host (default: this machine)")
+    mock = parser.add_argument_group("mock backend")
+    mock.add_argument("--base-url", help="use an already running OpenAI-compatible endpoint instead")
+    mock.add_argument("--ttft", type=float, default=0.4)
+    mock.add_argument("--tps", type=float, default=400.0, help="tokens per second (default 400)")
+    mock.add_argument("--jitter", type=float, default=0.2)
+    mock.add_argument("--rate-limit", type=float, default=0.0)
+    mock.add_argument("--errors", type=float, default=0.0)
+    mock.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+    levels_wanted = sorted({int(n) for n in args.sessions.split(",") if n.strip()})
+
+    processes = []
+    try:
+        base_url = args.base_url
+        if not base_url:
+            mock_process, base_url = start_mock(args)
+            processes.append(mock_process)
+        app, port = start_app(base_url, tempfile.mkdtemp(prefix="artrestorer-load-"))
+        processes.append(app)
+        levels = asyncio.run(load(port, app.pid, levels_wanted, args))
+        backend = mock_stats(base_url)
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait()
+
+    print_levels(levels)
+    print_steps(levels[-1])
+    summary = capacity(levels, args)
+    print_capacity(summary)
+    if backend:
+        print(f"  backend: {backend.get('requests', 0)} requests, {backend.get('rate_limited', 0)} rate-limited, "
+              f"{backend.get('errors', 0)} 5xx, {backend.get('completion_tokens', 0):,} tokens streamed")
+    if args.json:
+        result = {"environment": environment(), "settings": {k: v for k, v in vars(args).items() if k != "json"},
+                  "levels": levels, "capacity": summary, "backend": backend}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""Rerun-latency benchmark for artrestorer_redesigned.py.
+
+Drives the app headlessly with Streamlit's AppTest through one user journey:
+landing -> welcome -> every main tab plus the slider, planner and history
+fragments -> a streamed analysis on the results page -> the feedback form.
+For each interaction it records:
+
+* wall time: median and min over --repeat journeys, after --warmup journeys
+  that fill the process-wide resource caches;
+* peak memory: tracemalloc peak above the step's starting point, taken on one
+  extra traced journey so tracing does not distort the timings;
+* delta payload: the number and serialized size of the ForwardMsgs the run
+  queues for the browser.
+
+Process-wide work is done once, as under `streamlit run`: the script is
+compiled once and custom components are discovered once. Left alone, AppTest
+recompiles on every run and rediscovers components for every session.
+
+OpenAI is stubbed in-process. The real SDK talks to an httpx MockTransport that
+streams a deterministic report over SSE, so the run is offline and the app's
+parsing and repaint paths are exercised exactly as in production. Cache,
+feedback and history files go to a temporary directory, and every journey
+describes a different artwork so the analysis cache never short-circuits the
+stream.
+
+    python benchmarks/rerun_latency.py                     # compare with baselines.json
+    python benchmarks/rerun_latency.py --update-baseline   # record new baselines
+    python benchmarks/rerun_latency.py --repeat 10 --json results.json
+
+Exits 1 when any step regresses beyond its thresholds. Wall-time baselines are
+host-specific, so record them on the machine that runs the comparison (the
+deploy CI runner).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP = os.path.join(ROOT, "artrestorer_redesigned.py")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+TIME_THRESHOLD = 0.25       # relative slowdown allowed on the median
+MIN_TIME_DELTA_MS = 15.0    # and ignored below this absolute difference (scheduler noise)
+MEMORY_THRESHOLD = 0.25
+MIN_MEMORY_DELTA_KIB = 256.0
+PAYLOAD_THRESHOLD = 0.10
+MIN_PAYLOAD_DELTA_BYTES = 2048
+
+
+# ---------- offline OpenAI ----------
+
+def stub_report() -> str:
+    from artrestorer.engine import ANALYSIS_SECTIONS, REPORT_RULE
+
+    points = ("Document the current state under raking and UV light before any intervention.",
+              "Consolidate lifting paint with a reversible adhesive tested on a discreet area.",
+              "Record every material used so later conservators can reverse the treatment.")
+    sections = [f"{n}. {title}\n" + "\n".join(f"   • {p}" for p in points)
+                for n, title in enumerate(ANALYSIS_SECTIONS, 1)]
+    return "\n\n".join(sections) + f"\n\n{REPORT_RULE}\n\nCONCLUSION:\nStabilise first, then restore reversibly."
+
+
+def _sse_body(model: str, text: str) -> bytes:
+    words = text.split(" ")
+    chunks = []
+    for i, word in enumerate(words):
+        delta = {"content": word if i == len(words) - 1 else word + " "}
+        chunks.append({"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": 0, "model": model,
+                       "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+    chunks.append({"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": 0, "model": model,
+                   "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+    chunks.append({"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": 0, "model": model,
+                   "choices": [], "usage": {"prompt_tokens": 600, "completion_tokens": len(words),
+                                            "total_tokens": 600 + len(words)}})
+    return b"".join(f"data: {json.dumps(c)}\n\n".encode("utf-8") for c in chunks) + b"data: [DONE]\n\n"
+
+
+def install_openai_stub():
+    """Make the app's pooled client talk to an in-process transport instead of the network."""
+    import httpx
+    from openai import OpenAI
+
+    import artrestorer.client as client_module
+
+    body = stub_report()
+
+    def handler(request: "httpx.Request") -> "httpx.Response":
+        payload = json.loads(request.content)
+        return httpx.Response(200, headers={"content-type": "text/event-stream"},
+                              content=_sse_body(payload.get("model", "stub"), body))
+
+    def create_openai_client(api_key: str, base_url: Optional[str] = None) -> OpenAI:
+        limits = client_module.pool_limits()
+        metrics = client_module.PoolMetrics(limits)
+        http_client = httpx.Client(transport=httpx.MockTransport(handler), limits=limits,
+                                   event_hooks={"request": [metrics.on_request], "response": [metrics.on_response]})
+        metrics.attach(http_client)
+        client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+        client.pool_metrics = metrics
+        return client
+
+    client_module.create_openai_client = create_openai_client
+
+
+_shared_components = []
+
+
+def share_script_cache():
+    """Compile the script once, as a server process does.
+
+    AppTest builds a new ScriptCache for every run, which re-applies Streamlit's
+    magic AST rewrite each time (~0.5 s for this script) and would swamp the
+    rerun cost being measured.
+    """
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    shared = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: shared
+
+
+# ---------- payload accounting ----------
+
+class PayloadMeter:
+    """Counts every ForwardMsg a script run queues for the browser."""
+
+    def __init__(self):
+        self.messages = 0
+        self.deltas = 0
+        self.bytes = 0
+
+    def install(self):
+        from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+
+        meter, enqueue = self, ForwardMsgQueue.enqueue
+
+        def counting_enqueue(queue, msg):
+            meter.messages += 1
+            meter.deltas += msg.WhichOneof("type") == "delta"
+            meter.bytes += msg.ByteSize()
+            return enqueue(queue, msg)
+
+        ForwardMsgQueue.enqueue = counting_enqueue
+
+    def reset(self) -> Tuple[int, int, int]:
+        snapshot = (self.messages, self.deltas, self.bytes)
+        self.messages = self.deltas = self.bytes = 0
+        return snapshot
+
+
+# ---------- the journey ----------
+
+def _tab(label: str) -> Callable:
+    def step(at):
+        at.session_state["main_tab"] = label
+        return at.run()
+    return step
+
+
+def _welcome(at):
+    at.text_input(key="name_input").input("Bench Conservator")
+    for key in ("artwork_input", "role_input", "goal_input"):
+        widget = at.selectbox(key=key)
+        widget.select(widget.options[1])
+    return at.button(key="begin_btn").click().run()
+
+
+def _generate(journey: int) -> Callable:
+    def step(at):
+        at.text_area(key="description_input").input(f"Oil on canvas, 17th c., flaking varnish (journey {journey})")
+        return at.button(key="generate_btn").click().run()
+    return step
+
+
+def _feedback_submit(at):
+    at.text_input(key="feedback_name_results").input("Bench Conservator")
+    at.text_area(key="feedback_comments_results").input("Benchmark feedback")
+    return at.button(key="submit_feedback_results").click().run()
+
+
+def journey_steps(journey: int) -> List[Tuple[str, Callable]]:
+    return [
+        ("landing", lambda at: at.run()),
+        ("landing -> welcome", lambda at: at.button(key="landing_continue").click().run()),
+        ("welcome -> main", _welcome),
+        ("assistant: creativity slider", lambda at: at.slider(key="temp_slider").set_value(0.8).run()),
+        ("tab: feature gallery", _tab("📚  Feature Gallery")),
+        ("tab: cultural insights", _tab("🏛️  Cultural Insights")),
+        ("tab: timeline planner", _tab("🗓️  Timeline Planner")),
+        ("planner: artwork scale", lambda at: at.selectbox(key="tl_size").select_index(2).run()),
+        ("tab: my history", _tab("🗂️  My History")),
+        ("tab: restoration assistant", _tab("🖼️  Restoration Assistant")),
+        ("generate -> results (streamed)", _generate(journey)),
+        ("results: rerun", lambda at: at.run()),
+        ("feedback: open form", lambda at: at.button(key="open_feedback_results").click().run()),
+        ("feedback: submit", _feedback_submit),
+    ]
+
+
+def run_journey(journey: int, meter: PayloadMeter, traced: bool = False) -> Dict[str, Dict[str, float]]:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    if _shared_components:
+        # Component discovery (~0.5 s) happens once per server, not once per session
+        at._bidi_component_manager = _shared_components[0]
+    results = {}
+    for name, step in journey_steps(journey):
+        meter.reset()
+        if traced:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        at = step(at)
+        elapsed = time.perf_counter() - started
+        if at.exception:
+            raise RuntimeError(f"step {name!r} raised: {at.exception[0].value}")
+        if not _shared_components:
+            _shared_components.append(at._bidi_component_manager)
+        messages, deltas, size = meter.reset()
+        results[name] = {"ms": elapsed * 1000, "messages": messages, "deltas": deltas, "bytes": size}
+        if traced:
+            results[name]["peak_kib"] = (tracemalloc.get_traced_memory()[1] - base) / 1024
+    return results
+
+
+def measure(repeat: int, warmup: int) -> Dict[str, Dict[str, float]]:
+    meter = PayloadMeter()
+    meter.install()
+    journey = 0
+    for _ in range(warmup):
+        journey += 1
+        run_journey(journey, meter)
+    timed = []
+    for _ in range(repeat):
+        journey += 1
+        timed.append(run_journey(journey, meter))
+    tracemalloc.start()
+    try:
+        journey += 1
+        traced = run_journey(journey, meter, traced=True)
+    finally:
+        tracemalloc.stop()
+    steps = {}
+    for name in timed[0]:
+        times = [run[name]["ms"] for run in timed]
+        last = timed[-1][name]
+        steps[name] = {
+            "median_ms": round(statistics.median(times), 2),
+            "min_ms": round(min(times), 2),
+            "peak_kib": round(traced[name]["peak_kib"], 1),
+            "messages": last["messages"],
+            "deltas": last["deltas"],
+            "bytes": last["bytes"],
+        }
+    return steps
+
+
+# ---------- baselines ----------
+
+def _regressed(current: float, baseline: float, relative: float, absolute: float) -> bool:
+    return current > baseline * (1 + relative) and current - baseline > absolute
+
+
+def compare(steps: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            args) -> List[str]:
+    problems = []
+    for name, now in steps.items():
+        then = baseline.get(name)
+        if then is None:
+            continue
+        checks = (
+            ("median_ms", args.time_threshold, MIN_TIME_DELTA_MS, "ms"),
+            ("peak_kib", args.memory_threshold, MIN_MEMORY_DELTA_KIB, "KiB"),
+            ("bytes", args.payload_threshold, MIN_PAYLOAD_DELTA_BYTES, "B"),
+        )
+        for field, relative, absolute, unit in checks:
+            if _regressed(now[field], then[field], relative, absolute):
+                problems.append(f"{name}: {field} {now[field]:,.1f} {unit} vs baseline {then[field]:,.1f} {unit} "
+                                f"(+{now[field] / then[field] - 1:.0%})")
+    return problems
+
+
+def environment() -> Dict[str, str]:
+    import streamlit
+
+    return {"recorded_at": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+            "streamlit": streamlit.__version__, "machine": platform.machine(), "system": platform.system()}
+
+
+def print_table(steps: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]):
+    print(f"{'step':<34} {'median ms':>10} {'min ms':>8} {'vs base':>8} {'peak KiB':>9} {'msgs':>6} {'bytes':>9}")
+    for name, s in steps.items():
+        then = baseline.get(name)
+        change = f"{s['median_ms'] / then['median_ms'] - 1:+.0%}" if then and then["median_ms"] else "—"
+        print(f"{name:<34} {s['median_ms']:>10.1f} {s['min_ms']:>8.1f} {change:>8} {s['peak_kib']:>9.0f} "
+              f"{s['messages']:>6} {s['bytes']:>9,}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed journeys (default 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed journeys first (default 1)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD)
+    parser.add_argument("--payload-threshold", type=float, default=PAYLOAD_THRESHOLD)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="artrestorer-bench-")
+    os.environ.update({
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "sk-benchmark-stub",
+        "ARTRESTORER_CACHE_PATH": os.path.join(workdir, "cache.sqlite3"),
+        "ARTRESTORER_FEEDBACK_PATH": os.path.join(workdir, "feedback.sqlite3"),
+        "ARTRESTORER_HISTORY_PATH": os.path.join(workdir, "history.sqlite3"),
+    })
+    os.environ.pop("ARTRESTORER_METRICS_PORT", None)
+    install_openai_stub()
+    share_script_cache()
+
+    steps = measure(max(1, args.repeat), max(0, args.warmup))
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("steps", {})
+    print_table(steps, baseline)
+
+    result = {"environment": environment(), "repeat": args.repeat, "steps": steps}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not baseline:
+        print("no baseline yet; run with --update-baseline to record one")
+        return 0
+    problems = compare(steps, baseline, args)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
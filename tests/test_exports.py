@@ -0,0 +1,42 @@
+from datetime import date
+
+import pytest
+
+from artrestorer.exports import ExportCache, _ics_fold, _ics_text, timeline_export
+from artrestorer.timeline import DAMAGE_SEVERITIES, SIZES, TEAM_SIZES, URGENCIES, plan_timeline
+
+
+def unfold(text):
+    return text.replace("\r\n ", "")
+
+
+@pytest.mark.parametrize("line", [
+    "SUMMARY:" + "x" * 67,
+    "SUMMARY:" + "x" * 200,
+    "DESCRIPTION:" + "é" * 80,
+    "DESCRIPTION:Retouche – " + "漆画修复" * 30,
+    "X:" + "a" * 72 + "🎨" * 10,
+])
+def test_fold_keeps_lines_within_75_octets_and_whole_characters(line):
+    folded = _ics_fold(line)
+    parts = folded.split("\r\n")
+    assert all(len(p.encode("utf-8")) <= 75 for p in parts)
+    assert all(p.startswith(" ") for p in parts[1:])
+    assert unfold(folded) == line
+    if len(line.encode("utf-8")) <= 75:
+        assert folded == line
+
+
+def test_text_escaping():
+    assert _ics_text("a,b;c\\d\ne") == r"a\,b\;c\\d\ne"
+
+
+def test_timeline_ics_is_folded():
+    plan = plan_timeline("Painting", DAMAGE_SEVERITIES[3], SIZES[2], URGENCIES[1], TEAM_SIZES[1])
+    ics = timeline_export(plan, "ics", project_name="Retable de l’Agneau mystique — " + "é" * 40,
+                          start=date(2027, 1, 4), cache=ExportCache()).decode("utf-8")
+    lines = ics.split("\r\n")
+    assert lines[0] == "BEGIN:VCALENDAR"
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert unfold(ics).count("BEGIN:VEVENT") >= len(plan["phases"])
+
@@ -0,0 +1,46 @@
+import numpy as np
+
+from artrestorer.montecarlo import RISK_SPREAD, histogram_rows, sample_phase_weeks, simulate_plan
+from artrestorer.timeline import DAMAGE_SEVERITIES, SIZES, TEAM_SIZES, URGENCIES, plan_timeline
+
+
+def test_samples_stay_within_pert_bounds():
+    mode = [2.0, 5.0, 10.0]
+    draws = sample_phase_weeks(mode, "HIGH", samples=20_000, seed=1)
+    low, high = RISK_SPREAD["HIGH"]
+    assert draws.shape == (20_000, 3)
+    assert (draws >= np.array(mode) * low).all()
+    assert (draws <= np.array(mode) * high).all()
+
+
+def test_sample_mean_matches_pert_mean():
+    mode = np.array([4.0, 12.0])
+    draws = sample_phase_weeks(list(mode), "MEDIUM", samples=200_000, seed=7)
+    low, high = RISK_SPREAD["MEDIUM"]
+    pert_mean = (mode * low + 4 * mode + mode * high) / 6
+    assert np.allclose(draws.mean(axis=0), pert_mean, rtol=5e-3)
+
+
+def test_seed_makes_draws_reproducible():
+    a = sample_phase_weeks([3.0, 6.0], "LOW", samples=1000, seed=42)
+    b = sample_phase_weeks([3.0, 6.0], "LOW", samples=1000, seed=42)
+    assert np.array_equal(a, b)
+
+
+def test_simulate_plan_summary_is_consistent():
+    plan = plan_timeline("Painting", DAMAGE_SEVERITIES[3], SIZES[2], URGENCIES[1], TEAM_SIZES[1])
+    result = simulate_plan(plan, samples=20_000, seed=3)
+    pct = result["percentiles"]
+    assert pct["P50"] <= pct["P80"] <= pct["P95"]
+    assert sum(result["histogram"]["counts"]) == 20_000
+    assert 0.0 <= result["on_time_probability"] <= 1.0
+    # Every spread is skewed to the pessimistic side, so the plan's own estimate is usually overrun
+    assert result["mean_weeks"] > plan["total_weeks"]
+    assert result["on_time_probability"] < 0.5
+    assert [p["phase"] for p in result["phase_p80"]] == [p["phase"] for p in plan["phases"]]
+    assert all(p["p80_weeks"] >= p["weeks"] * RISK_SPREAD[plan["risk_level"]][0] for p in result["phase_p80"])
+
+
+def test_histogram_rows_are_shares_at_bin_midpoints():
+    result = {"histogram": {"counts": [1, 3], "edges": [10.0, 12.0, 14.0]}}
+    assert histogram_rows(result) == [{"weeks": 11.0, "share": 0.25}, {"weeks": 13.0, "share": 0.75}]
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from artrestorer.network import PhaseNetwork
+from artrestorer.timeline import PHASE_NETWORK
+
+# A -> B back to back; C may start once half of A is done; D waits for both B and C.
+DIAMOND = PhaseNetwork([
+    {"phase": "A"},
+    {"phase": "B", "depends_on": [("A", 0.0)]},
+    {"phase": "C", "depends_on": [("A", -0.5)]},
+    {"phase": "D", "depends_on": [("B", 0.0), ("C", 0.0)]},
+])
+
+
+def test_critical_path_on_a_known_network():
+    s = DIAMOND.schedule((4, 3, 6, 2))
+    assert s.start == (0, 4, 2, 8)
+    assert s.finish == (4, 7, 8, 10)
+    assert s.total == 10
+    assert s.slack == (0, 1, 0, 0)
+    assert s.critical == (True, False, True, True)
+
+
+def test_skipped_phase_is_never_critical():
+    s = DIAMOND.schedule((4, 3, 0, 2))
+    assert s.total == 9
+    assert s.critical == (True, True, False, True)
+
+
+def test_fractional_lags_round_only_when_asked():
+    durations = np.array([[3.0], [1.0], [5.0], [1.0]])
+    assert DIAMOND.project_weeks(durations, round_lags=True).tolist() == [7.0]
+    assert DIAMOND.project_weeks(durations, round_lags=False).tolist() == [7.5]
+
+
+def test_vectorized_pass_matches_scalar_schedule():
+    rng = np.random.default_rng(3)
+    durations = rng.integers(0, 12, size=(len(PHASE_NETWORK.ids), 200))
+    totals = PHASE_NETWORK.project_weeks(durations)
+    for k in range(durations.shape[1]):
+        assert totals[k] == PHASE_NETWORK.schedule(tuple(int(d) for d in durations[:, k])).total
+
+
+@pytest.mark.parametrize("templates", [
+    [{"phase": "A", "depends_on": [("B", 0.0)]}, {"phase": "B"}],
+    [{"phase": "A"}, {"phase": "B", "depends_on": [("A", -1.5)]}],
+])
+def test_rejects_forward_edges_and_starts_before_the_predecessor(templates):
+    with pytest.raises(ValueError):
+        PhaseNetwork(templates)
@@ -0,0 +1,74 @@
+import random
+from datetime import date
+
+import pytest
+
+from artrestorer import portfolio
+from artrestorer.portfolio import TEAM_HEADCOUNT, _shadow, parse_deadline, schedule_portfolio
+from artrestorer.timeline import DAMAGE_SEVERITIES, SIZES, TEAM_SIZES, URGENCIES
+
+CREW = {n: team for team, n in TEAM_HEADCOUNT.items()}
+
+
+def project(index, name, crew, deadline=None, **fields):
+    return dict({'index': index, 'name': name, 'artwork_type': name, 'damage_severity': DAMAGE_SEVERITIES[1],
+                 'size': SIZES[1], 'urgency': URGENCIES[1], 'team_size': CREW[crew], 'deadline_week': deadline},
+                **fields)
+
+
+@pytest.fixture
+def one_phase_plans(monkeypatch):
+    """Plans keyed by artwork_type: each project is a single phase of the given weeks."""
+    weeks = {}
+
+    def fake_plan(artwork_type, *args):
+        return {'phases': [{'phase': "Phase 01", 'title': "Work", 'weeks': weeks[artwork_type]}]}
+    monkeypatch.setattr(portfolio, "plan_timeline", fake_plan)
+    return weeks
+
+
+def test_shadow_finds_earliest_release_and_spare_crew():
+    running = [(6, 1, 2), (4, 0, 3)]
+    assert _shadow(running, free=1, need=4) == (4, 0)
+    assert _shadow(running, free=1, need=3) == (4, 1)
+    assert _shadow(running, free=0, need=9) == (float("inf"), 0)
+
+
+def test_backfill_never_delays_the_reserved_phase(one_phase_plans):
+    one_phase_plans.update(A=4, B=2, C=3, D=10)
+    projects = [
+        project(1, "A", 3, deadline=4),    # ranked first, starts at once
+        project(2, "B", 5, deadline=7),    # needs the whole pool: reserved for when A finishes
+        project(3, "C", 1),                # short enough to backfill before the reservation
+        project(4, "D", 1),                # ranked above C (more work) but would overrun the reservation
+    ]
+    starts = {e['name']: e['start_week'] for e in schedule_portfolio(projects, conservators=5)['entries']}
+    assert starts == {"A": 1, "C": 1, "B": 5, "D": 7}
+
+
+def test_schedule_respects_pool_and_phase_order():
+    rng = random.Random(11)
+    projects = [
+        dict(project(i, f"P{i}", 1, deadline=rng.choice([None, rng.randint(10, 120)])),
+             artwork_type="Painting (Oil, Acrylic, Watercolor)", damage_severity=rng.choice(DAMAGE_SEVERITIES),
+             size=rng.choice(SIZES), urgency=rng.choice(URGENCIES), team_size=rng.choice(TEAM_SIZES))
+        for i in range(40)
+    ]
+    schedule = schedule_portfolio(projects, conservators=9)
+    assert max(schedule['busy_by_week']) <= 9
+    assert len(schedule['busy_by_week']) == schedule['makespan_weeks']
+    by_project = {}
+    for e in schedule['entries']:
+        by_project.setdefault(e['index'], []).append(e)
+    for entries in by_project.values():
+        for prev, nxt in zip(entries, entries[1:]):
+            assert nxt['start_week'] > prev['end_week']
+    for s in schedule['projects']:
+        assert s['finish_week'] == s['work_weeks'] + s['wait_weeks']
+
+
+def test_parse_deadline_counts_calendar_weeks_without_a_calendar():
+    start = date(2027, 1, 4)
+    assert parse_deadline("12", start) == 12
+    assert parse_deadline("2027-03-01", start) == 8
+    assert parse_deadline("", start) is None
@@ -0,0 +1,65 @@
+import math
+
+from artrestorer.search import (
+    FUZZY_WEIGHT, PREFIX_WEIGHT, Document, SearchIndex, _within_one_edit, highlight, tokenize
+)
+
+DOCS = [
+    Document("tradition", "Byzantine Icons", "byz", (("Techniques", "egg tempera and gold leaf on gesso panels"),)),
+    Document("tradition", "Japanese Lacquer", "jap", (("Techniques", "urushi lacquer with gold powder"),)),
+    Document("case", "Flaking fresco", "fresco", (("Use Case", "lime plaster, buon fresco, salt damage"),)),
+]
+
+
+def index():
+    return SearchIndex(DOCS)
+
+
+def test_tokenize_folds_case_and_accents_and_drops_stopwords():
+    assert tokenize("The Café of Época") == ["cafe", "epoca"]
+
+
+def test_within_one_edit():
+    assert _within_one_edit("gesso", "gesso")
+    assert _within_one_edit("gesso", "gessi")       # substitution
+    assert _within_one_edit("gesso", "geso")        # deletion
+    assert _within_one_edit("gesso", "gessoo")      # insertion
+    assert _within_one_edit("gesso", "gseso")       # adjacent transposition
+    assert not _within_one_edit("gesso", "gusto")
+    assert not _within_one_edit("gesso", "ges")
+
+
+def test_idf_is_bm25_plus_one_smoothed():
+    idx = index()
+    n, df = len(DOCS), 2  # "gold" occurs in two documents
+    assert math.isclose(idx.idf["gold"], math.log(1 + (n - df + 0.5) / (df + 0.5)))
+
+
+def test_expand_weights_exact_prefix_and_fuzzy_matches():
+    idx = index()
+    assert idx.expand("lacquer") == {"lacquer": 1.0}
+    assert idx.expand("lacq") == {"lacquer": PREFIX_WEIGHT}
+    assert idx.expand("lacquar") == {"lacquer": FUZZY_WEIGHT}
+
+
+def test_search_ranks_title_matches_first_and_filters_kinds():
+    idx = index()
+    hits = idx.search("gold")
+    assert {h.ref for h in hits} == {"byz", "jap"}
+    assert idx.search("fresco")[0].ref == "fresco"
+    assert idx.search("fresco", kinds=["tradition"]) == []
+    assert [h.ref for h in idx.search("japanese lacquar")][:1] == ["jap"]
+
+
+def test_search_snippet_marks_matched_words():
+    hit = index().search("tempera")[0]
+    assert hit.field == "Techniques"
+    assert "<mark>tempera</mark>" in hit.snippet
+
+
+def test_highlight_escapes_and_trims_long_text():
+    text = "x " * 200 + "<gold> leaf"
+    start = text.index("gold")
+    snippet = highlight(text, [(start, start + 4)])
+    assert "&lt;<mark>gold</mark>&gt;" in snippet
+    assert snippet.startswith("…")
@@ -0,0 +1,49 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from artrestorer import sweep
+from artrestorer.timeline import (
+    DEFAULT_GOALS, GOALS, PHASE_TEMPLATES, damage_map, plan_timeline, size_map, team_map, urgency_map
+)
+
+LEVELS = [list(enumerate(m)) for m in (damage_map, size_map, urgency_map, team_map)]
+
+
+@pytest.mark.parametrize("goals", [[], DEFAULT_GOALS, GOALS[:1], GOALS[1:3]])
+def test_grid_matches_plan_timeline(goals):
+    totals = sweep.total_weeks_grid(goals)
+    phases = sweep.phase_weeks_grid(goals)
+    for (d, dmg), (s, size), (u, urg), (t, team) in itertools.islice(itertools.product(*LEVELS), 0, None, 7):
+        plan = plan_timeline("Painting", dmg, size, urg, team, goals)
+        assert totals[d, s, u, t] == plan["total_weeks"]
+        scheduled = {tpl["phase"]: int(w) for tpl, w in zip(PHASE_TEMPLATES, phases[:, d, s, u, t]) if w}
+        assert scheduled == {p["phase"]: p["weeks"] for p in plan["phases"]}
+
+
+def test_grids_are_cached_and_read_only():
+    assert sweep.total_weeks_grid(GOALS[:2]) is sweep.total_weeks_grid(list(reversed(GOALS[:2])))
+    with pytest.raises(ValueError):
+        sweep.total_weeks_grid()[0, 0, 0, 0] = 1
+
+
+def test_tornado_profiles_are_grid_slices():
+    base = tuple(list(m)[1] for m in (damage_map, size_map, urgency_map, team_map))
+    rows = sweep.tornado(*base)
+    assert [r["swing"] for r in rows] == sorted((r["swing"] for r in rows), reverse=True)
+    index = sweep.baseline_index(*base)
+    grid = sweep.total_weeks_grid()
+    for r in rows:
+        assert r["baseline"] == grid[tuple(index[f] for f in sweep.FACTORS)]
+        assert r["profile"] == list(sweep.factor_profile(r["factor"], index))
+        assert r["swing"] == max(r["profile"]) - min(r["profile"])
+
+
+def test_variance_shares_are_main_effect_fractions():
+    shares = sweep.variance_shares()
+    assert set(shares) == set(sweep.FACTORS)
+    assert all(0.0 <= v <= 1.0 for v in shares.values())
+    assert sum(shares.values()) <= 1.0 + 1e-9
+    totals = sweep.total_weeks_grid().astype(float)
+    assert np.isclose(shares["damage"], totals.mean(axis=(1, 2, 3)).var() / totals.var())